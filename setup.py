@@ -13,6 +13,7 @@ import sys
 from pathlib import Path
 from logging import warning
 from setuptools import setup
+from setuptools.command.build_py import build_py
 
 # Ensure that the source tree is on the sys path
 sys.path.insert(0, str(Path(__file__).parent.resolve()))
@@ -34,6 +35,20 @@ def find_all_files(directory, endings=None):
     return result
 
 
+class BuildPyCommand(build_py):
+    """
+    Build the Python modules and the index of the builtin VHDL files
+    """
+
+    def run(self):
+        build_py.run(self)
+        if not self.dry_run:
+            # pylint: disable=import-outside-toplevel
+            from vunit.builtins_index import create_builtins_index
+
+            create_builtins_index(Path(self.build_lib) / "vunit")
+
+
 DATA_FILES = []
 DATA_FILES += find_all_files("vunit", endings=[".tcl"])
 DATA_FILES += find_all_files(str(Path("vunit") / "vhdl"))
@@ -58,6 +73,8 @@ setup(
         "vunit.vivado",
     ],
     package_data={"vunit": DATA_FILES},
+    cmdclass={"build_py": BuildPyCommand},
+    entry_points={"console_scripts": ["vunit = vunit.__main__:main"]},
     zip_safe=False,
     url="https://github.com/VUnit/vunit",
     classifiers=[
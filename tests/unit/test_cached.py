@@ -0,0 +1,103 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2023, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Test the cached content hashes of files
+"""
+
+import os
+import hashlib
+import unittest
+from pathlib import Path
+from unittest import mock
+from tests.common import with_tempdir, set_env
+from vunit.cached import file_content_hash, _file_content_hash
+from vunit.database import DataBase, PickledDataBase
+from vunit.hashing import hash_bytes, hash_file
+from vunit.ostools import read_file
+
+
+class TestCached(unittest.TestCase):
+    """
+    Test the cached content hashes of files
+    """
+
+    @with_tempdir
+    def test_hashes_raw_bytes(self, tempdir):
+        file_name = str(Path(tempdir) / "file.vhd")
+        Path(file_name).write_bytes(b"entity ent is\r\nend entity;\r\n")
+        data = Path(file_name).read_bytes()
+        self.assertEqual(file_content_hash(file_name, "latin-1"), hashlib.sha1(data).hexdigest())
+        self.assertEqual(hash_file(file_name), hash_bytes(data))
+
+        # A change of line endings is a change of the file
+        crlf_hash = file_content_hash(file_name, "latin-1")
+        Path(file_name).write_bytes(b"entity ent is\nend entity;\n")
+        self.assertNotEqual(file_content_hash(file_name, "latin-1"), crlf_hash)
+
+    @with_tempdir
+    def test_content_is_decoded_like_read_file(self, tempdir):
+        file_name = str(Path(tempdir) / "file.vhd")
+        Path(file_name).write_bytes(b"-- \xe5\xe4\xf6\r\nentity ent is\rend entity;\n")
+        for newline in [None, ""]:
+            content, _ = _file_content_hash(file_name, "latin-1", newline=newline)
+            self.assertEqual(content, read_file(file_name, encoding="latin-1", newline=newline))
+
+    @with_tempdir
+    def test_reuses_hash_of_unchanged_file(self, tempdir):
+        file_name = str(Path(tempdir) / "file.vhd")
+        Path(file_name).write_bytes(b"entity ent is end entity;")
+        database = PickledDataBase(DataBase(str(Path(tempdir) / "database")))
+
+        content_hash = file_content_hash(file_name, "latin-1", database)
+        with mock.patch("vunit.cached._read_and_hash", autospec=True) as read_and_hash:
+            self.assertEqual(_file_content_hash(file_name, "latin-1", database), (None, content_hash))
+            self.assertFalse(read_and_hash.called)
+
+    @with_tempdir
+    def test_hashes_file_again_when_size_changed_with_same_modification_time(self, tempdir):
+        file_name = str(Path(tempdir) / "file.vhd")
+        Path(file_name).write_bytes(b"entity ent is end entity;")
+        database = PickledDataBase(DataBase(str(Path(tempdir) / "database")))
+
+        stat = os.stat(file_name)
+        old_content_hash = file_content_hash(file_name, "latin-1", database)
+        Path(file_name).write_bytes(b"entity ent is end entity ent;")
+        os.utime(file_name, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        content_hash = file_content_hash(file_name, "latin-1", database)
+        self.assertNotEqual(content_hash, old_content_hash)
+        self.assertEqual(content_hash, hash_bytes(b"entity ent is end entity ent;"))
+
+    @with_tempdir
+    def test_cached_hash_is_kept_by_hash_method(self, tempdir):
+        file_name = str(Path(tempdir) / "file.vhd")
+        Path(file_name).write_bytes(b"entity ent is end entity;")
+        database = PickledDataBase(DataBase(str(Path(tempdir) / "database")))
+
+        with set_env(VUNIT_CONTENT_HASH="sha1"):
+            sha1_hash = file_content_hash(file_name, "latin-1", database)
+
+        with set_env(VUNIT_CONTENT_HASH="blake2b"):
+            self.assertEqual(
+                file_content_hash(file_name, "latin-1", database),
+                hashlib.blake2b(b"entity ent is end entity;", digest_size=20).hexdigest(),
+            )
+
+        with set_env(VUNIT_CONTENT_HASH="sha1"):
+            with mock.patch("vunit.cached._read_and_hash", autospec=True) as read_and_hash:
+                self.assertEqual(file_content_hash(file_name, "latin-1", database), sha1_hash)
+                self.assertFalse(read_and_hash.called)
+
+    def test_content_hash_method(self):
+        with set_env(VUNIT_CONTENT_HASH="blake2b"):
+            self.assertEqual(hash_bytes(b"data"), hashlib.blake2b(b"data", digest_size=20).hexdigest())
+
+        with set_env(VUNIT_CONTENT_HASH="sha1"):
+            self.assertEqual(hash_bytes(b"data"), hashlib.sha1(b"data").hexdigest())
+
+        with set_env(VUNIT_CONTENT_HASH="md5"):
+            self.assertRaises(ValueError, hash_bytes, b"data")
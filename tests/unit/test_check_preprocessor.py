@@ -9,8 +9,10 @@ Test the check preprocessor
 """
 
 
+import random
+import re
 import unittest
-from vunit.check_preprocessor import CheckPreprocessor
+from vunit.check_preprocessor import CheckPreprocessor, Token
 
 
 class TestCheckPreprocessor(unittest.TestCase):
@@ -202,6 +204,168 @@ check_relation(a ?>= b, context_msg => %s);""" % (
         )
         self._verify_result(code, expected_result)
 
+    def test_that_result_is_identical_to_reference_implementation(self):
+        tokens = [
+            " check_relation(",
+            "check_relation",
+            "(",
+            ")",
+            ",",
+            " ",
+            "\n",
+            ";",
+            "=",
+            "/=",
+            "?<=",
+            "=>",
+            "expr => ",
+            "'",
+            "'a'",
+            "std_logic'('1')",
+            '"',
+            '"a = b"',
+            "--",
+            "/*",
+            "*/",
+            "a",
+            "b",
+        ]
+        reference = ReferenceCheckPreprocessor()
+
+        def run(preprocessor, code):
+            try:
+                return preprocessor.run(code, "foo.vhd")
+            except SyntaxError as exc:
+                return str(exc)
+
+        rng = random.Random(42)
+        for _ in range(5000):
+            code = "".join(rng.choice(tokens) for _ in range(rng.randint(0, 60)))
+            self.assertEqual(run(self._check_preprocessor, code), run(reference, code), repr(code))
+
+
+class ReferenceCheckPreprocessor(CheckPreprocessor):
+    """
+    The original check preprocessor scanning the remaining code for each call
+    """
+
+    def run(self, code, file_name):  # pylint: disable=unused-argument
+        check_relation_pattern = re.compile(r"[^a-zA-Z0-9_](?P<call>check_relation)\s*(?P<parameters>\()", re.MULTILINE)
+
+        check_relation_calls = list(check_relation_pattern.finditer(code))
+        check_relation_calls.reverse()
+
+        for match in check_relation_calls:
+            (
+                relation,
+                offset_to_point_before_closing_paranthesis,
+            ) = self._extract_reference_relation(code, match)
+            if relation:
+                context_msg_parameter = f", context_msg => {relation.make_context_msg()!s}"
+                code = (
+                    code[: match.end("parameters") + offset_to_point_before_closing_paranthesis]
+                    + context_msg_parameter
+                    + code[match.end("parameters") + offset_to_point_before_closing_paranthesis :]
+                )
+
+        return code
+
+    def _extract_reference_relation(self, code, check):
+        # pylint: disable=missing-docstring
+        def end_of_parameter(token):
+            return token.value == "," if token.level == 1 else token.level == 0
+
+        parameter_tokens = []
+        index = 1
+        relation = None
+        for token in self._classify_reference_tokens(code[check.start("parameters") + 1 :]):
+            add_token = True
+            if token.type == Token.NORMAL:
+                # The first found parameter containing a top-level relation is assumed
+                # to be the expr parameter. This is a very reasonable assumption since
+                # the return types of normal relational operators are boolean, std_ulogic,
+                # or bit. The expr parameter is the only input of these types.
+                if not relation:
+                    if end_of_parameter(token):
+                        relation = self._get_relation_from_parameter(parameter_tokens)
+                        parameter_tokens = []
+                        add_token = False
+
+                if token.level == 0:
+                    break
+            elif token.is_comment:
+                add_token = False
+
+            if add_token:
+                parameter_tokens.append(token)
+
+            index += 1
+
+        if not relation:
+            raise SyntaxError(
+                f"Failed to find relation in {(code[check.start('call') : check.end('parameters') + index])!s}"
+            )
+
+        return relation, index - 1
+
+    @staticmethod
+    def _classify_reference_tokens(code):
+        # pylint: disable=missing-docstring
+        # pylint: disable=too-many-branches
+        def even_quotes(code):
+            n_quotes = 0
+            for index in range(0, len(code), 2):
+                if code[index] != "'":
+                    break
+                n_quotes += 1
+
+            return (n_quotes % 2) == 0
+
+        code_section = Token.NORMAL
+        level = 1
+        index = 0
+        for char in code:
+            token = Token(char)
+            if code_section == Token.NORMAL:
+                if char == '"':
+                    code_section = Token.STRING
+                elif char == "'":
+                    # Used to avoid mixing up qualified expressions and
+                    # character literals, e.g. std_logic'('1').
+                    if even_quotes(code[index:]):
+                        code_section = Token.CHARACTER_LITERAL
+                elif code[index : index + 2] == "--":
+                    code_section = Token.LINE_COMMENT
+                elif code[index : index + 2] == "/*":
+                    code_section = Token.BLOCK_COMMENT
+                elif char == "(":
+                    level += 1
+                elif char == ")":
+                    level -= 1
+
+                next_code_section = code_section
+
+            elif code_section == Token.STRING:
+                if char == '"':
+                    next_code_section = Token.NORMAL
+            elif code_section == Token.CHARACTER_LITERAL:
+                if char == "'":
+                    next_code_section = Token.NORMAL
+            elif code_section == Token.LINE_COMMENT:
+                if char == "\n":
+                    next_code_section = Token.NORMAL
+            elif code_section == Token.BLOCK_COMMENT:
+                if code[index - 1 : index + 1] == "*/":
+                    next_code_section = Token.NORMAL
+
+            token.type = code_section
+            token.level = level
+            index += 1
+
+            yield token
+
+            code_section = next_code_section
+
 
 def make_context_msg(left, relation, right):
     return '"Expected %s %s %s. Left is " & to_string(%s) & ". Right is " & to_string(%s) & "."' % (
@@ -0,0 +1,109 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2023, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Test the coverage merger
+"""
+
+import unittest
+import threading
+from pathlib import Path
+from shutil import rmtree
+from tempfile import mkdtemp
+from vunit.sim_if.coverage_merger import CoverageMerger
+from vunit.ostools import read_file, write_file
+
+
+class TestCoverageMerger(unittest.TestCase):
+    """
+    Test the coverage merger
+    """
+
+    def setUp(self):
+        self.output_path = mkdtemp()
+        self.merges = []
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        rmtree(self.output_path)
+
+    def merge(self, file_names, output_file_name, args):
+        """
+        Merge by concatenating the sorted lines of the files
+        """
+        lines = []
+        for file_name in file_names:
+            lines += read_file(file_name).splitlines()
+        write_file(output_file_name, "\n".join(sorted(lines)) + "\n")
+        with self.lock:
+            self.merges.append((list(file_names), args))
+
+    def create_files(self, num_files):
+        """
+        Create coverage files with one unique line each
+        """
+        file_names = []
+        for idx in range(num_files):
+            file_name = str(Path(self.output_path) / f"test{idx:d}.cov")
+            write_file(file_name, f"{idx:04d}\n")
+            file_names.append(file_name)
+        return file_names
+
+    def assert_merged(self, file_name, num_files):
+        self.assertEqual(read_file(file_name).splitlines(), [f"{idx:04d}" for idx in range(num_files)])
+
+    def test_merges_few_files_at_once(self):
+        merger = CoverageMerger(self.merge, Path(self.output_path) / "merge", fan_in=4)
+        file_names = self.create_files(3)
+        output_file_name = str(Path(self.output_path) / "merged.cov")
+        merger.merge(file_names, output_file_name, ["-arg"])
+
+        self.assertEqual(self.merges, [(file_names, ["-arg"])])
+        self.assert_merged(output_file_name, 3)
+
+    def test_merges_in_tree(self):
+        merger = CoverageMerger(self.merge, Path(self.output_path) / "merge", fan_in=4)
+        merger.num_workers = 4
+        file_names = self.create_files(37)
+        output_file_name = str(Path(self.output_path) / "merged.cov")
+        merger.merge(file_names, output_file_name, ["-arg"])
+
+        self.assert_merged(output_file_name, 37)
+        self.assertTrue(all(len(inputs) <= 4 for inputs, _ in self.merges))
+        self.assertTrue(all(args == ["-arg"] for _, args in self.merges))
+        # 9 merges on the first level where the last file is passed through,
+        # 3 merges on the second level and the final merge
+        self.assertEqual(len(self.merges), 13)
+
+    def test_merges_incrementally(self):
+        merger = CoverageMerger(self.merge, Path(self.output_path) / "merge", fan_in=4)
+        merger.incremental = True
+        file_names = self.create_files(17)
+        for file_name in file_names:
+            merger.add(file_name)
+        merger.add(str(Path(self.output_path) / "missing.cov"))
+
+        output_file_name = str(Path(self.output_path) / "merged.cov")
+        merger.merge(file_names, output_file_name, ["-arg"])
+
+        self.assert_merged(output_file_name, 17)
+        self.assertTrue(all(len(inputs) <= 4 for inputs, _ in self.merges))
+        # Only the final merge gets the extra arguments and has few inputs
+        final_inputs, final_args = self.merges[-1]
+        self.assertEqual(final_args, ["-arg"])
+        self.assertEqual(len(final_inputs), 2)
+        self.assertTrue(all(args is None for _, args in self.merges[:-1]))
+
+    def test_ignores_added_files_when_not_incremental(self):
+        merger = CoverageMerger(self.merge, Path(self.output_path) / "merge", fan_in=2)
+        file_names = self.create_files(2)
+        for file_name in file_names:
+            merger.add(file_name)
+        self.assertEqual(self.merges, [])
+
+        output_file_name = str(Path(self.output_path) / "merged.cov")
+        merger.merge(file_names, output_file_name)
+        self.assertEqual(self.merges, [(file_names, None)])
@@ -0,0 +1,223 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2023, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Test distributing tests from a coordinator to workers
+"""
+
+from pathlib import Path
+import itertools
+import json
+import socket
+import threading
+import time
+import unittest
+from unittest import mock
+from tests.common import with_tempdir
+from vunit.test.distributed import Coordinator, Worker, parse_address, compress, decompress
+from vunit.test.runner import TestRunner
+from vunit.test.report import TestReport
+from vunit.test.list import TestList
+
+
+class TestDistributed(unittest.TestCase):
+    """
+    Test distributing tests from a coordinator to workers
+    """
+
+    @with_tempdir
+    def test_runs_tests_on_workers(self, tempdir):
+        report = TestReport()
+        coordinator = Coordinator(report, str(Path(tempdir) / "coordinator"), "localhost:0")
+
+        order = []
+        threads = []
+        for idx in range(2):
+            worker = Worker(
+                format_address(coordinator),
+                self.create_test_list(order),
+                lambda worker_report, idx=idx: TestRunner(worker_report, str(Path(tempdir) / f"worker{idx}")),
+            )
+            threads.append(threading.Thread(target=worker.run))
+
+        for thread in threads:
+            thread.start()
+
+        coordinator.run(self.create_test_list())
+
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(report.result_of("test1").passed)
+        self.assertTrue(report.result_of("test2").failed)
+        self.assertTrue(report.result_of("test3").passed)
+
+        # Each test runs exactly once on any of the workers
+        self.assertEqual(sorted(order), ["test1", "test2", "test3"])
+
+    @with_tempdir
+    def test_collects_output_and_time_from_worker(self, tempdir):
+        report = TestReport()
+        coordinator = Coordinator(report, str(Path(tempdir) / "coordinator"), "localhost:0")
+        worker = Worker(
+            format_address(coordinator),
+            self.create_test_list(),
+            lambda worker_report: TestRunner(worker_report, str(Path(tempdir) / "worker")),
+        )
+        thread = threading.Thread(target=worker.run)
+        thread.start()
+        with mock.patch("vunit.test.runner.ostools.get_time", side_effect=itertools.count(0.0, 5.0)):
+            coordinator.run(self.create_test_list())
+        thread.join()
+
+        self.assertIn("Output from test2", report.result_of("test2").output)
+        self.assertNotIn("Output from test1", report.result_of("test2").output)
+        self.assertEqual(report.result_of("test2").time, 5.0)
+
+    @with_tempdir
+    def test_fails_test_unknown_to_worker(self, tempdir):
+        report = TestReport()
+        coordinator = Coordinator(report, str(Path(tempdir) / "coordinator"), "localhost:0")
+        worker = Worker(
+            format_address(coordinator),
+            TestList(),
+            lambda worker_report: TestRunner(worker_report, str(Path(tempdir) / "worker")),
+        )
+        thread = threading.Thread(target=worker.run)
+        thread.start()
+        coordinator.run(self.create_test_list())
+        thread.join()
+
+        for name in ("test1", "test2", "test3"):
+            self.assertTrue(report.result_of(name).failed)
+        self.assertIn("Unknown test suite on worker", report.result_of("test1").output)
+
+    @with_tempdir
+    def test_reschedules_test_of_disconnected_worker(self, tempdir):
+        report = TestReport()
+        coordinator = Coordinator(report, str(Path(tempdir) / "coordinator"), "localhost:0")
+        coordinator_thread = threading.Thread(target=coordinator.run, args=(self.create_test_list(),))
+        coordinator_thread.start()
+
+        # The first worker takes test1 and disconnects once the second worker has run the other tests
+        disconnecting = DisconnectingWorker(coordinator)
+        self.assertEqual(disconnecting.take_test(), "test1")
+
+        order = []
+        worker = Worker(
+            format_address(coordinator),
+            self.create_test_list(order),
+            lambda worker_report: TestRunner(worker_report, str(Path(tempdir) / "worker")),
+        )
+        worker_thread = threading.Thread(target=worker.run)
+        worker_thread.start()
+        wait_until(lambda: len(order) == 2)
+        disconnecting.close()
+
+        worker_thread.join()
+        coordinator_thread.join()
+        self.assertEqual(order, ["test2", "test3", "test1"])
+        self.assertTrue(report.result_of("test1").passed)
+
+    @with_tempdir
+    def test_fails_test_of_last_disconnected_worker(self, tempdir):
+        report = TestReport()
+        coordinator = Coordinator(report, str(Path(tempdir) / "coordinator"), "localhost:0")
+        coordinator_thread = threading.Thread(target=coordinator.run, args=(self.create_test_list(),))
+        coordinator_thread.start()
+
+        disconnecting = DisconnectingWorker(coordinator)
+        self.assertEqual(disconnecting.take_test(), "test1")
+        disconnecting.close()
+        wait_until(lambda: report.has_test("test1"))
+
+        order = []
+        worker = Worker(
+            format_address(coordinator),
+            self.create_test_list(order),
+            lambda worker_report: TestRunner(worker_report, str(Path(tempdir) / "worker")),
+        )
+        worker.run()
+        coordinator_thread.join()
+
+        self.assertEqual(order, ["test2", "test3"])
+        self.assertTrue(report.result_of("test1").failed)
+        self.assertIn("Lost connection to the last worker", report.result_of("test1").output)
+
+    def test_parse_address(self):
+        self.assertEqual(parse_address("host:1234"), ("host", 1234))
+        self.assertEqual(parse_address("1234"), ("localhost", 1234))
+        self.assertEqual(parse_address(":1234", default_host=""), ("", 1234))
+
+    def test_compress(self):
+        text = "Output with unicode åäö\n" * 100
+        self.assertEqual(decompress(compress(text)), text)
+
+    @staticmethod
+    def create_test_list(order=None):
+        """
+        Create a test list with three tests where test2 fails
+        """
+        test_list = TestList()
+        for name in ("test1", "test2", "test3"):
+            test_list.add_test(TestCaseMock(name, order))
+        return test_list
+
+
+def format_address(coordinator):
+    host, port = coordinator.address
+    return f"{host!s}:{port:d}"
+
+
+def wait_until(condition, timeout=10.0):
+    """
+    Wait until the condition is true
+    """
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+class DisconnectingWorker(object):
+    """
+    A worker which takes a test and disconnects without running it
+    """
+
+    def __init__(self, coordinator):
+        self._socket = socket.create_connection(coordinator.address)
+        self._file = self._socket.makefile("rwb")
+
+    def take_test(self):
+        """
+        Ask for a test and return its name
+        """
+        self._file.write(b'{"type": "next"}\n')
+        self._file.flush()
+        return json.loads(self._file.readline())["name"]
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+
+class TestCaseMock(object):
+    """
+    A test case mock class
+    """
+
+    def __init__(self, name, order):
+        self.name = name
+        self._order = order
+
+    def run(self, output_path, read_output):  # pylint: disable=unused-argument
+        """
+        Mock run method which prints output and fails test2
+        """
+        print(f"Output from {self.name!s}")
+        if self._order is not None:
+            self._order.append(self.name)
+        return self.name != "test2"
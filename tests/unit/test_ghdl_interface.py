@@ -8,6 +8,7 @@
 Test the GHDL interface
 """
 
+import io
 import unittest
 from pathlib import Path
 import os
@@ -16,7 +17,7 @@ from unittest import mock
 from tests.unit.test_test_bench import Entity
 from vunit.sim_if.ghdl import GHDLInterface
 from vunit.project import Project
-from vunit.ostools import renew_path, write_file
+from vunit.ostools import renew_path, write_file, read_file, Process
 from vunit.exceptions import CompileError
 from vunit.configuration import Configuration
 from vunit.vhdl_standard import VHDL
@@ -251,6 +252,148 @@ warranty; not even for MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE."""
             ],
         )
 
+    @mock.patch("vunit.sim_if.ghdl.Process", autospec=True)
+    def test_simulate_elaborates_once(self, process):
+        simif, design_unit = self._create_test_bench()
+
+        def create_process(cmd, **kwargs):  # pylint: disable=unused-argument
+            if "-e" in cmd:
+                write_file(cmd[cmd.index("-o") + 1], "")
+            return mock.DEFAULT
+
+        process.side_effect = create_process
+
+        for value in ["1", "2"]:
+            config = Configuration("name", design_unit, generics={"value": value})
+            self.assertTrue(simif.simulate(str(Path("test_out") / value), "lib.tb_entity", config, False))
+
+        commands = [call[1][0] for call in process.mock_calls if call[0] == ""]
+        self.assertEqual(len(commands), 3)
+        self.assertEqual(commands[0][:2], [str(Path("prefix") / "ghdl"), "-e"])
+        self.assertEqual(commands[0][-2:], ["tb_entity", "arch"])
+        bin_path = commands[1][0]
+        self.assertTrue(Path(bin_path).exists())
+        self.assertIn("-gvalue=1", commands[1])
+        self.assertEqual(commands[2][0], bin_path)
+        self.assertIn("-gvalue=2", commands[2])
+
+        # Different elaboration flags need another executable
+        config = Configuration("name", design_unit, sim_options={"ghdl.elab_flags": ["-frelaxed"]})
+        self.assertTrue(simif.simulate(str(Path("test_out") / "3"), "lib.tb_entity", config, False))
+        commands = [call[1][0] for call in process.mock_calls if call[0] == ""]
+        self.assertEqual(len(commands), 5)
+        self.assertIn("-frelaxed", commands[3])
+        self.assertNotEqual(commands[4][0], bin_path)
+
+    @mock.patch("vunit.sim_if.ghdl.Process", autospec=True)
+    def test_simulate_does_not_elaborate_again_after_failure(self, process):
+        simif, design_unit = self._create_test_bench()
+        process.NonZeroExitCode = Process.NonZeroExitCode
+        process.return_value.consume_output.side_effect = Process.NonZeroExitCode
+
+        config = Configuration("name", design_unit, generics={"value": "1"})
+        self.assertFalse(simif.simulate(str(Path("test_out") / "1"), "lib.tb_entity", config, False))
+        self.assertEqual(process.call_count, 1)
+        elaborate_cmd = process.call_args[0][0]
+        bin_name = Path(elaborate_cmd[elaborate_cmd.index("-o") + 1]).name.rsplit(".", 2)[0]
+
+        config = Configuration("name", design_unit, generics={"value": "2"})
+        with mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            self.assertFalse(simif.simulate(str(Path("test_out") / "2"), "lib.tb_entity", config, False))
+        self.assertEqual(process.call_count, 1)
+        self.assertIn(f"Elaboration of {bin_name!s} failed in an earlier test", stdout.getvalue())
+
+    @mock.patch("vunit.sim_if.ghdl.Process", autospec=True)
+    def test_simulate_removes_executables_of_old_dependencies(self, process):
+        def create_process(cmd, **kwargs):  # pylint: disable=unused-argument
+            if "-e" in cmd:
+                write_file(cmd[cmd.index("-o") + 1], "")
+            return mock.DEFAULT
+
+        process.side_effect = create_process
+
+        def simulate(sim_options):
+            simif, design_unit = self._create_test_bench()
+            config = Configuration("name", design_unit, sim_options=sim_options)
+            self.assertTrue(simif.simulate("test_out", "lib.tb_entity", config, False))
+            return [call[1][0][0] for call in process.mock_calls if call[0] == ""][-1]
+
+        old_bin_path = simulate({})
+        bin_path = simulate({"ghdl.elab_flags": ["-frelaxed"]})
+        self.assertNotEqual(bin_path, old_bin_path)
+        self.assertFalse(Path(old_bin_path).exists())
+
+        # Executables used by the same run are kept
+        simif, design_unit = self._create_test_bench()
+        for sim_options in [{}, {"ghdl.elab_flags": ["-frelaxed"]}]:
+            config = Configuration("name", design_unit, sim_options=sim_options)
+            self.assertTrue(simif.simulate("test_out", "lib.tb_entity", config, False))
+        self.assertTrue(Path(old_bin_path).exists())
+        self.assertTrue(Path(bin_path).exists())
+
+    @mock.patch("vunit.sim_if.ghdl.subprocess.call", autospec=True)
+    @mock.patch("vunit.sim_if.ghdl.Process", autospec=True)
+    def test_merge_coverage_incrementally(self, process, call):
+        simif, design_unit = self._create_test_bench()
+        simif.set_coverage_merge_options(num_workers=2, incremental=True)
+
+        def create_process(cmd, **kwargs):
+            """
+            Elaborate the executable or let the simulation write a .gcda file with one count
+            """
+            if "-e" in cmd:
+                write_file(cmd[cmd.index("-o") + 1], "")
+            else:
+                write_file(str(Path(kwargs["env"]["GCOV_PREFIX"]) / "lib" / "tb_entity.gcda"), "1")
+            return mock.DEFAULT
+
+        def gcov_tool_merge(cmd):
+            """
+            Add the counts of the two folders like gcov-tool
+            """
+            output_dir, first_dir, second_dir = cmd[3:]
+            count = sum(int(read_file(str(Path(path) / "lib" / "tb_entity.gcda"))) for path in [first_dir, second_dir])
+            write_file(str(Path(output_dir) / "lib" / "tb_entity.gcda"), str(count))
+            return 0
+
+        process.side_effect = create_process
+        call.side_effect = gcov_tool_merge
+
+        # The final merge has a single intermediate folder merged in the background
+        for idx in range(16):
+            config = Configuration("name", design_unit, sim_options={"enable_coverage": True})
+            self.assertTrue(simif.simulate(str(Path("test_out") / str(idx)), "lib.tb_entity", config, False))
+
+        simif.merge_coverage("merged")
+        self.assertEqual(read_file(str(Path("merged") / "lib" / "tb_entity.gcda")), "16")
+        self.assertEqual(call.call_count, 15)
+
+    @staticmethod
+    def _create_test_bench():
+        """
+        Create a GHDL interface and the design unit of a test bench
+        """
+        write_file(
+            "tb_entity.vhd",
+            """\
+entity tb_entity is
+  generic (runner_cfg : string; value : integer);
+end entity;
+
+architecture arch of tb_entity is
+begin
+end architecture;
+""",
+        )
+        project = Project()
+        project.add_library("lib", "lib_path")
+        project.add_source_file("tb_entity.vhd", "lib", file_type="vhdl")
+        design_unit = project.get_library("lib").primary_design_units["tb_entity"]
+
+        simif = GHDLInterface(prefix="prefix", output_path="ghdl_out", backend="llvm")
+        simif.setup_library_mapping(project)
+        return simif, design_unit
+
     def test_compile_project_verilog_error(self):
         simif = GHDLInterface(prefix="prefix", output_path="")
         write_file("file.v", "")
@@ -0,0 +1,96 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2023, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Test limiting the number of running tests based on host load
+"""
+
+from pathlib import Path
+import unittest
+from unittest import mock
+from tests.common import with_tempdir
+from vunit.test.host_load import HostLoadLimit, parse_meminfo, load_memory_estimates, save_memory_estimates
+
+GB = 1024**3
+
+
+class TestHostLoad(unittest.TestCase):
+    """
+    Test limiting the number of running tests based on host load
+    """
+
+    def test_parse_meminfo(self):
+        contents = """\
+MemTotal:       16318440 kB
+MemFree:         1093336 kB
+MemAvailable:    9571128 kB
+HugePages_Total:       0
+"""
+        self.assertEqual(parse_meminfo(contents), (9571128 * 1024, 16318440 * 1024))
+        self.assertEqual(parse_meminfo("MemTotal:       16318440 kB\n"), None)
+
+    def test_always_allows_one_test(self):
+        limit = HostLoadLimit(4)
+        with self._host(load_average=100.0, memory=(0, 16 * GB)):
+            self.assertTrue(limit.can_start(SuiteMock("test"), num_active=0))
+
+    def test_limits_to_number_of_cpus(self):
+        limit = HostLoadLimit(4)
+        with self._host(load_average=None, memory=None):
+            self.assertTrue(limit.can_start(SuiteMock("test"), num_active=3))
+            self.assertFalse(limit.can_start(SuiteMock("test"), num_active=4))
+
+    def test_shrinks_with_load_from_other_processes(self):
+        with self._host(load_average=2.0, memory=None):
+            self.assertTrue(HostLoadLimit(8).can_start(SuiteMock("test"), num_active=2))
+        with self._host(load_average=8.0, memory=None):
+            self.assertFalse(HostLoadLimit(8).can_start(SuiteMock("test"), num_active=2))
+
+    def test_uses_memory_estimates(self):
+        estimates = {"big": 6 * GB}
+        with self._host(load_average=None, memory=(8 * GB, 16 * GB)):
+            limit = HostLoadLimit(8, estimates)
+            self.assertTrue(limit.can_start(SuiteMock("small"), num_active=1))
+            self.assertTrue(limit.can_start(SuiteMock("big"), num_active=1))
+        with self._host(load_average=None, memory=(6 * GB, 16 * GB)):
+            limit = HostLoadLimit(8, estimates)
+            self.assertTrue(limit.can_start(SuiteMock("small"), num_active=1))
+            self.assertFalse(limit.can_start(SuiteMock("big"), num_active=1))
+        with self._host(load_average=None, memory=(GB, 16 * GB)):
+            self.assertFalse(HostLoadLimit(8, estimates).can_start(SuiteMock("small"), num_active=1))
+
+    def test_samples_host_load_at_limited_rate(self):
+        read_load_average = mock.Mock(return_value=None)
+        with mock.patch("vunit.test.host_load.read_load_average", new=read_load_average), mock.patch(
+            "vunit.test.host_load.read_memory", return_value=None
+        ), mock.patch("vunit.test.host_load.ostools.get_time", side_effect=[0.0, 0.1, 0.3]):
+            limit = HostLoadLimit(8)
+            for _ in range(3):
+                limit.can_start(SuiteMock("test"), num_active=1)
+        self.assertEqual(read_load_average.call_count, 2)
+
+    @with_tempdir
+    def test_memory_estimates_file(self, tempdir):
+        file_name = str(Path(tempdir) / "peak_memory.json")
+        self.assertEqual(load_memory_estimates(file_name), {})
+        save_memory_estimates(file_name, {"lib.tb.test": 1234})
+        self.assertEqual(load_memory_estimates(file_name), {"lib.tb.test": 1234})
+
+    @staticmethod
+    def _host(load_average, memory):
+        """
+        Mock the host load
+        """
+        return mock.patch.multiple(
+            "vunit.test.host_load",
+            read_load_average=mock.Mock(return_value=load_average),
+            read_memory=mock.Mock(return_value=memory),
+        )
+
+
+class SuiteMock(object):  # pylint: disable=too-few-public-methods
+    def __init__(self, name):
+        self.name = name
@@ -956,6 +956,90 @@ define work "%s/libraries/work"
             ],
         )
 
+    @mock.patch("vunit.sim_if.incisive.IncisiveInterface.find_cds_root_virtuoso")
+    @mock.patch("vunit.sim_if.incisive.IncisiveInterface.find_cds_root_irun")
+    @mock.patch("vunit.sim_if.incisive.run_command", autospec=True, return_value=True)
+    def test_simulate_reuses_snapshot(self, run_command, find_cds_root_irun, find_cds_root_virtuoso):
+        find_cds_root_irun.return_value = "cds_root_irun"
+        find_cds_root_virtuoso.return_value = None
+        simif = IncisiveInterface(prefix="prefix", output_path=self.output_path)
+
+        project = Project()
+        project.add_library("lib", "lib_path")
+        write_file("file.vhd", "")
+        project.add_source_file("file.vhd", "lib", file_type="vhdl")
+
+        with mock.patch("vunit.sim_if.check_output", autospec=True, return_value=""):
+            simif.compile_project(project)
+
+        def simulate(output_path, runner_cfg):
+            config = make_config(
+                sim_options={"incisive.reuse_snapshot": True}, generics={"runner_cfg": runner_cfg, "value": 1}
+            )
+            self.assertTrue(simif.simulate(output_path, "test_suite_name", config))
+
+        simulate("suite_output_path1", "enabled_test_cases : test1")
+        simulate("suite_output_path2", "enabled_test_cases : test2")
+
+        self.assertEqual(run_command.call_count, 3)
+        elaborate_cwd = run_command.call_args_list[0][1]["cwd"]
+        elaborate_args = read_file(str(Path(elaborate_cwd) / "irun_elaborate.args")).splitlines()
+        snapshot = Path(elaborate_cwd).name
+        self.assertEqual(Path(elaborate_cwd).parent, Path(self.output_path) / "snapshots")
+        self.assertIn("-elaborate", elaborate_args)
+        self.assertIn(f"-snapshot {snapshot!s}", elaborate_args)
+        self.assertIn('-gpg "ent.runner_cfg => \\"runner_cfg file : vunit_runner_cfg\\""', elaborate_args)
+        self.assertIn('-gpg "ent.value => 1"', elaborate_args)
+
+        for idx in (1, 2):
+            script_path = Path(f"suite_output_path{idx:d}") / simif.name
+            self.assertEqual(run_command.call_args_list[idx][1]["cwd"], str(script_path))
+            simulate_args = read_file(str(script_path / "irun_simulate.args")).splitlines()
+            self.assertIn("-R", simulate_args)
+            self.assertIn(f"-snapshot {snapshot!s}", simulate_args)
+            self.assertNotIn("-elaborate", simulate_args)
+            self.assertEqual(
+                read_file(str(script_path / "vunit_runner_cfg")), f"enabled_test_cases : test{idx:d}\n"
+            )
+
+        write_file("file.vhd", "-- changed")
+        project = Project()
+        project.add_library("lib", "lib_path")
+        project.add_source_file("file.vhd", "lib", file_type="vhdl")
+        simif = IncisiveInterface(prefix="prefix", output_path=self.output_path)
+        with mock.patch("vunit.sim_if.check_output", autospec=True, return_value=""):
+            simif.compile_project(project)
+        simulate("suite_output_path1", "enabled_test_cases : test1")
+        self.assertEqual(run_command.call_count, 5)
+        self.assertNotEqual(Path(run_command.call_args_list[3][1]["cwd"]).name, snapshot)
+
+    @mock.patch("vunit.sim_if.incisive.IncisiveInterface.find_cds_root_virtuoso")
+    @mock.patch("vunit.sim_if.incisive.IncisiveInterface.find_cds_root_irun")
+    @mock.patch("vunit.sim_if.incisive.run_command", autospec=True, return_value=True)
+    def test_simulate_verilog_does_not_reuse_snapshot(self, _run_command, find_cds_root_irun, find_cds_root_virtuoso):
+        find_cds_root_irun.return_value = "cds_root_irun"
+        find_cds_root_virtuoso.return_value = None
+        simif = IncisiveInterface(prefix="prefix", output_path=self.output_path)
+
+        project = Project()
+        project.add_library("lib", "lib_path")
+        write_file("file.sv", "")
+        project.add_source_file("file.sv", "lib", file_type="systemverilog")
+
+        with mock.patch("vunit.sim_if.check_output", autospec=True, return_value=""):
+            simif.compile_project(project)
+
+        config = make_config(
+            sim_options={"incisive.reuse_snapshot": True},
+            generics={"runner_cfg": "enabled_test_cases : test1"},
+            verilog=True,
+        )
+        self.assertTrue(simif.simulate("suite_output_path", "test_suite_name", config))
+        self.assertFalse((Path(self.output_path) / "snapshots").exists())
+        self.assertFalse((Path("suite_output_path") / simif.name / "vunit_runner_cfg").exists())
+        elaborate_args = read_file(str(Path("suite_output_path") / simif.name / "irun_elaborate.args")).splitlines()
+        self.assertIn('-gpg "modulename.runner_cfg => \\"enabled_test_cases : test1\\""', elaborate_args)
+
     def setUp(self):
         self.output_path = str(Path(__file__).parent / "test_incisive_out")
         renew_path(self.output_path)
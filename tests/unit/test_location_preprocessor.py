@@ -9,6 +9,8 @@ Test the location preprocessor
 """
 
 
+import re
+import random
 import unittest
 from vunit.location_preprocessor import LocationPreprocessor
 
@@ -202,3 +204,125 @@ debug(1 to 2)
 """
 
         self._verify_result(code, expected_result)
+
+    def test_that_calls_around_located_calls_are_left_untouched(self):
+        code = """
+sub_prog("0", sub_prog);
+sub_prog(info("1"), sub_prog("2",
+                             "3"));
+"""
+        expected_result = """
+sub_prog("0", sub_prog, line_num => 2, file_name => "foo.vhd");
+sub_prog(info("1"), sub_prog("2",
+                             "3", line_num => 3, file_name => "foo.vhd"));
+"""
+        self._verify_result(code, expected_result)
+
+    def test_that_result_is_identical_to_reference_implementation(self):
+        tokens = [
+            "sub_prog",
+            "check_equal",
+            "info",
+            "log",
+            "my_protected_type.",
+            "another_sub_prog",
+            "(",
+            ")",
+            ",",
+            " ",
+            "\n",
+            ";",
+            ":=",
+            "<=",
+            "procedure ",
+            "FUNCTION\t",
+            'file_name => "bar.vhd"',
+            "line_num=>17",
+            '"str"',
+            "1",
+        ]
+        file_names = ["foo.vhd", "C:\\Program Files (x86)\\foo.vhd", "foo(.vhd", "foo).vhd"]
+        reference = ReferenceLocationPreprocessor()
+        reference.add_subprogram("sub_prog")
+        reference.remove_subprogram("log")
+
+        rng = random.Random(42)
+        for _ in range(5000):
+            code = "".join(rng.choice(tokens) for _ in range(rng.randint(0, 40)))
+            file_name = rng.choice(file_names)
+            try:
+                expected_result = reference.run(code, file_name)
+            except TypeError:
+                # The reference implementation fails on unbalanced parentheses
+                self.assertRaises(RuntimeError, self._location_preprocessor.run, code, file_name)
+                continue
+            self.assertEqual(self._location_preprocessor.run(code, file_name), expected_result, repr(code))
+
+
+class ReferenceLocationPreprocessor(LocationPreprocessor):
+    """
+    The original quadratic implementation of the location preprocessor
+    """
+
+    @staticmethod
+    def _find_reference_closing_parenthesis(args):
+        """
+        Find the balanced closing parentesis
+        """
+        pattern = re.compile(r"\(|\)")
+        balance = 0
+        for match in pattern.finditer(args):
+            balance += 1 if match.group() == "(" else -1
+            if balance == 0:
+                return match.start()
+        return None
+
+    def run(self, code, file_name):
+        potential_subprogram_call_with_arguments_pattern = re.compile(
+            r"[^a-zA-Z0-9_](?P<subprogram>" + "|".join(self._subprograms_with_arguments) + r")\s*(?P<args>\()",
+            re.MULTILINE,
+        )
+
+        potential_subprogram_call_without_arguments_pattern = re.compile(
+            r"[^a-zA-Z0-9_](?P<subprogram>" + "|".join(self._subprograms_without_arguments) + r")\s*;",
+            re.MULTILINE,
+        )
+
+        matches = list(potential_subprogram_call_with_arguments_pattern.finditer(code))
+        if self._subprograms_without_arguments:
+            matches += list(potential_subprogram_call_without_arguments_pattern.finditer(code))
+        matches.sort(key=lambda match: match.start("subprogram"), reverse=True)
+
+        for match in matches:
+            if self._subprogram_declaration_start_backwards_pattern.match(code[match.start() : 0 : -1]):
+                continue
+            file_name_association = ', file_name => "' + file_name + '"'
+            line_num_association = ", line_num => " + str(1 + code[: match.start("subprogram")].count("\n"))
+            if "args" in match.groupdict():
+                closing_paranthesis_start = self._find_reference_closing_parenthesis(code[match.start("args") :])
+
+                if self._assignment_pattern.match(code[match.start("args") + closing_paranthesis_start + 1 :]):
+                    continue
+
+                args = code[match.start("args") : match.start("args") + closing_paranthesis_start]
+                already_fixed_file_name = self._already_fixed_file_name_pattern.search(args) is not None
+                already_fixed_line_num = self._already_fixed_line_num_pattern.search(args) is not None
+                file_name_association = file_name_association if not already_fixed_file_name else ""
+                line_num_association = line_num_association if not already_fixed_line_num else ""
+
+                code = (
+                    code[: match.start("args") + closing_paranthesis_start]
+                    + line_num_association
+                    + file_name_association
+                    + code[match.start("args") + closing_paranthesis_start :]
+                )
+            else:
+                code = (
+                    code[: match.end("subprogram")]
+                    + "("
+                    + line_num_association[2:]
+                    + file_name_association
+                    + ")"
+                    + code[match.end("subprogram") :]
+                )
+        return code
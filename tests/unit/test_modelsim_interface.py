@@ -11,13 +11,16 @@ Test the ModelSim interface
 
 import unittest
 from pathlib import Path
+import threading
 import os
 from shutil import rmtree
 from unittest import mock
 from tests.common import set_env
+from tests.unit.test_test_bench import Entity
 from vunit.sim_if.modelsim import ModelSimInterface
+from vunit.configuration import Configuration
 from vunit.project import Project
-from vunit.ostools import renew_path, write_file
+from vunit.ostools import renew_path, write_file, read_file
 from vunit.vhdl_standard import VHDL
 
 
@@ -254,6 +257,77 @@ class TestModelSimInterface(unittest.TestCase):
             str(Path(self.test_path) / "my_modelsim.ini"),
         )
 
+    def test_keeps_design_loaded_between_runs(self):
+        simif = ModelSimInterface(prefix=self.prefix_path, output_path=self.output_path, persistent=False)
+        simif._libraries = []  # pylint: disable=protected-access
+        shell = PersistentShellMock()
+        simif._persistent_shell = shell  # pylint: disable=protected-access
+
+        design_unit = Entity("tb_entity", file_name=str(Path(self.test_path) / "file.vhd"))
+        design_unit.generic_names = ["runner_cfg", "value"]
+
+        def simulate(name, value, runner_cfg):
+            config = Configuration(
+                "name",
+                design_unit,
+                generics={"value": value, "runner_cfg": runner_cfg},
+                sim_options={"modelsim.keep_design_loaded": True},
+            )
+            shell.commands = []
+            self.assertTrue(simif.simulate(str(Path(self.test_path) / name), "lib.tb_entity", config, False))
+            return shell.commands
+
+        commands = simulate("test1", 1, "enabled_test_cases : test1")
+        self.assertIn("set failed [vunit_load]", commands)
+        self.assertNotIn("quit -sim", commands)
+
+        commands = simulate("test2", 1, "enabled_test_cases : test2_longer")
+        self.assertNotIn("set failed [vunit_load]", commands)
+        self.assertIn("set failed [vunit_run]", commands)
+        self.assertIn("_vunit_sim_restart", commands[1])
+        self.assertIn('{"enabled_test_cases : test2_longer' + " " * (256 - 33) + '"}', commands[1])
+
+        commands = simulate("test3", 2, "enabled_test_cases : test3")
+        self.assertIn("set failed [vunit_load]", commands)
+
+    def test_restores_checkpoint_between_runs(self):
+        simif = ModelSimInterface(prefix=self.prefix_path, output_path=self.output_path, persistent=False)
+        simif._libraries = []  # pylint: disable=protected-access
+        shell = PersistentShellMock()
+        shell.true_variables.add("vunit_checkpoint_saved")
+        simif._persistent_shell = shell  # pylint: disable=protected-access
+
+        design_unit = Entity("tb_entity", file_name=str(Path(self.test_path) / "file.vhd"))
+        design_unit.generic_names = ["runner_cfg"]
+        checkpoint_path = Path(self.output_path) / "checkpoints" / str(threading.get_ident())
+
+        def simulate(name, runner_cfg):
+            config = Configuration(
+                "name",
+                design_unit,
+                generics={"runner_cfg": runner_cfg},
+                sim_options={"enable_checkpoint": True},
+            )
+            shell.commands = []
+            self.assertTrue(simif.simulate(str(Path(self.test_path) / name), "lib.tb_entity", config, False))
+            self.assertIn(
+                "checkpoint path : " + str(checkpoint_path).replace("\\", "/") + "/", config.generics["runner_cfg"]
+            )
+            return shell.commands
+
+        commands = simulate("test1", "enabled_test_cases : test1")
+        self.assertIn("set failed [vunit_load]", commands)
+        self.assertIn("set failed [vunit_run]", commands)
+        self.assertNotIn("set failed [vunit_restore_checkpoint]", commands)
+        self.assertIn("enabled_test_cases : test1,", read_file(str(checkpoint_path / "runner_cfg")))
+
+        commands = simulate("test2", "enabled_test_cases : test2")
+        self.assertIn("set failed [vunit_restore_checkpoint]", commands)
+        self.assertIn("set failed [vunit_run]", commands)
+        self.assertNotIn("set failed [vunit_load]", commands)
+        self.assertFalse(any("_vunit_sim_restart" in command for command in commands))
+        self.assertIn("enabled_test_cases : test2,", read_file(str(checkpoint_path / "runner_cfg")))
+
     def test_copies_modelsim_ini_file_from_install(self):
         (modelsim_ini, installed_modelsim_ini, user_modelsim_ini) = self._get_inis()
 
@@ -334,3 +408,19 @@ class TestModelSimInterface(unittest.TestCase):
         os.chdir(self.cwd)
         if Path(self.test_path).exists():
             rmtree(self.test_path)
+
+
+class PersistentShellMock(object):
+    """
+    Mock of a persistent TCL shell where all commands succeed
+    """
+
+    def __init__(self):
+        self.commands = []
+        self.true_variables = set()
+
+    def execute(self, cmd):
+        self.commands.append(cmd)
+
+    def read_bool(self, varname):
+        return varname in self.true_variables
@@ -0,0 +1,119 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2023, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Test the NVC interface
+"""
+
+import unittest
+from pathlib import Path
+import os
+from shutil import rmtree
+from unittest import mock
+from vunit.sim_if.nvc import NVCInterface
+from vunit.project import Project
+from vunit.ostools import renew_path, write_file, read_file, Process
+from vunit.configuration import Configuration
+from vunit.vhdl_standard import VHDL
+
+
+class TestNVCInterface(unittest.TestCase):
+    """
+    Test the NVC interface
+    """
+
+    @mock.patch("vunit.sim_if.nvc.Process", autospec=True)
+    @mock.patch("vunit.sim_if.nvc.NVCInterface.determine_version", return_value=(1, 10))
+    def test_simulate_reuses_saved_design(self, _determine_version, process):
+        process.NonZeroExitCode = Process.NonZeroExitCode
+        simif = self._create_simif()
+
+        def simulate(output_path, runner_cfg, value=1):
+            config = make_config(
+                sim_options={"nvc.reuse_elaboration": True}, generics={"runner_cfg": runner_cfg, "value": value}
+            )
+            self.assertTrue(simif.simulate(output_path, "test_suite_name", config, False))
+
+        simulate("suite_output_path1", "enabled_test_cases : test1")
+        simulate("suite_output_path2", "enabled_test_cases : test2")
+
+        self.assertEqual(process.call_count, 3)
+        elaborate_cmd = process.call_args_list[0][0][0]
+        self.assertIn("-e", elaborate_cmd)
+        self.assertNotIn("--no-save", elaborate_cmd)
+        self.assertNotIn("--jit", elaborate_cmd)
+        self.assertIn("-grunner_cfg=runner_cfg file : vunit_runner_cfg", elaborate_cmd)
+        self.assertIn("-gvalue=1", elaborate_cmd)
+
+        for idx in (1, 2):
+            script_path = Path(f"suite_output_path{idx:d}") / simif.name
+            run_cmd = process.call_args_list[idx][0][0]
+            self.assertEqual(process.call_args_list[idx][1]["cwd"], str(script_path))
+            self.assertIn("-r", run_cmd)
+            self.assertNotIn("-e", run_cmd)
+            self.assertEqual(run_cmd[-1], "ent-arch")
+            self.assertEqual(read_file(str(script_path / "vunit_runner_cfg")), f"enabled_test_cases : test{idx:d}\n")
+
+        # Another configuration of the test bench cannot replace the saved design during the run
+        simulate("suite_output_path3", "enabled_test_cases : test1", value=2)
+        self.assertEqual(process.call_count, 4)
+        fallback_cmd = process.call_args_list[3][0][0]
+        self.assertIn("-e", fallback_cmd)
+        self.assertIn("--no-save", fallback_cmd)
+        self.assertIn("-gvalue=2", fallback_cmd)
+        self.assertIn("-grunner_cfg=enabled_test_cases : test1", fallback_cmd)
+
+        # The saved design is reused by the next run
+        simif = self._create_simif()
+        simulate("suite_output_path1", "enabled_test_cases : test1")
+        self.assertEqual(process.call_count, 5)
+        self.assertNotIn("-e", process.call_args_list[4][0][0])
+
+        # A changed dependency elaborates the design again
+        write_file("file.vhd", "-- changed")
+        simif = self._create_simif()
+        simulate("suite_output_path1", "enabled_test_cases : test1")
+        self.assertEqual(process.call_count, 7)
+        self.assertIn("-e", process.call_args_list[5][0][0])
+
+    def _create_simif(self):
+        """
+        Create an NVC interface with the library mapping of a project with one file
+        """
+        project = Project()
+        project.add_library("lib", "lib_path")
+        if not Path("file.vhd").exists():
+            write_file("file.vhd", "")
+        project.add_source_file("file.vhd", "lib", file_type="vhdl", vhdl_standard=VHDL.standard("2008"))
+        simif = NVCInterface(prefix="prefix", output_path=self.output_path)
+        with mock.patch("vunit.sim_if.nvc.run_command", autospec=True, return_value=True):
+            simif.setup_library_mapping(project)
+        return simif
+
+    def setUp(self):
+        self.output_path = str(Path(__file__).parent / "test_nvc_out")
+        renew_path(self.output_path)
+        self.cwd = os.getcwd()
+        os.chdir(self.output_path)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        if Path(self.output_path).exists():
+            rmtree(self.output_path)
+
+
+def make_config(sim_options=None, generics=None):
+    """
+    Utility to reduce boiler plate in tests
+    """
+    cfg = mock.Mock(spec=Configuration)
+    cfg.library_name = "lib"
+    cfg.entity_name = "ent"
+    cfg.architecture_name = "arch"
+    cfg.sim_options = {} if sim_options is None else sim_options
+    cfg.generics = {} if generics is None else generics
+    cfg.vhdl_assert_stop_level = "error"
+    return cfg
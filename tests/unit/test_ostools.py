@@ -12,8 +12,11 @@ Test the os-dependent functionality wrappers
 from unittest import TestCase
 from pathlib import Path
 from shutil import rmtree
+import os
 import sys
-from vunit.ostools import Process, renew_path
+import threading
+import time
+from vunit.ostools import Process, PathReaper, renew_path, PEAK_MEMORY, RUNNING_PROCESSES
 
 
 class TestOSTools(TestCase):
@@ -104,3 +107,72 @@ sleep(1000)
         process = Process([sys.executable, python_script])
         process.consume_output(output.append)
         self.assertEqual(output, ["ac"])
+
+    def test_kill_processes_of_thread(self):
+        python_script = self.make_file(
+            "run_hang.py",
+            r"""
+import subprocess
+import sys
+import time
+subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+print("started", flush=True)
+time.sleep(60)
+""",
+        )
+        process = Process([sys.executable, python_script])
+        self.assertEqual(process.next_line(), "started")
+        ident = threading.get_ident()
+        RUNNING_PROCESSES.kill(ident)
+        try:
+            self.assertRaises(Process.NonZeroExitCode, process.consume_output)
+
+            # Processes started after the kill are also killed until reset
+            self.assertRaises(Process.NonZeroExitCode, Process([sys.executable, python_script]).consume_output)
+        finally:
+            RUNNING_PROCESSES.reset(ident)
+
+        process = Process([sys.executable, "-c", "pass"])
+        process.consume_output()
+
+    def test_records_peak_memory(self):
+        python_script = self.make_file(
+            "run_alloc.py",
+            r"""
+data = bytearray(64 * 1024 * 1024)
+""",
+        )
+        PEAK_MEMORY.reset()
+        process = Process([sys.executable, python_script])
+        process.consume_output()
+        if hasattr(os, "wait4"):
+            self.assertGreaterEqual(PEAK_MEMORY.peak, 64 * 1024 * 1024)
+        else:
+            self.assertIsNone(PEAK_MEMORY.peak)
+
+    def test_does_not_reap_process_while_subprocess_waits_for_it(self):
+        process = Process([sys.executable, "-c", "import sys; sys.exit(3)"])
+        popen = process._process  # pylint: disable=protected-access
+        if hasattr(popen, "_waitpid_lock"):
+            # A poll from another thread holds the lock and must get the exit code
+            with popen._waitpid_lock:  # pylint: disable=protected-access
+                time.sleep(0.5)
+                self.assertFalse(process._reap())  # pylint: disable=protected-access
+                self.assertIsNone(popen.returncode)
+        self.assertEqual(process.wait(), 3)
+
+    def test_path_reaper_renews_path(self):
+        output_path = Path(self.tmp_dir) / "output"
+        trash_path = Path(self.tmp_dir) / "trash"
+        (trash_path / "left_over").mkdir(parents=True)
+        reaper = PathReaper(trash_path)
+
+        reaper.renew_path(str(output_path))
+        self.assertEqual(list(output_path.iterdir()), [])
+
+        self.make_file("output/old.txt", "old")
+        reaper.renew_path(str(output_path))
+        self.assertEqual(list(output_path.iterdir()), [])
+
+        reaper.join()
+        self.assertEqual(list(trash_path.iterdir()), [])
@@ -0,0 +1,115 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2023, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Test the persistent TCL shell
+"""
+
+import sys
+import time
+import threading
+import unittest
+from vunit.persistent_tcl_shell import PersistentTclShell
+from vunit.ostools import Process
+
+# Minimal shell which prints the argument of puts and exits on quit
+SHELL = r"""
+import sys
+for line in sys.stdin:
+    if line.startswith("puts "):
+        print(line[len("puts "):].rstrip("\n"), flush=True)
+    elif line.startswith("quit"):
+        break
+"""
+
+# Shell which never becomes ready, like a simulator waiting for a license
+HANGING_SHELL = r"""
+import sys
+for line in sys.stdin:
+    pass
+"""
+
+
+class TestPersistentTclShell(unittest.TestCase):
+    """
+    Test the persistent TCL shell
+    """
+
+    def setUp(self):
+        self.created = []
+        self.lock = threading.Lock()
+        self.can_create = threading.Event()
+        self.can_create.set()
+        self.script = SHELL
+        self.shell = PersistentTclShell(create_process=self.create_process)
+
+    def tearDown(self):
+        self.shell.teardown()
+
+    def create_process(self, ident):
+        """
+        Start a fake TCL shell
+        """
+        self.can_create.wait()
+        process = Process([sys.executable, "-u", "-c", self.script])
+        with self.lock:
+            self.created.append((ident, process))
+        return process
+
+    def test_starts_process_lazily(self):
+        self.shell.execute("puts hello")
+        self.assertEqual([ident for ident, _ in self.created], [threading.current_thread().ident])
+
+    def test_uses_processes_started_in_advance(self):
+        self.shell.start(2)
+        self.shell.execute("puts hello")
+
+        thread = threading.Thread(target=self.shell.execute, args=("puts hello",))
+        thread.start()
+        thread.join()
+
+        self.assertEqual(sorted(ident for ident, _ in self.created), ["_started0", "_started1"])
+
+    def test_replaces_terminated_process_started_in_advance(self):
+        self.shell.start(1)
+        self.shell.execute("puts hello")
+        _, process = self.created[0]
+        process.writeline("quit")
+        process.wait()
+
+        thread = threading.Thread(target=self.shell.execute, args=("puts hello",))
+        thread.start()
+        thread.join()
+
+        self.assertEqual(len(self.created), 2)
+        self.assertEqual(self.created[1][0], thread.ident)
+
+    def test_teardown_kills_processes_being_started(self):
+        self.script = HANGING_SHELL
+        self.shell.start(2)
+        self.wait_for(lambda: len(self.created) == 2)
+
+        self.shell.teardown()
+        for _, process in self.created:
+            self.assertFalse(process.is_alive())
+
+    def test_teardown_kills_processes_created_after_teardown(self):
+        self.script = HANGING_SHELL
+        self.can_create.clear()
+        self.shell.start(2)
+        self.shell.teardown()
+        self.can_create.set()
+
+        self.wait_for(lambda: len(self.created) == 2 and not any(process.is_alive() for _, process in self.created))
+
+    def wait_for(self, condition, timeout=10.0):
+        """
+        Wait until the condition is true
+        """
+        end = time.time() + timeout
+        while not condition():
+            self.assertLess(time.time(), end)
+            time.sleep(0.01)
@@ -18,9 +18,14 @@ from shutil import rmtree
 from time import sleep
 import itertools
 from unittest import mock
+from tests.common import set_env
 from vunit.exceptions import CompileError
 from vunit.ostools import renew_path, write_file
 from vunit.project import Project
+from vunit.database import DataBase, PickledDataBase
+from vunit.builtins_index import BuiltinsIndex, create_builtins_index
+from vunit.vhdl_parser import VHDLParser
+from vunit.parsing.verilog.parser import VerilogParser
 from vunit.source_file import file_type_of
 
 
@@ -998,6 +1003,19 @@ endpackage
         file1.set_compile_option("ghdl.flags", ["--xyz"])
         self.assertEqual(file1.get_compile_option("ghdl.flags"), ["--xyz"])
 
+    def test_content_hash_is_updated_when_compile_options_change(self):
+        self.project.add_library("lib", "lib_path")
+        file1 = self.add_source_file("lib", "file.vhd", "")
+        content_hash = file1.content_hash
+        self.assertEqual(file1.content_hash, content_hash)
+
+        file1.add_compile_option("ghdl.flags", ["--foo"])
+        self.assertNotEqual(file1.content_hash, content_hash)
+
+        content_hash = file1.content_hash
+        file1.set_compile_option("ghdl.flags", ["--bar"])
+        self.assertNotEqual(file1.content_hash, content_hash)
+
     def test_add_compile_option_does_not_mutate_argument(self):
         self.project.add_library("lib", "lib_path")
         file1 = self.add_source_file("lib", "file.vhd", "")
@@ -1450,6 +1468,92 @@ endmodule
         module = create_project()
         self.assert_should_recompile([module])
 
+    def test_reuses_snapshot_of_unchanged_files(self):
+        database = PickledDataBase(DataBase(str(Path(self.output_path) / "database")))
+        write_file("ent.vhd", "entity ent is end entity;")
+        write_file("module.sv", '`include "include.svh"\n')
+        write_file("include.svh", "module mod; endmodule\n")
+
+        def create_project():
+            """
+            Create the test project and save its snapshot
+            """
+            self.project = Project(database=database)
+            self.project.add_library("lib", "lib_path")
+            self.project.add_source_file("ent.vhd", "lib")
+            self.project.add_source_file("module.sv", "lib", file_type="systemverilog")
+            self.project.save_snapshot()
+            library = self.project.get_library("lib")
+            return [entity.name for entity in library.get_entities()], [module.name for module in library.get_modules()]
+
+        self.assertEqual(create_project(), (["ent"], ["mod"]))
+        with mock.patch.object(VHDLParser, "parse") as vhdl_parse, mock.patch.object(
+            VerilogParser, "parse"
+        ) as verilog_parse:
+            self.assertEqual(create_project(), (["ent"], ["mod"]))
+            vhdl_parse.assert_not_called()
+            verilog_parse.assert_not_called()
+
+        write_file("include.svh", "module other_mod; endmodule\n")
+        self.assertEqual(create_project(), (["ent"], ["other_mod"]))
+
+    def test_snapshot_is_keyed_on_absolute_file_name(self):
+        database = PickledDataBase(DataBase(str(Path(self.output_path) / "database")))
+        write_file(str(Path("dir1") / "ent.vhd"), "entity ent1 is end entity;")
+        write_file(str(Path("dir2") / "ent.vhd"), "entity ent2 is end entity;")
+
+        def create_project(directory):
+            """
+            Create the test project with a file name relative to directory and save its snapshot
+            """
+            os.chdir(str(Path(self.output_path) / directory))
+            self.project = Project(database=database)
+            self.project.add_library("lib", "lib_path")
+            self.project.add_source_file("ent.vhd", "lib")
+            self.project.save_snapshot()
+            return [entity.name for entity in self.project.get_library("lib").get_entities()]
+
+        self.assertEqual(create_project("dir1"), ["ent1"])
+        self.assertEqual(create_project("dir2"), ["ent2"])
+
+    def test_uses_builtins_index_instead_of_parsing(self):
+        package_path = Path(self.output_path) / "package"
+        write_file(str(package_path / "vhdl" / "ent.vhd"), "entity ent is end entity;")
+        write_file(str(package_path / "vhdl" / "pkg.vhd"), "package pkg is end package;")
+        self.assertEqual(create_builtins_index(package_path), 2)
+
+        def create_project():
+            """
+            Create the test project using the builtins index
+            """
+            self.project = Project(builtins_index=BuiltinsIndex(package_path))
+            self.project.add_library("lib", "lib_path")
+            self.project.add_source_file(str(package_path / "vhdl" / "ent.vhd"), "lib")
+            self.project.add_source_file(str(package_path / "vhdl" / "pkg.vhd"), "lib")
+            library = self.project.get_library("lib")
+            return sorted(library.primary_design_units)
+
+        with mock.patch.object(VHDLParser, "parse") as vhdl_parse:
+            self.assertEqual(create_project(), ["ent", "pkg"])
+            vhdl_parse.assert_not_called()
+
+        # The content hashes of every hash method are indexed
+        with set_env(VUNIT_CONTENT_HASH="blake2b"), mock.patch.object(VHDLParser, "parse") as vhdl_parse:
+            self.assertEqual(create_project(), ["ent", "pkg"])
+            vhdl_parse.assert_not_called()
+            content_hash = self.project.get_source_files_in_order()[0].content_hash
+
+        # The content hash is the one of the selected hash method
+        with set_env(VUNIT_CONTENT_HASH="blake2b"):
+            project = Project()
+            project.add_library("lib", "lib_path")
+            source_file = project.add_source_file(str(package_path / "vhdl" / "ent.vhd"), "lib")
+            self.assertEqual(source_file.content_hash, content_hash)
+
+        # Changed files are parsed, also when the size is unchanged
+        write_file(str(package_path / "vhdl" / "pkg.vhd"), "package oth is end package;")
+        self.assertEqual(create_project(), ["ent", "oth"])
+
     def test_verilog_defines_affects_dependency_scanning(self):
         self.project.add_library("lib", "lib_path")
         self.add_source_file(
@@ -15,9 +15,13 @@ import os
 from shutil import rmtree
 from unittest import mock
 from vunit.sim_if.rivierapro import RivieraProInterface
+from vunit.sim_if.factory import SIMULATOR_FACTORY
 from vunit.project import Project
 from vunit.ostools import renew_path, write_file
 from vunit.vhdl_standard import VHDL
+from vunit.configuration import Configuration
+from tests.unit.test_test_bench import Entity
+from tests.unit.test_modelsim_interface import PersistentShellMock
 
 
 class TestRivieraProInterface(unittest.TestCase):
@@ -384,6 +388,61 @@ class TestRivieraProInterface(unittest.TestCase):
             env=simif.get_env(),
         )
 
+    @mock.patch("vunit.sim_if.rivierapro.Process", autospec=True)
+    @mock.patch("vunit.sim_if.rivierapro.RivieraProInterface.find_prefix", return_value="prefix")
+    def test_library_mapping_is_noop_when_unchanged(self, _find_prefix, process):
+        simif = RivieraProInterface(prefix="prefix", output_path=self.output_path)
+        lib_path = Path(self.output_path) / "lib_path"
+        lib_path.mkdir()
+        with Path(simif._sim_cfg_file_name).open("a", encoding="utf-8") as fptr:
+            fptr.write(f'lib = "{lib_path.as_posix()!s}/lib.lib"\n')
+        project = Project()
+        project.add_library("lib", str(lib_path))
+        project.add_library("lib2", "lib2_path")
+        process.reset_mock()
+
+        simif.setup_library_mapping(project)
+        process.assert_any_call(
+            [str(Path("prefix") / "vlib"), "lib2", "lib2_path"],
+            cwd=self.output_path,
+            env=simif.get_env(),
+        )
+        process.assert_called_with(
+            [str(Path("prefix") / "vmap"), "lib2", "lib2_path"],
+            cwd=self.output_path,
+            env=simif.get_env(),
+        )
+        self.assertEqual(process.call_count, 2)
+
+    @mock.patch("vunit.sim_if.rivierapro.Process", autospec=True)
+    @mock.patch("vunit.sim_if.rivierapro.RivieraProInterface.find_prefix", return_value="prefix")
+    def test_keeps_design_loaded_between_runs(self, _find_prefix, _process):
+        SIMULATOR_FACTORY.check_sim_option("rivierapro.keep_design_loaded", True)
+        simif = RivieraProInterface(prefix="prefix", output_path=self.output_path)
+        shell = PersistentShellMock()
+        simif._persistent_shell = shell  # pylint: disable=protected-access
+
+        design_unit = Entity("tb_entity", file_name=str(Path(self.output_path) / "file.vhd"))
+        design_unit.generic_names = ["runner_cfg"]
+
+        def simulate(name, runner_cfg):
+            config = Configuration(
+                "name",
+                design_unit,
+                generics={"runner_cfg": runner_cfg},
+                sim_options={"rivierapro.keep_design_loaded": True},
+            )
+            shell.commands = []
+            self.assertTrue(simif.simulate(str(Path(self.output_path) / name), "lib.tb_entity", config, False))
+            return shell.commands
+
+        commands = simulate("test1", "enabled_test_cases : test1")
+        self.assertIn("set failed [vunit_load]", commands)
+
+        commands = simulate("test2", "enabled_test_cases : test2")
+        self.assertNotIn("set failed [vunit_load]", commands)
+        self.assertIn("_vunit_sim_restart", commands[1])
+
     def setUp(self):
         self.output_path = str(Path(__file__).parent / "test_rivierapro_out")
         renew_path(self.output_path)
@@ -0,0 +1,171 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2023, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Test serving requests over a Unix domain socket
+"""
+
+from pathlib import Path
+import json
+import socket
+import threading
+import unittest
+from unittest import mock
+from tests.common import with_tempdir
+from vunit.ostools import write_file
+from vunit.server import (
+    Server,
+    RequestError,
+    request,
+    PARSE_ERROR,
+    INVALID_REQUEST,
+    METHOD_NOT_FOUND,
+    INVALID_PARAMS,
+    INTERNAL_ERROR,
+)
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Requires Unix domain sockets")
+class TestServer(unittest.TestCase):
+    """
+    Test serving requests over a Unix domain socket
+    """
+
+    def test_handle_request(self):
+        server = Server("unused", {"add": lambda x, y: x + y})
+        self.assertEqual(
+            server.handle(b'{"jsonrpc": "2.0", "id": 1, "method": "add", "params": {"x": 1, "y": 2}}'),
+            {"jsonrpc": "2.0", "id": 1, "result": 3},
+        )
+        self.assertEqual(
+            server.handle(b'{"jsonrpc": "2.0", "id": 2, "method": "add", "params": [3, 4]}'),
+            {"jsonrpc": "2.0", "id": 2, "result": 7},
+        )
+
+    def test_notifications_have_no_response(self):
+        method = mock.Mock(return_value=None)
+        server = Server("unused", {"method": method})
+        self.assertIsNone(server.handle(b'{"jsonrpc": "2.0", "method": "method"}'))
+        method.assert_called_once_with()
+
+    def test_handle_errors(self):
+        def fail():
+            raise RuntimeError("Failed")
+
+        server = Server("unused", {"add": lambda x, y: x + y, "fail": fail})
+
+        def error_code_of(line):
+            return server.handle(line)["error"]["code"]
+
+        self.assertEqual(error_code_of(b"{"), PARSE_ERROR)
+        self.assertEqual(error_code_of(b"[]"), INVALID_REQUEST)
+        self.assertEqual(error_code_of(b'{"id": 1, "method": "missing"}'), METHOD_NOT_FOUND)
+        self.assertEqual(error_code_of(b'{"id": 1, "method": "add", "params": {"x": 1}}'), INVALID_PARAMS)
+        with mock.patch("vunit.server.traceback.print_exc"):
+            self.assertEqual(error_code_of(b'{"id": 1, "method": "fail"}'), INTERNAL_ERROR)
+
+    @with_tempdir
+    def test_serves_requests_until_shutdown(self, tempdir):
+        socket_path = str(Path(tempdir) / "socket")
+        calls = []
+        server = Server(socket_path, {"echo": lambda value: calls.append(value) or value})
+        thread = self.start(server, socket_path)
+
+        self.assertEqual(request(socket_path, "echo", {"value": "first"}), "first")
+        self.assertEqual(request(socket_path, "echo", ["second"]), "second")
+        self.assertRaises(RequestError, request, socket_path, "missing")
+        self.assertTrue(request(socket_path, "shutdown"))
+        thread.join()
+
+        self.assertEqual(calls, ["first", "second"])
+        self.assertFalse(Path(socket_path).exists())
+
+    @with_tempdir
+    def test_restarts_when_watched_file_changed(self, tempdir):
+        socket_path = str(Path(tempdir) / "socket")
+        file_name = str(Path(tempdir) / "file.vhd")
+        write_file(file_name, "entity ent is end entity;")
+
+        server = Server(socket_path, {"echo": lambda value: value}, watched_files=[file_name])
+        pending_requests = []
+
+        def restart(listener, connection, pending):  # pylint: disable=unused-argument
+            pending_requests.append(json.loads(pending.split(b"\n")[0]))
+            # The process is replaced when really restarting
+            raise SystemExit(0)
+
+        with mock.patch.object(server, "_restart", side_effect=restart):
+            thread = self.start(server, socket_path)
+            self.assertEqual(request(socket_path, "echo", ["before change"]), "before change")
+
+            write_file(file_name, "entity ent is end entity ent;")
+            self.assertRaises(ConnectionError, request, socket_path, "echo", ["after change"])
+            thread.join()
+
+        self.assertEqual([message["params"] for message in pending_requests], [["after change"]])
+
+    @with_tempdir
+    def test_restarts_when_file_matching_watched_pattern_added(self, tempdir):
+        socket_path = str(Path(tempdir) / "socket")
+        (Path(tempdir) / "src").mkdir()
+        write_file(str(Path(tempdir) / "src" / "file1.vhd"), "entity ent1 is end entity;")
+        write_file(str(Path(tempdir) / "src" / "file.txt"), "")
+
+        server = Server(
+            socket_path, {"echo": lambda value: value}, watched_patterns=[str(Path(tempdir) / "src" / "*.vhd")]
+        )
+
+        with mock.patch.object(server, "_restart", side_effect=SystemExit(0)) as restart:
+            thread = self.start(server, socket_path)
+
+            # Files not matching the pattern are ignored
+            write_file(str(Path(tempdir) / "src" / "other.txt"), "")
+            self.assertEqual(request(socket_path, "echo", ["before add"]), "before add")
+
+            write_file(str(Path(tempdir) / "src" / "file2.vhd"), "entity ent2 is end entity;")
+            self.assertRaises(ConnectionError, request, socket_path, "echo", ["after add"])
+            thread.join()
+
+        self.assertEqual(restart.call_count, 1)
+
+    @with_tempdir
+    def test_replaces_socket_of_stopped_server(self, tempdir):
+        socket_path = str(Path(tempdir) / "socket")
+        stopped = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stopped.bind(socket_path)
+        stopped.close()
+
+        server = Server(socket_path, {})
+        thread = self.start(server, socket_path)
+        self.assertRaises(RuntimeError, Server(socket_path, {}).serve)
+        request(socket_path, "shutdown")
+        thread.join()
+
+    @staticmethod
+    def start(server, socket_path):
+        """
+        Serve requests in a thread once the server is listening
+        """
+        listening = threading.Event()
+        listen = server._listen  # pylint: disable=protected-access
+
+        def wrapped_listen():
+            listener = listen()
+            listening.set()
+            return listener
+
+        def serve():
+            try:
+                server.serve()
+            except SystemExit:
+                pass
+
+        with mock.patch.object(server, "_listen", side_effect=wrapped_listen):
+            thread = threading.Thread(target=serve)
+            thread.start()
+            listening.wait(10.0)
+        assert Path(socket_path).exists()
+        return thread
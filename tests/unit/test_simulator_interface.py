@@ -19,8 +19,10 @@ from vunit.sim_if import (
     SimulatorInterface,
     BooleanOption,
     ListOfStringOption,
+    PositiveNumberOption,
     StringOption,
     VHDLAssertLevelOption,
+    ToolProbeCache,
 )
 from vunit.exceptions import CompileError
 from vunit.ostools import renew_path, write_file
@@ -227,6 +229,60 @@ Compile failed
         self.assertEqual(simif.find_prefix(), "prefix_from_path")
         environ.get.assert_called_once_with("VUNIT_SIMNAME_PATH", None)
 
+    def test_tool_probe_cache(self):
+        executable = str(Path(self.output_path) / "tool")
+        write_file(executable, "version 1")
+        cache_file_name = str(Path(self.output_path) / "tool_probes.json")
+        probe = mock.Mock(return_value="version 1")
+
+        cache = ToolProbeCache()
+        cache.set_file_name(cache_file_name)
+        self.assertEqual(cache.get(executable, ["--version"], probe), "version 1")
+        self.assertEqual(cache.get(executable, ["--version"], probe), "version 1")
+        self.assertEqual(probe.call_count, 1)
+
+        # The cache is loaded by the next run
+        cache = ToolProbeCache()
+        cache.set_file_name(cache_file_name)
+        self.assertEqual(cache.get(executable, ["--version"], probe), "version 1")
+        self.assertEqual(probe.call_count, 1)
+
+        # A changed executable is probed again
+        write_file(executable, "version 10")
+        probe.return_value = "version 10"
+        self.assertEqual(cache.get(executable, ["--version"], probe), "version 10")
+        self.assertEqual(probe.call_count, 2)
+
+        # Missing executables are not cached
+        missing = str(Path(self.output_path) / "missing")
+        cache.get(missing, ["--version"], probe)
+        cache.get(missing, ["--version"], probe)
+        self.assertEqual(probe.call_count, 4)
+
+    def test_version_key(self):
+        class MySimulatorInterface(SimulatorInterface):  # pylint: disable=abstract-method
+            """
+            Dummy simulator interface for testing
+            """
+
+            name = "simname"
+            version_executables = ["tool"]
+
+        executable = str(Path(self.output_path) / "tool")
+        with mock.patch.object(MySimulatorInterface, "find_prefix", return_value=self.output_path):
+            self.assertEqual(MySimulatorInterface.get_version_key(), None)
+
+            write_file(executable, "version 1")
+            key = MySimulatorInterface.get_version_key()
+            self.assertNotEqual(key, None)
+            self.assertEqual(MySimulatorInterface.get_version_key(), key)
+
+            write_file(executable, "version 10")
+            self.assertNotEqual(MySimulatorInterface.get_version_key(), key)
+
+        with mock.patch.object(MySimulatorInterface, "find_prefix", return_value=None):
+            self.assertEqual(MySimulatorInterface.get_version_key(), None)
+
     def setUp(self):
         self.output_path = str(Path(__file__).parent / "test_simulator_interface__out")
         renew_path(self.output_path)
@@ -270,6 +326,14 @@ class TestOptions(unittest.TestCase):
         )
         self._test_not_ok(option, "foo", "Option 'optname' must be a list of strings. " "Got 'foo'")
 
+    def test_positive_number_option(self):
+        option = PositiveNumberOption("optname")
+        self._test_ok(option, 1)
+        self._test_ok(option, 0.5)
+        self._test_not_ok(option, 0, "Option 'optname' must be a positive number. Got 0")
+        self._test_not_ok(option, True, "Option 'optname' must be a positive number. Got True")
+        self._test_not_ok(option, "10", "Option 'optname' must be a positive number. Got '10'")
+
     def test_vhdl_assert_level(self):
         option = VHDLAssertLevelOption()
         self._test_ok(option, "warning")
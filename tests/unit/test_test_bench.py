@@ -305,6 +305,36 @@ if run("Test_2")
         )
         self.assertEqual(get_config_of(tests, "lib.tb_entity.value=2").attributes, {".foo": "bar"})
 
+    @with_tempdir
+    def test_get_test_runs_has_the_names_of_the_created_tests(self, tempdir):
+        for contents in [
+            """\
+if run("Test_1")
+if run("Test_2")
+""",
+            """\
+-- vunit: run_all_in_same_sim
+if run("Test_1")
+if run("Test_2")
+""",
+            "",
+        ]:
+            design_unit = Entity("tb_entity", file_name=str(Path(tempdir) / "file.vhd"), contents=contents)
+            design_unit.generic_names = ["runner_cfg", "value"]
+            test_bench = TestBench(design_unit)
+            test_bench.add_config(name="value=1", generics=dict(value=1))
+            test_bench.add_config(name="value=2", generics=dict(value=2))
+
+            test_runs = test_bench.get_test_runs()
+            tests = self.create_tests(test_bench)
+            self.assertEqual(
+                [[name for name, _, _ in test_run] for test_run in test_runs],
+                [test.test_names for test in tests],
+            )
+            for test_run, test in zip(test_runs, tests):
+                for _, _, config in test_run:
+                    self.assertEqual(config.name, get_config_of(tests, test.name).name)
+
     @with_tempdir
     def test_test_case_add_config(self, tempdir):
         design_unit = Entity(
@@ -12,7 +12,7 @@ from unittest import TestCase
 import os
 from pathlib import Path
 from xml.etree import ElementTree
-from vunit.test.report import TestReport, PASSED, SKIPPED, FAILED
+from vunit.test.report import TestReport, PASSED, SKIPPED, FAILED, TIMED_OUT
 from vunit.ui.common import TEST_OUTPUT_PATH
 from vunit.ui.results import Results
 
@@ -137,6 +137,40 @@ Elapsed time was 3.0 seconds
         self.assertTrue(report.result_of("skipped_test").skipped)
         self.assertTrue(report.result_of("failed_test").failed)
 
+    def test_report_with_timed_out_tests(self):
+        report = self._new_report()
+        report.add_result("passed_test", PASSED, time=1.0, output_file_name=self.output_file_name)
+        report.add_result("timed_out_test", TIMED_OUT, time=3.0, output_file_name=self.output_file_name)
+        report.set_expected_num_tests(2)
+        report.set_real_total_time(4.0)
+        self.assertEqual(
+            self.report_to_str(report),
+            """\
+==== Summary ==========================
+{gi}pass{x} passed_test    (1.0 seconds)
+{ri}fail{x} timed_out_test (3.0 seconds, timed out)
+=======================================
+{gi}pass{x} 1 of 2
+{ri}fail{x} 1 of 2
+=======================================
+Total time was 4.0 seconds
+Elapsed time was 4.0 seconds
+=======================================
+{ri}Some failed!{x}
+""",
+        )
+        self.assertFalse(report.all_ok())
+        self.assertTrue(report.result_of("timed_out_test").failed)
+        self.assertTrue(report.result_of("timed_out_test").timed_out)
+        self.assertFalse(report.result_of("passed_test").timed_out)
+
+        root = ElementTree.fromstring(report.to_junit_xml_str())
+        self.assertEqual(root.attrib["failures"], "1")
+        self.assert_has_test(root, "timed_out_test", time="3.0", status="failed")
+        failure = [test for test in root.findall("testcase") if test.attrib["name"] == "timed_out_test"][0]
+        self.assertEqual(failure.find("failure").attrib["message"], "Timed out")
+        self.assertEqual(report.result_of("timed_out_test").to_dict()["status"], "timed_out")
+
     def test_report_with_no_tests(self):
         report = self._new_report()
         self.assertEqual(
@@ -257,6 +291,10 @@ Elapsed time was 3.0 seconds
             ),
         )
 
+    def test_coordinator_cannot_merge_coverage(self):
+        results = Results("output_path", None, self._report_with_all_passed_tests())
+        self.assertRaises(RuntimeError, results.merge_coverage, "coverage.ucdb")
+
     def test_dict_report_with_all_passed_tests(self):
         opath = Path(self.output_file_name).parent.parent
         test_path = opath / TEST_OUTPUT_PATH / "unit"
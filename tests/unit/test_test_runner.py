@@ -9,13 +9,19 @@ Test the test runner
 """
 
 from pathlib import Path
+import os
+import sys
+import threading
+import time
 import unittest
 from unittest import mock
 from tests.common import with_tempdir
 from vunit.hashing import hash_string
-from vunit.test.runner import TestRunner
+from vunit.test.runner import TestRunner, TestScheduler
 from vunit.test.report import TestReport
 from vunit.test.list import TestList
+from vunit.test.host_load import load_memory_estimates
+from vunit.ostools import Process
 
 
 class TestTestRunner(unittest.TestCase):
@@ -135,6 +141,177 @@ class TestTestRunner(unittest.TestCase):
         self.assertTrue(report.result_of("test").passed)
         self.assertEqual(report.result_of("test").output, "out1out2out3out4out5")
 
+    @with_tempdir
+    def test_runner_created_while_another_runner_is_running(self, tempdir):
+        stdout = sys.stdout
+        inner_report = TestReport()
+        inner_runners = []
+
+        def create_inner_runner(*args, **kwargs):  # pylint: disable=unused-argument
+            """
+            Side effect that creates a runner which is run after this runner finished
+            """
+            inner_runners.append(TestRunner(inner_report, str(Path(tempdir) / "inner")))
+            return True
+
+        outer_list = TestList()
+        outer_list.add_test(TestCaseMock("outer", create_inner_runner))
+        TestRunner(TestReport(), str(Path(tempdir) / "outer")).run(outer_list)
+
+        def side_effect(*args, **kwargs):  # pylint: disable=unused-argument
+            """
+            Side effect that print output to stdout
+            """
+            print("inner output")
+            return True
+
+        inner_list = TestList()
+        inner_list.add_test(TestCaseMock("inner", side_effect))
+        inner_runners[0].run(inner_list)
+
+        self.assertEqual(inner_report.result_of("inner").output, "inner output\n")
+        self.assertIs(sys.stdout, stdout)
+
+    @with_tempdir
+    def test_respects_resource_limits(self, tempdir):
+        report = TestReport()
+        runner = TestRunner(report, tempdir, num_threads=3, resource_limits={"lic": 2})
+
+        lock = threading.Lock()
+        in_use = []
+        max_in_use = []
+
+        def create_side_effect(resources):
+            def side_effect(*args, **kwargs):  # pylint: disable=unused-argument
+                with lock:
+                    in_use.append(resources)
+                    max_in_use.append(sum(len(res) for res in in_use))
+                time.sleep(0.05)
+                with lock:
+                    in_use.remove(resources)
+                return True
+
+            return side_effect
+
+        test_list = TestList()
+        for idx, resources in enumerate([["lic"], ["lic", "lic"], ["lic"], [], ["lic"]]):
+            test_case = self.create_test(f"test{idx}", True)
+            test_case.resources = resources
+            test_case.run_side_effect = create_side_effect(resources)
+            test_list.add_test(test_case)
+
+        runner.run(test_list)
+        self.assertTrue(report.all_ok())
+        self.assertEqual(report.num_tests(), 5)
+        self.assertLessEqual(max(max_in_use), 2)
+
+    @with_tempdir
+    def test_auto_num_threads_records_peak_memory(self, tempdir):
+        report = TestReport()
+        runner = TestRunner(report, tempdir, num_threads="auto")
+
+        def side_effect(*args, **kwargs):  # pylint: disable=unused-argument
+            Process([sys.executable, "-c", "data = bytearray(16 * 1024 * 1024)"]).consume_output()
+            return True
+
+        test_case = self.create_test("test", True)
+        test_case.run_side_effect = side_effect
+        test_list = TestList()
+        test_list.add_test(test_case)
+        runner.run(test_list)
+        self.assertTrue(report.result_of("test").passed)
+
+        estimates = load_memory_estimates(str(Path(tempdir) / "peak_memory.json"))
+        if hasattr(os, "wait4"):
+            self.assertGreaterEqual(estimates["test"], 16 * 1024 * 1024)
+
+    @with_tempdir
+    def test_timeout_kills_simulator(self, tempdir):
+        report = TestReport()
+        runner = TestRunner(report, tempdir, timeout=0.5)
+
+        def side_effect(*args, **kwargs):  # pylint: disable=unused-argument
+            try:
+                Process([sys.executable, "-c", "import time; time.sleep(60)"]).consume_output()
+            except Process.NonZeroExitCode:
+                return False
+            return True
+
+        test_case1 = self.create_test("test1", True)
+        test_case1.run_side_effect = side_effect
+        test_case2 = self.create_test("test2", True)
+        test_list = TestList()
+        test_list.add_test(test_case1)
+        test_list.add_test(test_case2)
+
+        start = time.time()
+        runner.run(test_list)
+        self.assertLess(time.time() - start, 30)
+        self.assertTrue(report.result_of("test1").failed)
+        self.assertTrue(report.result_of("test1").timed_out)
+        self.assertIn("Test timed out after 0.5 seconds", report.result_of("test1").output)
+        self.assertTrue(report.result_of("test2").passed)
+        self.assertFalse(report.result_of("test2").timed_out)
+
+    @with_tempdir
+    def test_timeout_sim_option_overrides_runner_timeout(self, tempdir):
+        report = TestReport()
+        runner = TestRunner(report, tempdir, timeout=60)
+
+        def side_effect(*args, **kwargs):  # pylint: disable=unused-argument
+            time.sleep(0.5)
+            return True
+
+        test_case = self.create_test("test", True)
+        test_case.timeout = 0.1
+        test_case.run_side_effect = side_effect
+        test_list = TestList()
+        test_list.add_test(test_case)
+        runner.run(test_list)
+        self.assertTrue(report.result_of("test").timed_out)
+        self.assertIn("Test timed out after 0.1 seconds", report.result_of("test").output)
+
+    def test_scheduler_hands_out_tests_with_available_resources(self):
+        tests = [SuiteMock("test1", ["lic"]), SuiteMock("test2", ["lic"]), SuiteMock("test3", [])]
+        scheduler = TestScheduler(tests, {"lic": 1})
+        self.assertIs(scheduler.next(), tests[0])
+        self.assertIs(scheduler.next(), tests[2])
+        scheduler.test_done(tests[0])
+        self.assertIs(scheduler.next(), tests[1])
+        self.assertRaises(StopIteration, scheduler.next)
+
+    def test_scheduler_hands_out_rescheduled_test_again(self):
+        tests = [SuiteMock("test1", ["lic"]), SuiteMock("test2", ["lic"])]
+        scheduler = TestScheduler(tests, {"lic": 1})
+        self.assertIs(scheduler.next(), tests[0])
+        scheduler.reschedule(tests[0])
+        self.assertIs(scheduler.next(), tests[0])
+        scheduler.test_done(tests[0])
+        self.assertFalse(scheduler.is_finished())
+        self.assertIs(scheduler.next(), tests[1])
+        scheduler.test_done(tests[1])
+        self.assertTrue(scheduler.is_finished())
+
+    def test_scheduler_prefers_tests_with_same_affinity(self):
+        tests = [SuiteMock("test1", [], "tb1"), SuiteMock("test2", [], "tb2"), SuiteMock("test3", [], "tb1")]
+        scheduler = TestScheduler(tests)
+        self.assertIs(scheduler.next(), tests[0])
+        self.assertIs(scheduler.next(), tests[2])
+        self.assertIs(scheduler.next(), tests[1])
+
+        # Affinity is per thread
+        tests = [SuiteMock("test1", [], "tb1"), SuiteMock("test2", [], "tb2"), SuiteMock("test3", [], "tb1")]
+        scheduler = TestScheduler(tests)
+        self.assertIs(scheduler.next(), tests[0])
+        selected = []
+        thread = threading.Thread(target=lambda: selected.append(scheduler.next()))
+        thread.start()
+        thread.join()
+        self.assertEqual(selected, [tests[1]])
+
+    def test_scheduler_rejects_tests_exceeding_resource_limits(self):
+        self.assertRaises(ValueError, TestScheduler, [SuiteMock("test", ["lic", "lic"])], {"lic": 1})
+
     def test_get_output_path_on_linux(self):
         output_path = "output_path"
         report = TestReport()
@@ -235,3 +412,14 @@ class TestCaseMock(object):
         self.output_path = output_path
         self.read_output = read_output
         return self.run_side_effect(output_path=output_path, read_output=read_output)
+
+
+class SuiteMock(object):
+    """
+    A test suite mock class with resources and affinity
+    """
+
+    def __init__(self, name, resources, affinity=None):
+        self.name = name
+        self.resources = resources
+        self.affinity = affinity
@@ -10,10 +10,13 @@ Test the test suites
 
 from pathlib import Path
 from unittest import TestCase
-from tests.common import create_tempdir
-from vunit.test.suites import TestRun
+from tests.common import create_tempdir, with_tempdir
+from tests.unit.test_test_bench import Entity
+from vunit.test.suites import TestRun, get_result_file_name
 from vunit.test.report import PASSED, SKIPPED, FAILED
 from vunit.sim_if import SimulatorInterface
+from vunit.configuration import Configuration
+from vunit.ostools import read_file, write_file
 
 
 class TestTestSuites(TestCase):
@@ -110,6 +113,43 @@ test_suite_done""",
             self.assertEqual(results, expected)
             return results
 
+    @with_tempdir
+    def test_resume_after_crash(self, tempdir):
+        runs = [
+            "test_start:test1\ntest_start:test2\n",
+            "test_start:test3\n",
+            "test_start:test4\ntest_suite_done\n",
+        ]
+        sim_if = SimulatorMock(tempdir, runs)
+        results = self._run_resumed(tempdir, sim_if, ["test1", "test2", "test3", "test4"])
+        self.assertEqual(results, {"test1": PASSED, "test2": FAILED, "test3": FAILED, "test4": PASSED})
+        self.assertEqual(sim_if.enabled_test_cases, ["test1,test2,test3,test4", "test3,test4", "test4"])
+        self.assertEqual(read_file(get_result_file_name(tempdir)), "".join(runs))
+
+    @with_tempdir
+    def test_resume_after_crash_stops_when_no_test_starts(self, tempdir):
+        sim_if = SimulatorMock(tempdir, ["test_start:test1\ntest_start:test2\n", ""])
+        results = self._run_resumed(tempdir, sim_if, ["test1", "test2", "test3"])
+        self.assertEqual(results, {"test1": PASSED, "test2": FAILED, "test3": SKIPPED})
+        self.assertEqual(sim_if.enabled_test_cases, ["test1,test2,test3", "test3"])
+
+    @staticmethod
+    def _run_resumed(tempdir, sim_if, test_cases):
+        """
+        Helper method to run test cases with the resume_after_crash sim option set
+        """
+        design_unit = Entity("tb_entity", file_name=str(Path(tempdir) / "file.vhd"))
+        design_unit.generic_names = ["runner_cfg"]
+        config = Configuration("name", design_unit, sim_options={"resume_after_crash": True})
+        run = TestRun(
+            simulator_if=sim_if,
+            config=config,
+            elaborate_only=False,
+            test_suite_name="lib.tb_entity",
+            test_cases=test_cases,
+        )
+        return run.run(output_path=str(tempdir), read_output=None)
+
     def test_exit_code(self):
         """
         Test that results are overwritten when none is FAILED but the exit code is nonzero
@@ -186,3 +226,35 @@ test_suite_done""",
                 run._check_results(results, sim_ok),  # pylint: disable=protected-access
                 (waschecked, expected),
             )
+
+
+class SimulatorMock(object):
+    """
+    Simulator mock writing one results file content per simulation
+    """
+
+    use_color = False
+
+    def __init__(self, output_path, runs):
+        self._output_path = output_path
+        self._runs = list(runs)
+        self.enabled_test_cases = []
+
+    @property
+    def output_path(self):
+        return self._output_path
+
+    @staticmethod
+    def has_valid_exit_code():
+        return True
+
+    def simulate(self, output_path, test_suite_name, config, elaborate_only):  # pylint: disable=unused-argument
+        """
+        Record the enabled test cases and write the next results
+        """
+        runner_cfg = config.generics["runner_cfg"]
+        enabled_test_cases = runner_cfg.split("enabled_test_cases : ")[1].split(",output path")[0]
+        self.enabled_test_cases.append(enabled_test_cases.replace(",,", ","))
+        contents = self._runs.pop(0)
+        write_file(get_result_file_name(output_path), contents)
+        return "test_suite_done" in contents
@@ -11,9 +11,10 @@ Acceptance test of the VUnit public interface class
 """
 
 import unittest
+from concurrent.futures import ProcessPoolExecutor
 from string import Template
 from pathlib import Path
-from os import chdir, getcwd
+from os import chdir, getcwd, path
 import json
 import re
 from re import MULTILINE
@@ -22,8 +23,9 @@ from unittest import mock
 from tests.common import set_env, with_tempdir, create_vhdl_test_bench_file
 from vunit.ui import VUnit
 from vunit.source_file import VHDL_EXTENSIONS, VERILOG_EXTENSIONS
-from vunit.ostools import renew_path
-from vunit.builtins import add_verilog_include_dir
+from vunit.ostools import renew_path, read_file
+from vunit.builtins import add_verilog_include_dir, get_builtin_sources
+from vunit.builtins_cache import BuiltinsCache
 from vunit.sim_if import SimulatorInterface
 from vunit.vhdl_standard import VHDL
 from vunit.ui.preprocessor import Preprocessor
@@ -227,6 +229,67 @@ end architecture;
         logger.assert_called_once_with("Failed to preprocess %s", str(Path(file_name).resolve()))
         self.assertFalse((Path(self._preprocessed_path) / "lib" / file_name.name).exists())
 
+    def test_reuses_preprocessed_files_of_previous_run(self):
+        file_name1 = self.create_entity_file(1)
+        file_name2 = str(Path(self.tmp_path) / "sub" / Path(file_name1).name)
+        (Path(self.tmp_path) / "sub").mkdir()
+        self.create_file(file_name2, "entity ent2 is end entity;")
+
+        def add_files(ui, file_names):
+            ui.add_library("lib")
+            ui.add_preprocessor(VUnitfier())
+            return [str(Path(ui.add_source_file(file_name, "lib").name).resolve()) for file_name in file_names]
+
+        pp_file_names = add_files(self._create_ui(), [file_name1, file_name2])
+        self.assertEqual(
+            pp_file_names,
+            [
+                str(Path(self._preprocessed_path) / "lib" / Path(file_name1).name),
+                str(Path(self._preprocessed_path) / "lib" / ("1_" + Path(file_name1).name)),
+            ],
+        )
+        mtimes = [Path(pp_file_name).stat().st_mtime_ns for pp_file_name in pp_file_names]
+
+        with mock.patch.object(VUnitfier, "run", autospec=True) as run:
+            # The preprocessed names are kept when the files are added in another order
+            pp_file_names2 = add_files(self._create_ui_without_clean(), [file_name2, file_name1])
+            run.assert_not_called()
+        self.assertEqual(pp_file_names2, list(reversed(pp_file_names)))
+        self.assertEqual([Path(pp_file_name).stat().st_mtime_ns for pp_file_name in pp_file_names], mtimes)
+
+        self.create_file(file_name2, "entity ent3 is end entity;")
+        add_files(self._create_ui_without_clean(), [file_name1, file_name2])
+        self.assertEqual(read_file(pp_file_names[1]), "entity ent3 is end entity;")
+
+    @mock.patch("vunit.ui.LOGGER.error", autospec=True)
+    def test_preprocesses_files_in_parallel(self, logger):
+        file_names = [self.create_entity_file(idx) for idx in range(4)]
+        (Path(self.tmp_path) / "sub").mkdir()
+        file_names.append(str(Path(self.tmp_path) / "sub" / Path(file_names[0]).name))
+        self.create_file(file_names[-1], 'entity ent is begin log("Hello"; end entity;')
+
+        ui = self._create_ui("--num-threads=2")
+        ui.enable_location_preprocessing()
+        lib = ui.add_library("lib")
+        with mock.patch("vunit.ui.ProcessPoolExecutor", wraps=ProcessPoolExecutor) as executor:
+            source_files = lib.add_source_files([file_names[-1]] + file_names[:-1])
+            executor.assert_called_once()
+
+        logger.assert_called_once_with("Failed to preprocess %s", str(Path(file_names[-1]).resolve()))
+        self.assertEqual(
+            [str(Path(source_file.name).resolve()) for source_file in source_files],
+            [str(Path(file_names[-1]).resolve())]
+            + [str(Path(self._preprocessed_path) / "lib" / Path(file_name).name) for file_name in file_names[:-1]],
+        )
+        self.assertIn(
+            'log("Hello World", line_num => 10, ', read_file(Path(self._preprocessed_path) / "lib" / "ent1.vhd")
+        )
+
+    def test_num_workers_with_unknown_number_of_cpus(self):
+        ui = self._create_ui("--num-threads=auto")
+        with mock.patch("vunit.ui.os.cpu_count", autospec=True, return_value=None):
+            self.assertEqual(ui._get_num_workers(), 1)
+
     def test_supported_source_file_suffixes(self):
         """Test adding a supported filetype, of any case, is accepted."""
         ui = self._create_ui()
@@ -555,6 +618,43 @@ end entity;
         self.assertEqual(len(compile_order), 1)
         self.assertEqual(compile_order[0].name, file_name)
 
+    @with_tempdir
+    def test_serve(self, tempdir):
+        ui = self._create_ui("--serve", str(Path(tempdir) / "socket"), "*Test 1")
+        lib = ui.add_library("lib")
+        file_name = str(Path(tempdir) / "tb_serve.vhd")
+        create_vhdl_test_bench_file(
+            "tb_serve",
+            file_name,
+            tests=["Test 1", "Test 2"],
+            test_attributes={"Test 1": [], "Test 2": [".attr"]},
+        )
+        lib.add_source_file(file_name)
+        lib.add_source_files(Path(tempdir) / "src" / "*.vhd", allow_empty=True)
+
+        with mock.patch("vunit.ui.Server", autospec=True) as server:
+            self._run_main(ui)
+
+        (socket_path, methods), kwargs = server.call_args
+        self.assertEqual(socket_path, str(Path(tempdir) / "socket"))
+        self.assertIn(str(Path(file_name).resolve()), kwargs["watched_files"])
+        self.assertEqual(kwargs["watched_patterns"], [path.abspath(str(Path(tempdir) / "src" / "*.vhd"))])
+        server.return_value.serve.assert_called_once_with()
+
+        self.assertEqual(methods["list"](), ["lib.tb_serve.Test 1"])
+        self.assertEqual(methods["list"](patterns=["*"]), ["lib.tb_serve.Test 1", "lib.tb_serve.Test 2"])
+        self.assertEqual(methods["list"](patterns=["*"], with_attributes=[".attr"]), ["lib.tb_serve.Test 2"])
+        self.assertEqual(
+            [item["library_name"] for item in methods["files"]()],
+            ["lib"],
+        )
+
+        simulator_if = mock.Mock(spec=SimulatorInterface)
+        ui._served_simulator_if = simulator_if
+        kwargs["before_restart"]()
+        simulator_if.teardown.assert_called_once_with()
+        self.assertIsNone(ui._served_simulator_if)
+
     def test_list_files_flag(self):
         ui = self._create_ui("--files")
         lib1 = ui.add_library("lib1")
@@ -649,6 +749,19 @@ Listed 2 files""".splitlines()
         setup(ui)
         check_stdout(ui, "lib.tb_filter.Test 1\n" "Listed 1 tests")
 
+    @with_tempdir
+    def test_export_json_does_not_write_file_on_compile_error(self, tempdir):
+        json_file = Path(tempdir) / "export.json"
+        ui = self._create_ui("--export-json", str(json_file))
+        lib = ui.add_library("lib")
+        for name, other in [("pkg1", "pkg2"), ("pkg2", "pkg1")]:
+            file_name = str(Path(tempdir) / f"{name!s}.vhd")
+            self.create_file(file_name, f"use work.{other!s}.all;\npackage {name!s} is\nend package;\n")
+            lib.add_source_file(file_name)
+
+        self._run_main(ui, code=1)
+        self.assertFalse(json_file.exists())
+
     @with_tempdir
     def test_export_json(self, tempdir):
         tdir = Path(tempdir)
@@ -1265,10 +1378,124 @@ end architecture;
             sorted(expected, key=lambda x: x.name),
         )
 
+    def test_set_resource_limit(self):
+        ui = self._create_ui()
+        ui.set_resource_limit("questa_sim", 8)
+        self.assertRaises(ValueError, ui.set_resource_limit, "questa_sim", 0)
+        self.assertRaises(ValueError, ui.set_resource_limit, "questa_sim", "8")
+
     def test_get_simulator_name(self):
         ui = self._create_ui()
         self.assertEqual(ui.get_simulator_name(), "mock")
 
+    def test_maps_prebuilt_builtins_as_external_libraries(self):
+        cache_path = Path(self.tmp_path) / "builtins_cache"
+        cache = BuiltinsCache(cache_path)
+        with mock.patch.object(MockSimulator, "get_version_key", return_value="version"):
+            ui = self._create_ui("--no-builtins-cache")
+            ui.add_vhdl_builtins()
+            ui.add_com()
+            entry_path = cache.get_entry_path(MockSimulator, VHDL.STD_2008, ["com"])
+            libraries = {name: entry_path / "libraries" / name for name in ["vunit_lib", "other_lib"]}
+            for directory in libraries.values():
+                directory.mkdir(parents=True)
+            cache.write_manifest(entry_path, ["com"], libraries, get_builtin_sources(ui._project))
+
+            def create_ui(*args):
+                """
+                Create the test project with the VHDL builtins and com
+                """
+                with set_env(VUNIT_BUILTINS_CACHE=str(cache_path)):
+                    ui = self._create_ui("--list", *args)
+                ui.add_vhdl_builtins()
+                ui.add_com()
+                return ui
+
+            def uses_prebuilt(ui):
+                """
+                Run main and return True if the prebuilt libraries are mapped instead of compiling the builtins
+                """
+                self._run_main(ui)
+                if not ui._project.get_library("vunit_lib").is_external:
+                    self.assertNotEqual(ui.library("vunit_lib").get_source_files(), [])
+                    return False
+
+                for name, directory in libraries.items():
+                    library = ui._project.get_library(name)
+                    self.assertTrue(library.is_external)
+                    self.assertEqual(Path(library.directory), directory.resolve())
+                self.assertEqual(ui.get_source_files(allow_empty=True), [])
+                return True
+
+            self.assertTrue(uses_prebuilt(create_ui()))
+            self.assertFalse(uses_prebuilt(create_ui("--no-builtins-cache")))
+
+            ui = create_ui()
+            ui.add_array_util()
+            self.assertFalse(uses_prebuilt(ui))
+
+            ui = create_ui()
+            ui.add_verilog_builtins()
+            self.assertFalse(uses_prebuilt(ui))
+
+            ui = create_ui()
+            ui.library("vunit_lib").add_source_file(self.create_entity_file())
+            self.assertFalse(uses_prebuilt(ui))
+
+            ui = create_ui()
+            ui.library("vunit_lib").add_compile_option("modelsim.vcom_flags", ["+cover=bs"])
+            self.assertFalse(uses_prebuilt(ui))
+
+            ui = create_ui()
+            ui.set_compile_option("enable_coverage", True)
+            self.assertFalse(uses_prebuilt(ui))
+
+            # The sources of the entry changed
+            ui = create_ui()
+            with mock.patch("vunit.source_file.SourceFile.content_hash", new="other"):
+                self.assertFalse(uses_prebuilt(ui))
+
+    def test_keeps_prebuilt_builtins_of_content_hash_methods_apart(self):
+        cache_path = Path(self.tmp_path) / "builtins_cache"
+        cache = BuiltinsCache(cache_path)
+
+        def create_ui():
+            """
+            Create the test project with the VHDL builtins
+            """
+            with set_env(VUNIT_BUILTINS_CACHE=str(cache_path)):
+                ui = self._create_ui("--list")
+            ui.add_vhdl_builtins()
+            return ui
+
+        def prebuild(ui):
+            """
+            Prebuild the builtins of the project and return the library directory of vunit_lib
+            """
+            entry_path = cache.get_entry_path(MockSimulator, VHDL.STD_2008, [])
+            libraries = {"vunit_lib": entry_path / "vunit_lib"}
+            libraries["vunit_lib"].mkdir(parents=True)
+            cache.write_manifest(entry_path, [], libraries, get_builtin_sources(ui._project))
+            return libraries["vunit_lib"].resolve()
+
+        def get_vunit_lib_directory(ui):
+            """
+            Run main and return the library directory of vunit_lib
+            """
+            self._run_main(ui)
+            return Path(ui._project.get_library("vunit_lib").directory)
+
+        with mock.patch.object(MockSimulator, "get_version_key", return_value="version"):
+            directories = {}
+            for method in ["sha1", "blake2b"]:
+                with set_env(VUNIT_CONTENT_HASH=method):
+                    directories[method] = prebuild(create_ui())
+
+            self.assertNotEqual(directories["sha1"], directories["blake2b"])
+            for method in ["sha1", "blake2b"]:
+                with set_env(VUNIT_CONTENT_HASH=method):
+                    self.assertEqual(get_vunit_lib_directory(create_ui()), directories[method])
+
     def _create_ui(self, *args):
         """Create an instance of the VUnit public interface class"""
         with mock.patch(
@@ -1277,6 +1504,14 @@ end architecture;
         ):
             return self._create_ui_real_sim(*args)
 
+    def _create_ui_without_clean(self):
+        """Create an instance of the VUnit public interface class keeping the output of a previous instance"""
+        with mock.patch(
+            "vunit.sim_if.factory.SIMULATOR_FACTORY.select_simulator",
+            new=lambda: MockSimulator,
+        ):
+            return VUnit.from_argv(argv=["--output-path=%s" % self._output_path], compile_builtins=False)
+
     def _create_ui_real_sim(self, *args):
         """Create an instance of the VUnit public interface class"""
         return VUnit.from_argv(
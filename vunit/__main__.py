@@ -0,0 +1,192 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2023, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+VUnit command line tools
+
+Usage:
+
+.. code-block:: console
+
+   vunit build-builtins [--vhdl-standard 2008] [--builtins com osvvm ...]
+   vunit request SOCKET METHOD [PARAMS]
+"""
+
+import sys
+import json
+import argparse
+from vunit.about import version
+from vunit.builtins import OPTIONAL_BUILTINS, get_builtin_sources, get_default_builtins, with_dependencies
+from vunit.builtins_cache import BuiltinsCache
+from vunit.server import RequestError, request
+from vunit.sim_if.factory import SIMULATOR_FACTORY
+from vunit.ui import VUnit
+from vunit.ui.common import select_vhdl_standard
+from vunit.vhdl_standard import VHDL
+from vunit.vunit_cli import positive_int_or_auto
+
+
+def _create_argument_parser():
+    """
+    Create the parser of the command line tools
+    """
+    parser = argparse.ArgumentParser(prog="vunit", description="VUnit command line tools")
+    parser.add_argument("--version", action="version", version=version())
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+
+    build_parser = subparsers.add_parser(
+        "build-builtins",
+        help="Compile the builtin libraries into the builtins cache",
+        description=(
+            "Compile the builtin libraries with the simulator selected by VUNIT_SIMULATOR "
+            "into the directory of VUNIT_BUILTINS_CACHE, by default ~/.cache/vunit/builtins. "
+            "Projects using the same VUnit version, simulator, simulator version and VHDL standard "
+            "map the prebuilt libraries as external libraries instead of compiling the builtins."
+        ),
+    )
+    build_parser.add_argument(
+        "--vhdl-standard",
+        choices=[str(standard) for standard in VHDL.STANDARDS],
+        default=None,
+        help="VHDL standard of the builtins, by default from VUNIT_VHDL_STANDARD or 2008",
+    )
+    build_parser.add_argument(
+        "--builtins",
+        nargs="*",
+        choices=list(OPTIONAL_BUILTINS),
+        default=None,
+        help=(
+            "Optional builtins to compile in addition to the VHDL builtins, "
+            "by default all but array_util for VHDL-2008 and later"
+        ),
+    )
+    build_parser.add_argument("--cache-path", default=None, help="Builtins cache directory")
+    build_parser.add_argument(
+        "-p",
+        "--num-threads",
+        type=positive_int_or_auto,
+        default="auto",
+        help="Number of parallel compile threads",
+    )
+    build_parser.add_argument(
+        "--clean",
+        action="store_true",
+        default=False,
+        help="Remove the previously compiled builtins first",
+    )
+
+    request_parser = subparsers.add_parser(
+        "request",
+        help="Send a request to a run script started with --serve",
+        description=(
+            "Send a JSON-RPC request to a run script serving requests with --serve SOCKET and print the result "
+            "as JSON. The exit code is 1 when the request failed or the result is false or has a false ok value."
+        ),
+    )
+    request_parser.add_argument("socket", help="The Unix domain socket of the server")
+    request_parser.add_argument("method", choices=["list", "files", "compile", "run", "shutdown"])
+    request_parser.add_argument(
+        "params",
+        nargs="?",
+        default=None,
+        help='The parameters as a JSON object, for example \'{"patterns": ["lib.tb_example.*"]}\'',
+    )
+    return parser
+
+
+def send_request(args):
+    """
+    Send a request to a server and print the result, returns the exit code
+    """
+    try:
+        params = None if args.params is None else json.loads(args.params)
+        result = request(args.socket, args.method, params)
+    except (ValueError, OSError, RequestError) as exc:
+        print(f"Request failed: {exc!s}", file=sys.stderr)
+        return 1
+
+    print(json.dumps(result, indent=2))
+    if isinstance(result, dict):
+        return 0 if result.get("ok", True) else 1
+    return 0 if result is not False else 1
+
+
+def build_builtins(args):
+    """
+    Compile the builtin libraries into the builtins cache, returns the exit code
+    """
+    simulator_class = SIMULATOR_FACTORY.select_simulator()
+    if simulator_class is None:
+        print("No available simulator detected", file=sys.stderr)
+        return 1
+
+    vhdl_standard = select_vhdl_standard(args.vhdl_standard)
+    builtins = get_default_builtins(vhdl_standard) if args.builtins is None else with_dependencies(args.builtins)
+
+    cache = BuiltinsCache(args.cache_path) if args.cache_path is not None else BuiltinsCache.from_environment()
+    if cache is None:
+        print("The builtins cache is disabled by an empty VUNIT_BUILTINS_CACHE", file=sys.stderr)
+        return 1
+
+    entry_path = cache.get_entry_path(simulator_class, vhdl_standard, builtins)
+    if entry_path is None:
+        print(f"Could not identify the installed version of {simulator_class.name!s}", file=sys.stderr)
+        return 1
+
+    cache.remove_manifest(entry_path)
+
+    output_path = entry_path / "vunit_out"
+    argv = [
+        "--compile",
+        "--no-builtins-cache",
+        "--output-path",
+        str(output_path),
+        "--num-threads",
+        str(args.num_threads),
+    ]
+    if args.clean:
+        argv.append("--clean")
+
+    vunit_obj = VUnit.from_argv(argv=argv, compile_builtins=False, vhdl_standard=str(vhdl_standard))
+    vunit_obj.add_vhdl_builtins()
+    for name in builtins:
+        getattr(vunit_obj, f"add_{name!s}")()
+
+    try:
+        vunit_obj.main()
+    except SystemExit as exc:
+        if exc.code != 0:
+            return 1
+
+    libraries = {
+        library.name: output_path / simulator_class.name / "libraries" / library.name
+        for library in vunit_obj.get_libraries()
+    }
+    sources = get_builtin_sources(vunit_obj._project)  # pylint: disable=protected-access
+    cache.write_manifest(entry_path, builtins, libraries, sources)
+    print(f"Compiled builtins {builtins!r} into {entry_path!s}")
+    return 0
+
+
+def main(argv=None):
+    """
+    Run the command line tools, returns the exit code
+    """
+    parser = _create_argument_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == "build-builtins":
+        return build_builtins(args)
+
+    if args.command == "request":
+        return send_request(args)
+
+    parser.print_help()
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,7 @@
 Functions to add builtin VHDL code to a project for compilation
 """
 
+import os
 from pathlib import Path
 from glob import glob
 from warnings import warn
@@ -19,35 +20,69 @@ from vunit.ui.common import get_checked_file_names_from_globs
 
 LOGGER = logging.getLogger(__name__)
 
+PACKAGE_PATH = Path(__file__).parent.resolve()
 VHDL_PATH = (Path(__file__).parent / "vhdl").resolve()
 VERILOG_PATH = (Path(__file__).parent / "verilog").resolve()
 
 
+# Optional builtins and the optional builtins they depend on
+OPTIONAL_BUILTINS = {
+    "array_util": [],
+    "com": [],
+    "verification_components": ["com", "osvvm"],
+    "osvvm": [],
+    "random": ["osvvm"],
+    "json4vhdl": [],
+}
+
+
 class Builtins(object):
     """
     Manage VUnit builtins and their dependencies
     """
 
-    def __init__(self, vunit_obj, vhdl_standard: VHDLStandard, simulator_class):
+    def __init__(self, vunit_obj, vhdl_standard: VHDLStandard, simulator_class, cache=None):
         self._vunit_obj = vunit_obj
         self._vunit_lib = vunit_obj.add_library("vunit_lib")
         self._vhdl_standard = vhdl_standard
         self._simulator_class = simulator_class
+        self._cache = cache
+        self._vhdl_builtins_added = False
         self._builtins_adder = BuiltinsAdder()
 
-        def add(name, deps=tuple()):
+        for name, deps in OPTIONAL_BUILTINS.items():
             self._builtins_adder.add_type(name, getattr(self, f"_add_{name!s}"), deps)
 
-        add("array_util")
-        add("com")
-        add("verification_components", ["com", "osvvm"])
-        add("osvvm")
-        add("random", ["osvvm"])
-        add("json4vhdl")
-
     def add(self, name, args=None):
         self._builtins_adder.add(name, args)
 
+    def use_prebuilt(self):
+        """
+        Replace the builtin libraries by the prebuilt libraries of a builtins cache entry as external libraries.
+        The libraries of the project must have the same source files, compile options included, as the
+        libraries of the entry, so builtins outside the entry, other files added to the builtin libraries,
+        compile options set on them and preprocessed files make the builtins compile in the project.
+        Returns False when there is no such entry
+        """
+        if self._cache is None or not self._vhdl_builtins_added:
+            return False
+
+        project = self._vunit_obj._project  # pylint: disable=protected-access
+        excluded_libraries = [library.name for library in project.get_libraries() if library.is_external]
+        entry = self._cache.lookup(
+            self._simulator_class, self._vhdl_standard, get_builtin_sources(project), excluded_libraries
+        )
+        if entry is None:
+            return False
+
+        builtins, libraries = entry
+        LOGGER.debug("Using prebuilt builtins %r from %s", builtins, libraries["vunit_lib"])
+        for library_name, directory in libraries.items():
+            if project.has_library(library_name):
+                project.remove_library(library_name)
+            self._vunit_obj.add_external_library(library_name, directory, vhdl_standard=str(self._vhdl_standard))
+        return True
+
     def _add_files(self, pattern=None, allow_empty=True):
         """
         Add files with naming convention to indicate which standard is supported
@@ -268,6 +303,7 @@ in your VUnit Git repository? You have to do this first if installing using setu
                 'integer': ['path/to/custom/file']
             })
         """
+        self._vhdl_builtins_added = True
         self._add_data_types(external=external)
         self._add_vhdl_logging()
         self._add_files(VHDL_PATH / "*.vhd")
@@ -282,6 +318,44 @@ in your VUnit Git repository? You have to do this first if installing using setu
             self._add_files(VHDL_PATH / path / "src" / "*.vhd")
 
 
+def get_default_builtins(vhdl_standard: VHDLStandard):
+    """
+    Return the optional builtins compiled into the builtins cache by default
+    """
+    if vhdl_standard not in VHDL.STD_2008.and_later:
+        return []
+    return ["com", "verification_components", "osvvm", "random", "json4vhdl"]
+
+
+def get_builtin_sources(project):
+    """
+    Return the content hashes, which include the compile options, of the source files of the project
+    by library and file name. The names of the builtin files are relative to the VUnit package
+    """
+    prefix = str(PACKAGE_PATH) + os.sep
+    result = {}
+    for source_file in project.get_source_files_in_order():
+        file_name = os.path.abspath(source_file.name)
+        if file_name.startswith(prefix):
+            file_name = file_name[len(prefix) :].replace(os.sep, "/")
+        result.setdefault(source_file.library.name, {})[file_name] = source_file.content_hash
+    return result
+
+
+def with_dependencies(names):
+    """
+    Return the optional builtins with the optional builtins they depend on
+    """
+    result = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name not in result:
+            result.add(name)
+            pending += OPTIONAL_BUILTINS[name]
+    return sorted(result)
+
+
 def osvvm_is_installed():
     """
     Checks if OSVVM is installed within the VUnit directory structure
@@ -0,0 +1,154 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2023, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Cache of builtin libraries compiled once and shared by projects
+"""
+
+import os
+import json
+from pathlib import Path
+from vunit.about import version
+from vunit.hashing import hash_string, content_hash_method
+
+
+class BuiltinsCache(object):
+    """
+    Directory of builtin libraries compiled by ``vunit build-builtins``.
+
+    An entry of the cache holds the builtin libraries compiled for a VUnit version,
+    simulator, simulator version, VHDL standard, content hash method and set of
+    optional builtins.
+    Projects map the libraries of an entry as external libraries instead of
+    compiling the builtins. An entry is complete once its manifest is written.
+    The manifest records the content hashes of the compiled source files, an entry
+    is only used by projects with the same source files in its libraries.
+    """
+
+    _manifest_name = "manifest.json"
+
+    def __init__(self, path):
+        self._path = Path(path)
+
+    @classmethod
+    def from_environment(cls):
+        """
+        Return the cache in the VUNIT_BUILTINS_CACHE directory, in the user cache directory when not set
+        or None when set to an empty string
+        """
+        path = os.environ.get("VUNIT_BUILTINS_CACHE", None)
+        if path is None:
+            cache_home = os.environ.get("XDG_CACHE_HOME", None)
+            path = Path(cache_home if cache_home else Path.home() / ".cache") / "vunit" / "builtins"
+        elif not path:
+            return None
+        return cls(path)
+
+    def _get_group_path(self, simulator_class, vhdl_standard):
+        """
+        Return the directory of the entries of a simulator and VHDL standard or None if the simulator version is unknown
+        """
+        version_key = simulator_class.get_version_key()
+        if version_key is None:
+            return None
+        # The content hashes of the manifests can only be compared with content hashes of the same method
+        key = (version(), simulator_class.name, version_key, str(vhdl_standard), content_hash_method())
+        return self._path / hash_string(repr(key))
+
+    def get_entry_path(self, simulator_class, vhdl_standard, builtins):
+        """
+        Return the directory of the entry with the optional builtins or None if the simulator version is unknown
+        """
+        group_path = self._get_group_path(simulator_class, vhdl_standard)
+        if group_path is None:
+            return None
+        return group_path / ("+".join(sorted(builtins)) if builtins else "core")
+
+    def lookup(self, simulator_class, vhdl_standard, sources, excluded_libraries=()):
+        """
+        Return the optional builtins and the library directories by name of the complete entry with the fewest
+        optional builtins for a simulator and VHDL standard holding the sources or None if there is none.
+        The sources are the content hashes by library and file name of the source files of the project,
+        the files of each library of the entry in the project must have been compiled into the entry.
+        Entries containing any of the excluded libraries are skipped.
+        """
+        group_path = self._get_group_path(simulator_class, vhdl_standard)
+        if group_path is None or not group_path.is_dir():
+            return None
+
+        excluded_libraries = set(name.lower() for name in excluded_libraries)
+        result = None
+        num_builtins = None
+        for entry_path in sorted(group_path.iterdir()):
+            manifest = self._read_manifest(entry_path)
+            if manifest is None:
+                continue
+
+            builtins, libraries, entry_sources = manifest
+            if excluded_libraries.intersection(name.lower() for name in libraries):
+                continue
+
+            if not all(
+                entry_sources.get(name, {}).get(file_name) == content_hash
+                for name in libraries
+                for file_name, content_hash in sources.get(name, {}).items()
+            ):
+                continue
+
+            if not all(directory.is_dir() for directory in libraries.values()):
+                continue
+
+            if num_builtins is None or len(builtins) < num_builtins:
+                result = (builtins, libraries)
+                num_builtins = len(builtins)
+
+        return result
+
+    def _read_manifest(self, entry_path):
+        """
+        Return the optional builtins, the library directories by name and the content hashes of the source files
+        by library and file name of an entry or None if it is not complete
+        """
+        try:
+            with (entry_path / self._manifest_name).open("r", encoding="utf-8") as fptr:
+                manifest = json.load(fptr)
+            builtins = [str(name) for name in manifest["builtins"]]
+            libraries = {str(name): entry_path / directory for name, directory in manifest["libraries"].items()}
+            sources = {str(name): dict(files) for name, files in manifest["sources"].items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+        if "vunit_lib" not in libraries:
+            return None
+        return builtins, libraries, sources
+
+    def write_manifest(self, entry_path, builtins, libraries, sources):
+        """
+        Complete an entry with the optional builtins, the library directories by name and the content hashes
+        of the compiled source files by library and file name
+        """
+        manifest = {
+            "vunit_version": version(),
+            "builtins": sorted(builtins),
+            "libraries": {
+                name: os.path.relpath(str(directory), str(entry_path)) for name, directory in libraries.items()
+            },
+            "sources": {name: sources.get(name, {}) for name in libraries},
+        }
+        file_name = entry_path / self._manifest_name
+        temp_file_name = entry_path / (self._manifest_name + ".tmp")
+        with temp_file_name.open("w", encoding="utf-8") as fptr:
+            json.dump(manifest, fptr, indent=2)
+        os.replace(str(temp_file_name), str(file_name))
+
+    def remove_manifest(self, entry_path):
+        """
+        Mark an entry as not complete while it is rebuilt
+        """
+        try:
+            (entry_path / self._manifest_name).unlink()
+        except FileNotFoundError:
+            pass
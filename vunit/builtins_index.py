@@ -0,0 +1,121 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2023, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Index of the parse results and content hashes of the builtin VHDL source files
+"""
+
+import os
+import pickle
+import logging
+from pathlib import Path
+from vunit.about import version
+from vunit.cached import file_content_hash
+from vunit.hashing import CONTENT_HASH_METHODS, content_hash_method, hash_file
+from vunit.library import Library
+from vunit.parsing.encodings import HDL_FILE_ENCODING
+from vunit.source_file import VHDLSourceFile
+from vunit.vhdl_parser import VHDLParser
+from vunit.vhdl_standard import VHDL
+
+LOGGER = logging.getLogger(__name__)
+
+PACKAGE_PATH = Path(__file__).parent.resolve()
+INDEX_FILE_NAME = "builtins_index.pickle"
+
+
+class BuiltinsIndex(object):
+    """
+    Parse results and content hashes of the VHDL files of the VUnit package created when VUnit is installed.
+
+    An indexed file is used without being parsed as long as it has the same content hash as
+    when it was indexed. The modification times are not kept by the installation and cannot
+    be compared with the index, the content hash of a file is instead cached in the database
+    by its modification time, size and inode, so the file is only read on first use. The
+    content hashes are indexed for each hash method selectable by VUNIT_CONTENT_HASH.
+    """
+
+    def __init__(self, package_path=PACKAGE_PATH):
+        self._prefix = str(package_path) + os.sep
+        self._file_name = Path(package_path) / INDEX_FILE_NAME
+        self._entries = None
+
+    def get(self, file_name, database=None):
+        """
+        Return the parse result and content hash of an unchanged file of the package or None
+        """
+        file_name = str(file_name)
+        if not file_name.startswith(self._prefix):
+            return None
+
+        if self._entries is None:
+            self._entries = self._load()
+
+        entry = self._entries.get(file_name[len(self._prefix) :].replace(os.sep, "/"))
+        if entry is None:
+            return None
+
+        try:
+            content_hash = file_content_hash(file_name, encoding=HDL_FILE_ENCODING, database=database)
+        except OSError:
+            return None
+
+        design_file, indexed_content_hashes = entry
+        if content_hash != indexed_content_hashes.get(content_hash_method()):
+            return None
+
+        return design_file, content_hash
+
+    def _load(self):
+        """
+        Load the entries of the index, the index is ignored if it was created by another VUnit version
+        or without the selected hash method
+        """
+        try:
+            with self._file_name.open("rb") as fptr:
+                index_version, methods, entries = pickle.load(fptr)
+        except FileNotFoundError:
+            return {}
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.debug("Ignoring unreadable builtins index %s", self._file_name)
+            return {}
+
+        if index_version != version() or content_hash_method() not in methods:
+            return {}
+        return entries
+
+
+def create_builtins_index(package_path=PACKAGE_PATH):
+    """
+    Create the index of the VHDL files of the VUnit package
+    """
+    package_path = Path(package_path)
+    library = Library("vunit_lib", "", VHDL.STD_2008)
+    parser = VHDLParser()
+
+    entries = {}
+    for root, _, file_names in os.walk(str(package_path / "vhdl")):
+        for base_name in sorted(file_names):
+            if Path(base_name).suffix not in (".vhd", ".vhdl"):
+                continue
+
+            file_name = Path(root) / base_name
+            source_file = VHDLSourceFile(file_name, library, parser, None, VHDL.STD_2008)
+            (design_file, _), _ = source_file.get_snapshot()
+            if design_file is None:
+                continue
+            entries[file_name.relative_to(package_path).as_posix()] = (
+                design_file,
+                {method: hash_file(str(file_name), method) for method in CONTENT_HASH_METHODS},
+            )
+
+    with (package_path / INDEX_FILE_NAME).open("wb") as fptr:
+        pickle.dump((version(), sorted(CONTENT_HASH_METHODS), entries), fptr)
+
+    return len(entries)
+
+
+BUILTINS_INDEX = BuiltinsIndex()
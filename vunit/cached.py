@@ -9,9 +9,12 @@ Utility to perform costly operation on file contents which can be cached
 """
 
 import os
-from vunit.hashing import hash_string
+import logging
+from vunit.hashing import hash_bytes, hash_file, content_hash_method
 from vunit.ostools import read_file
 
+LOGGER = logging.getLogger(__name__)
+
 
 def cached(key, function, file_name, encoding, database=None, newline=None):
     """
@@ -54,38 +57,67 @@ def file_content_hash(file_name, encoding, database=None):
     Use the database to keep a persistent cache of the last content
     hash.
     """
-    _, content_hash = _file_content_hash(file_name, encoding, database)
+    _, content_hash = _file_content_hash(file_name, encoding, database, read_content=False)
     return content_hash
 
 
-def _file_content_hash(file_name, encoding, database=None, newline=None):
+def _file_content_hash(file_name, encoding, database=None, newline=None, read_content=True):
     """
     Returns the file content as well as the hash of the content
 
+    The hash is computed from the raw bytes of a single read of the file. The content
+    is decoded from the same bytes, it is None when the file was not read.
+
     Use the database to keep a persistent cache of the last content
-    hash.  If the file modification date has not changed assume the
-    hash is the same and do not re-open the file.
+    hash of each hash method.  If the file modification time, size and inode
+    have not changed assume the hash is the same and do not re-open the file.
     """
 
     if database is None:
-        content = read_file(file_name, encoding=encoding, newline=newline)
-        return content, hash_string(content)
+        return _read_and_hash(file_name, encoding, newline, read_content)
 
-    key = f"cached._file_content_hash({file_name!s}, newline={newline!s})".encode()
+    key = f"cached._file_content_hash({file_name!s}, newline={newline!s}, method={content_hash_method()!s})".encode()
+
+    stat = os.stat(file_name)
+    stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    if key in database:
+        last_stamp, last_content_hash = database[key]
+        if stamp == last_stamp:
+            return None, last_content_hash
+
+    content, content_hash = _read_and_hash(file_name, encoding, newline, read_content)
+    database[key] = stamp, content_hash
+    return content, content_hash
 
-    if key not in database:
-        content = read_file(file_name, encoding=encoding, newline=newline)
-        content_hash = hash_string(content)
-        timestamp = os.path.getmtime(file_name)
-        database[key] = timestamp, content_hash
-        return content, content_hash
-
-    timestamp = os.path.getmtime(file_name)
-    last_timestamp, last_content_hash = database[key]
-    if timestamp != last_timestamp:
-        content = read_file(file_name, encoding=encoding, newline=newline)
-        content_hash = hash_string(content)
-        database[key] = timestamp, content_hash
-        return content, content_hash
 
-    return None, last_content_hash
+def _read_and_hash(file_name, encoding, newline, read_content):
+    """
+    Return the content of the file, or None when not read_content, and the hash of the content
+    """
+    if not read_content:
+        return None, hash_file(file_name)
+
+    with open(file_name, "rb") as fptr:
+        data = fptr.read()
+    return _decode(data, file_name, encoding, newline), hash_bytes(data)
+
+
+def _decode(data, file_name, encoding, newline):
+    """
+    Decode the bytes of a file like read_file
+    """
+    try:
+        content = data.decode(encoding)
+    except UnicodeDecodeError:
+        LOGGER.warning(
+            "Could not decode file %s using encoding %s, ignoring encoding errors",
+            file_name,
+            encoding,
+        )
+        content = data.decode(encoding, errors="ignore")
+
+    if newline is None and "\r" in content:
+        # Universal newlines mode
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+
+    return content
@@ -10,6 +10,7 @@ Preprocessing of check functions
 
 import re
 from vunit.ui.preprocessor import Preprocessor
+from vunit.code_insertions import CodeInsertions, CodeReader
 
 
 class CheckPreprocessor(Preprocessor):
@@ -32,22 +33,25 @@ class CheckPreprocessor(Preprocessor):
         check_relation_calls = list(check_relation_pattern.finditer(code))
         check_relation_calls.reverse()
 
+        # The calls are handled from the end of the code and the parameters of a call are read from
+        # the code with the insertions made for the later calls. Only the parameters are read such
+        # that the work for a call is proportional to its length
+        insertions = CodeInsertions(code)
         for match in check_relation_calls:
+            parameters = CodeReader(insertions, insertions.location(match.end("parameters")))
             (
                 relation,
                 offset_to_point_before_closing_paranthesis,
-            ) = self._extract_relation(code, match)
+            ) = self._extract_relation(code, match, parameters)
             if relation:
                 context_msg_parameter = f", context_msg => {relation.make_context_msg()!s}"
-                code = (
-                    code[: match.end("parameters") + offset_to_point_before_closing_paranthesis]
-                    + context_msg_parameter
-                    + code[match.end("parameters") + offset_to_point_before_closing_paranthesis :]
+                insertions.insert(
+                    parameters.location(offset_to_point_before_closing_paranthesis), context_msg_parameter
                 )
 
-        return code
+        return insertions.join()
 
-    def _extract_relation(self, code, check):
+    def _extract_relation(self, code, check, parameters):
         # pylint: disable=missing-docstring
         def end_of_parameter(token):
             return token.value == "," if token.level == 1 else token.level == 0
@@ -55,7 +59,7 @@ class CheckPreprocessor(Preprocessor):
         parameter_tokens = []
         index = 1
         relation = None
-        for token in self._classify_tokens(code[check.start("parameters") + 1 :]):
+        for token in self._classify_tokens(parameters):
             add_token = True
             if token.type == Token.NORMAL:
                 # The first found parameter containing a top-level relation is assumed
@@ -79,9 +83,8 @@ class CheckPreprocessor(Preprocessor):
             index += 1
 
         if not relation:
-            raise SyntaxError(
-                f"Failed to find relation in {(code[check.start('call') : check.end('parameters') + index])!s}"
-            )
+            call = code[check.start("call") : check.end("parameters")] + parameters.get(0, index)
+            raise SyntaxError(f"Failed to find relation in {call!s}")
 
         return relation, index - 1
 
@@ -89,19 +92,22 @@ class CheckPreprocessor(Preprocessor):
     def _classify_tokens(code):
         # pylint: disable=missing-docstring
         # pylint: disable=too-many-branches
-        def even_quotes(code):
+        def even_quotes(index):
             n_quotes = 0
-            for index in range(0, len(code), 2):
-                if code[index] != "'":
-                    break
+            while code.get(index, index + 1) == "'":
                 n_quotes += 1
+                index += 2
 
             return (n_quotes % 2) == 0
 
         code_section = Token.NORMAL
         level = 1
         index = 0
-        for char in code:
+        while True:
+            char = code.get(index, index + 1)
+            if not char:
+                break
+
             token = Token(char)
             if code_section == Token.NORMAL:
                 if char == '"':
@@ -109,11 +115,11 @@ class CheckPreprocessor(Preprocessor):
                 elif char == "'":
                     # Used to avoid mixing up qualified expressions and
                     # character literals, e.g. std_logic'('1').
-                    if even_quotes(code[index:]):
+                    if even_quotes(index):
                         code_section = Token.CHARACTER_LITERAL
-                elif code[index : index + 2] == "--":
+                elif code.get(index, index + 2) == "--":
                     code_section = Token.LINE_COMMENT
-                elif code[index : index + 2] == "/*":
+                elif code.get(index, index + 2) == "/*":
                     code_section = Token.BLOCK_COMMENT
                 elif char == "(":
                     level += 1
@@ -132,7 +138,7 @@ class CheckPreprocessor(Preprocessor):
                 if char == "\n":
                     next_code_section = Token.NORMAL
             elif code_section == Token.BLOCK_COMMENT:
-                if code[index - 1 : index + 1] == "*/":
+                if code.get(index - 1, index + 1) == "*/":
                     next_code_section = Token.NORMAL
 
             token.type = code_section
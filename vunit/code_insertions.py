@@ -0,0 +1,138 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2023, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Text inserted into code by preprocessors
+"""
+
+from bisect import bisect_right, insort
+
+
+class CodeInsertions(object):
+    """
+    Text inserted into code which is joined with the code once all text is inserted
+    instead of rebuilding the code for each insertion.
+
+    A location in the code with insertions is a tuple of a position in the original code
+    and an offset into the text inserted before that position or None for the character
+    of the original code at that position.
+    """
+
+    def __init__(self, code):
+        self.code = code
+        self._insertions = {}
+        self._positions = []
+
+    def location(self, position, offset=0):
+        """
+        Return the location of the character at an offset into the text inserted before
+        position, or of the original character when the offset is past the inserted text
+        """
+        if offset < len(self._insertions.get(position, "")):
+            return position, offset
+        return position, None
+
+    def next_location(self, location):
+        """
+        Return the location following a location
+        """
+        position, offset = location
+        if offset is None:
+            return self.location(position + 1)
+        return self.location(position, offset + 1)
+
+    def segments(self, location):
+        """
+        Yield the code with insertions from a location as tuples of text, start, stop and
+        the position of the inserted text or None for the original code
+        """
+        position, offset = location
+        if offset is not None:
+            yield self._insertions[position], offset, len(self._insertions[position]), position
+
+        start = position
+        for idx in range(bisect_right(self._positions, position), len(self._positions)):
+            insertion_position = self._positions[idx]
+            yield self.code, start, insertion_position, None
+            yield self._insertions[insertion_position], 0, len(self._insertions[insertion_position]), insertion_position
+            start = insertion_position
+        yield self.code, start, len(self.code), None
+
+    def insert(self, location, text):
+        """
+        Insert text before a location
+        """
+        position, offset = location
+        if position not in self._insertions:
+            insort(self._positions, position)
+            self._insertions[position] = text
+        elif offset is None:
+            self._insertions[position] += text
+        else:
+            inserted = self._insertions[position]
+            self._insertions[position] = inserted[:offset] + text + inserted[offset:]
+
+    def join(self):
+        """
+        Return the code with insertions
+        """
+        pieces = []
+        start = 0
+        for position in self._positions:
+            pieces.append(self.code[start:position])
+            pieces.append(self._insertions[position])
+            start = position
+        pieces.append(self.code[start:])
+        return "".join(pieces)
+
+
+class CodeReader(object):
+    """
+    Read the code with insertions from a location, reading as much of
+    the code as has been asked for
+    """
+
+    def __init__(self, insertions, location):
+        self._segments = insertions.segments(location)
+        self._segment = None
+        self._text = ""
+        self._offsets = []
+        self._origins = []  # Tuples of the start and the inserted text position of the text read from a segment
+
+    def get(self, start, stop):
+        """
+        Return the text from start to stop, which is shorter at the end of the code
+        """
+        while stop > len(self._text) and self._read():
+            pass
+        return self._text[start:stop]
+
+    def _read(self):
+        """
+        Read more text, at least as much as has been read so far, returns False at the end of the code
+        """
+        while self._segment is None or self._segment[1] == self._segment[2]:
+            self._segment = next(self._segments, None)
+            if self._segment is None:
+                return False
+
+        text, start, stop, position = self._segment
+        stop = min(stop, start + max(len(self._text), 256))
+        self._offsets.append(len(self._text))
+        self._origins.append((start, position))
+        self._text += text[start:stop]
+        self._segment = (text, stop, self._segment[2], position)
+        return True
+
+    def location(self, offset):
+        """
+        Return the location of the character at an offset into the text read
+        """
+        idx = bisect_right(self._offsets, offset) - 1
+        start, position = self._origins[idx]
+        if position is None:
+            return start + offset - self._offsets[idx], None
+        return position, start + offset - self._offsets[idx]
@@ -56,15 +56,19 @@ class Configuration(object):  # pylint: disable=too-many-instance-attributes
         self.post_check = post_check
 
     def copy(self):
-        return Configuration(
-            name=self.name,
-            design_unit=self._design_unit,
-            generics=self.generics.copy(),
-            sim_options=self.sim_options.copy(),
-            pre_config=self.pre_config,
-            post_check=self.post_check,
-            attributes=self.attributes.copy(),
-        )
+        """
+        Return a copy with the tb_path generic reset, without deriving tb_path from the file name again
+        """
+        result = type(self).__new__(type(self))
+        result.__dict__.update(self.__dict__)
+        result.generics = self.generics.copy()
+        result.sim_options = self.sim_options.copy()
+        result.attributes = self.attributes.copy()
+
+        if "tb_path" in self._design_unit.generic_names:
+            result.generics["tb_path"] = str(self.tb_path.replace("\\", "/")) + "/"
+
+        return result
 
     @property
     def is_default(self):
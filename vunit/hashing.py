@@ -8,7 +8,20 @@
 Wrapper arround selected hash method
 """
 
+import os
 import hashlib
+from functools import partial
+
+# Hash methods of file contents by the name used in the VUNIT_CONTENT_HASH environment variable.
+# SHA-1 is the default as it is the faster on CPUs with SHA instructions, BLAKE2b is faster on other CPUs.
+# The BLAKE2b digest has the same length as the SHA-1 digest.
+CONTENT_HASH_METHODS = {
+    "sha1": hashlib.sha1,
+    "blake2b": partial(hashlib.blake2b, digest_size=20),
+}
+
+# Size of the blocks in which files are read when only hashing them
+_BLOCK_SIZE = 1 << 20
 
 
 def hash_string(string):
@@ -16,3 +29,40 @@ def hash_string(string):
     returns hash of bytes
     """
     return hashlib.sha1(string.encode(encoding="utf-8")).hexdigest()
+
+
+def hash_bytes(data):
+    """
+    Return the hash of file contents using the hash method selected by the VUNIT_CONTENT_HASH environment variable
+    """
+    return _new_content_hash(data).hexdigest()
+
+
+def hash_file(file_name, method=None):
+    """
+    Return the hash of the contents of a file, the file is read in blocks to bound the memory used for large files.
+    The hash method is the one selected by the VUNIT_CONTENT_HASH environment variable unless given
+    """
+    content_hash = CONTENT_HASH_METHODS[content_hash_method() if method is None else method]()
+    with open(file_name, "rb") as fptr:
+        for block in iter(partial(fptr.read, _BLOCK_SIZE), b""):
+            content_hash.update(block)
+    return content_hash.hexdigest()
+
+
+def content_hash_method():
+    """
+    Return the name of the hash method of file contents selected by the VUNIT_CONTENT_HASH environment variable.
+    Content hashes computed with different methods must never be compared
+    """
+    name = os.environ.get("VUNIT_CONTENT_HASH", "sha1")
+    if name not in CONTENT_HASH_METHODS:
+        raise ValueError(f"Unknown VUNIT_CONTENT_HASH {name!r}, must be one of {', '.join(CONTENT_HASH_METHODS)!s}")
+    return name
+
+
+def _new_content_hash(data=b""):
+    """
+    Create the hash object of the selected hash method of file contents
+    """
+    return CONTENT_HASH_METHODS[content_hash_method()](data)
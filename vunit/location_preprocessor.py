@@ -11,7 +11,9 @@ to enable better messages
 
 
 import re
+from bisect import bisect_left
 from vunit.ui.preprocessor import Preprocessor
+from vunit.code_insertions import CodeInsertions
 
 
 class LocationPreprocessor(Preprocessor):
@@ -74,27 +76,60 @@ class LocationPreprocessor(Preprocessor):
         if subprogram in self._subprograms_with_arguments:
             self._subprograms_with_arguments.remove(subprogram)
 
-    @staticmethod
-    def _find_closing_parenthesis(args):
+    _parenthesis_pattern = re.compile(r"\(|\)")
+
+    @classmethod
+    def _find_closing_parenthesis(cls, segments):
         """
-        Find the balanced closing parentesis
+        Find the balanced closing parenthesis in segments of code starting with the opening parenthesis
+
+        :returns: Tuple of the code before the closing parenthesis and its location or None when not found
 
         @TODO duplicate with vhdl_parser.py
         """
-        pattern = re.compile(r"\(|\)")
+        pieces = []
         balance = 0
-        for match in pattern.finditer(args):
-            balance += 1 if match.group() == "(" else -1
-            if balance == 0:
-                return match.start()
+        for text, start, stop, position in segments:
+            for match in cls._parenthesis_pattern.finditer(text, start, stop):
+                balance += 1 if match.group() == "(" else -1
+                if balance == 0:
+                    pieces.append(text[start : match.start()])
+                    location = (match.start(), None) if position is None else (position, match.start())
+                    return "".join(pieces), location
+            pieces.append(text[start:stop])
         return None
 
+    @staticmethod
+    def _lookahead(segments):
+        """
+        Return enough of the start of the segments to match an assignment
+        """
+        lookahead = ""
+        for text, start, stop, _ in segments:
+            for chunk_start in range(start, stop, 64):
+                lookahead += text[chunk_start : min(chunk_start + 64, stop)]
+                if len(lookahead.lstrip()) >= 2:
+                    return lookahead
+        return lookahead
+
+    @classmethod
+    def _is_subprogram_declaration(cls, code, start):
+        """
+        Return True if the whitespace ending at start follows procedure or function,
+        the first character of the code is never considered
+        """
+        stop = start
+        while stop > 0 and code[stop].isspace():
+            stop -= 1
+        window = code[start : max(stop - len("procedure"), 0) : -1]
+        return cls._subprogram_declaration_start_backwards_pattern.match(window) is not None
+
     _already_fixed_file_name_pattern = re.compile(r"file_name\s*=>", re.MULTILINE)
     _already_fixed_line_num_pattern = re.compile(r"line_num\s*=>", re.MULTILINE)
     _subprogram_declaration_start_backwards_pattern = re.compile(r"\s+(erudecorp|noitcnuf)", re.IGNORECASE)
     _assignment_pattern = re.compile(r"\s*(:=|<=)", re.MULTILINE)
 
-    def run(self, code, file_name):
+    def run(self, code, file_name):  # pylint: disable=too-many-locals
         potential_subprogram_call_with_arguments_pattern = re.compile(
             r"[^a-zA-Z0-9_](?P<subprogram>" + "|".join(self._subprograms_with_arguments) + r")\s*(?P<args>\()",
             re.MULTILINE,
@@ -110,36 +145,41 @@ class LocationPreprocessor(Preprocessor):
             matches += list(potential_subprogram_call_without_arguments_pattern.finditer(code))
         matches.sort(key=lambda match: match.start("subprogram"), reverse=True)
 
+        # Matches are handled from the end of the code such that the code before a match is never changed.
+        # A later match inside the arguments of an earlier one is seen by the earlier match
+        newline_positions = [match.start() for match in re.finditer("\n", code)]
+        insertions = CodeInsertions(code)
+
         for match in matches:
-            if self._subprogram_declaration_start_backwards_pattern.match(code[match.start() : 0 : -1]):
+            if self._is_subprogram_declaration(code, match.start()):
                 continue
             file_name_association = ', file_name => "' + file_name + '"'
-            line_num_association = ", line_num => " + str(1 + code[: match.start("subprogram")].count("\n"))
+            line_num = 1 + bisect_left(newline_positions, match.start("subprogram"))
+            line_num_association = ", line_num => " + str(line_num)
             if "args" in match.groupdict():
-                closing_paranthesis_start = self._find_closing_parenthesis(code[match.start("args") :])
-
-                if self._assignment_pattern.match(code[match.start("args") + closing_paranthesis_start + 1 :]):
+                args_location = insertions.location(match.start("args"))
+                closing = self._find_closing_parenthesis(insertions.segments(args_location))
+                if closing is None:
+                    raise RuntimeError(
+                        f"Missing closing parenthesis of {match.group('subprogram')!s} call in "
+                        f"{file_name!s} on line {line_num:d}"
+                    )
+                args, closing_location = closing
+
+                lookahead = self._lookahead(insertions.segments(insertions.next_location(closing_location)))
+                if self._assignment_pattern.match(lookahead):
                     continue
 
-                args = code[match.start("args") : match.start("args") + closing_paranthesis_start]
                 already_fixed_file_name = self._already_fixed_file_name_pattern.search(args) is not None
                 already_fixed_line_num = self._already_fixed_line_num_pattern.search(args) is not None
                 file_name_association = file_name_association if not already_fixed_file_name else ""
                 line_num_association = line_num_association if not already_fixed_line_num else ""
 
-                code = (
-                    code[: match.start("args") + closing_paranthesis_start]
-                    + line_num_association
-                    + file_name_association
-                    + code[match.start("args") + closing_paranthesis_start :]
-                )
+                insertions.insert(closing_location, line_num_association + file_name_association)
             else:
-                code = (
-                    code[: match.end("subprogram")]
-                    + "("
-                    + line_num_association[2:]
-                    + file_name_association
-                    + ")"
-                    + code[match.end("subprogram") :]
+                insertions.insert(
+                    insertions.location(match.end("subprogram")),
+                    "(" + line_num_association[2:] + file_name_association + ")",
                 )
-        return code
+
+        return insertions.join()
@@ -11,8 +11,10 @@ stubbed for testing
 
 
 import time
+import signal
 import subprocess
 import threading
+import weakref
 import shutil
 from queue import Queue, Empty
 from pathlib import Path
@@ -60,6 +62,85 @@ class ProgramStatus(object):
 PROGRAM_STATUS = ProgramStatus()
 
 
+class PeakMemory(object):
+    """
+    Track the peak resident set size of processes waited for by the current thread
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def reset(self):
+        self._local.peak = None
+
+    def record(self, peak):
+        """
+        Record the peak memory in bytes of a terminated process
+        """
+        current = getattr(self._local, "peak", None)
+        self._local.peak = peak if current is None else max(current, peak)
+
+    @property
+    def peak(self):
+        """
+        The largest peak memory in bytes since reset or None if no process was measured
+        """
+        return getattr(self._local, "peak", None)
+
+
+PEAK_MEMORY = PeakMemory()
+
+
+class RunningProcesses(object):
+    """
+    Keep track of the processes started by each thread such that the
+    processes of a thread can be killed from another thread.
+    Processes are weakly referenced and forgotten when garbage collected
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._processes = {}
+        self._killed = set()
+
+    def add(self, process):
+        """
+        Add a process started by, or handed over to, the current thread.
+        The process is killed immediately if the thread has been killed
+        """
+        ident = threading.get_ident()
+        with self._lock:  # pylint: disable=not-context-manager
+            for processes in self._processes.values():
+                processes.discard(process)
+            self._processes.setdefault(ident, weakref.WeakSet()).add(process)
+            killed = ident in self._killed
+
+        if killed:
+            process.kill_group()
+
+    def kill(self, ident):
+        """
+        Kill the process groups of all processes started by the thread with ident
+        as well as any process the thread starts until reset is called
+        """
+        with self._lock:  # pylint: disable=not-context-manager
+            self._killed.add(ident)
+            processes = list(self._processes.get(ident, []))
+
+        for process in processes:
+            process.kill_group()
+
+    def reset(self, ident):
+        """
+        Allow the thread with ident to start processes again after being killed
+        """
+        with self._lock:  # pylint: disable=not-context-manager
+            self._killed.discard(ident)
+
+
+RUNNING_PROCESSES = RunningProcesses()
+
+
 class InterruptableQueue(object):
     """
     A Queue which can be interrupted
@@ -134,6 +215,8 @@ class Process(object):
         self._reader = AsynchronousFileReader(self._process.stdout, self._queue)
         self._reader.start()
 
+        RUNNING_PROCESSES.add(self)
+
     def write(self, *args, **kwargs):
         """Write to stdin"""
         if not self._process.stdin.closed:
@@ -165,12 +248,48 @@ class Process(object):
         Wait while without completely blocking to avoid
         deadlock when shutting down
         """
-        while self._process.poll() is None:
+        while not self._reap():
             PROGRAM_STATUS.check_for_shutdown()
             time.sleep(0.05)
             LOGGER.debug("Waiting for process with pid=%i to stop", self._process.pid)
         return self._process.returncode
 
+    def _reap(self):
+        """
+        Return True if the process has terminated.
+        Uses wait4 when available to also record the peak memory of the process
+        """
+        # The process is waited for under the lock of Popen such that a concurrent poll
+        # from another thread never finds it reaped and loses its exit code
+        lock = getattr(self._process, "_waitpid_lock", None)
+        if self._process.returncode is not None or not hasattr(os, "wait4") or lock is None:
+            return self._process.poll() is not None
+
+        if not lock.acquire(False):
+            # Another thread is waiting for the process
+            return False
+
+        try:
+            if self._process.returncode is not None:
+                return True
+
+            pid, status, rusage = os.wait4(self._process.pid, os.WNOHANG)  # pylint: disable=no-member
+            if pid == 0:
+                return False
+
+            # pylint: disable=no-member
+            self._process.returncode = -os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+        except ChildProcessError:
+            # Reaped outside of Popen, the exit code is unknown
+            self._process.returncode = 0
+            return True
+        finally:
+            lock.release()
+
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        PEAK_MEMORY.record(rusage.ru_maxrss if sys.platform == "darwin" else rusage.ru_maxrss * 1024)
+        return True
+
     def is_alive(self):
         """
         Returns true if alive
@@ -206,6 +325,27 @@ class Process(object):
             if retcode != 0:
                 raise Process.NonZeroExitCode
 
+    def kill_group(self):
+        """
+        Kill the process and all processes in its process group
+        """
+        if self._process.returncode is not None:
+            return
+
+        LOGGER.debug("Killing process group of process with pid=%i", self._process.pid)
+        try:
+            if IS_WINDOWS_SYSTEM:
+                subprocess.call(
+                    ["taskkill", "/F", "/T", "/PID", str(self._process.pid)],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+            else:
+                os.killpg(self._process.pid, signal.SIGKILL)  # pylint: disable=no-member
+        except OSError:
+            # Already terminated
+            pass
+
     def terminate(self):
         """
         Terminate the process
@@ -341,6 +481,79 @@ def renew_path(path):
     makedirs(path)
 
 
+class PathReaper(object):
+    """
+    Renew directories by moving the old directory into a trash directory and
+    deleting it in a background thread, such that the time to renew a
+    directory does not depend on the size of its old contents
+    """
+
+    def __init__(self, trash_path):
+        self._trash_path = Path(trash_path)
+        self._lock = threading.Lock()
+        self._queue = Queue()
+        self._thread = None
+        self._num_moved = 0
+
+        # Delete what a previous run did not have time to delete
+        if self._trash_path.exists():
+            for path in self._trash_path.iterdir():
+                self._delete_later(path)
+
+    def renew_path(self, path):
+        """
+        Ensure path directory exists and is empty
+        """
+        if Path(path).exists():
+            with self._lock:  # pylint: disable=not-context-manager
+                self._num_moved += 1
+                trash_path = self._trash_path / f"{os.getpid():d}_{self._num_moved:d}"
+
+            try:
+                makedirs(self._trash_path, exist_ok=True)
+                os.rename(path, trash_path)
+            except OSError:
+                # Files open by other processes prevent renaming on Windows
+                renew_path(path)
+                return
+
+            self._delete_later(trash_path)
+
+        makedirs(path)
+
+    def _delete_later(self, path):
+        """
+        Queue path for deletion by the background thread
+        """
+        with self._lock:  # pylint: disable=not-context-manager
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._delete, daemon=True)
+                self._thread.start()
+        self._queue.put(path)
+
+    def _delete(self):
+        """
+        Delete the queued directories until stopped by None
+        """
+        while True:
+            path = self._queue.get()
+            if path is None:
+                return
+            shutil.rmtree(path, ignore_errors=True)
+
+    def join(self):
+        """
+        Wait for all queued directories to be deleted
+        """
+        with self._lock:  # pylint: disable=not-context-manager
+            thread = self._thread
+            self._thread = None
+
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+
 def simplify_path(path):
     """
     Return relative path towards current working directory
@@ -10,21 +10,99 @@ A persistent TCL shell to avoid startup overhead in TCL-based simulators
 
 import threading
 import logging
-from vunit.ostools import Process
+from vunit.ostools import Process, PROGRAM_STATUS, RUNNING_PROCESSES
 
 LOGGER = logging.getLogger(__name__)
 
 
-class PersistentTclShell(object):
+class PersistentTclShell(object):  # pylint: disable=too-many-instance-attributes
     """
     A persistent TCL shell
+
+    Processes can be started in the background in advance. A thread then
+    takes over an already started process instead of starting its own.
     """
 
     def __init__(self, create_process):
         self._processes = {}
+        self._started = []
+        # The processes started in the background which are not yet ready by identifier
+        self._starting = {}
+        self._num_starting = 0
+        self._num_started = 0
+        self._generation = 0
         self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
         self._create_process = create_process
 
+    def start(self, num_processes):
+        """
+        Start processes in the background to be taken over by the first threads executing commands
+        """
+        with self._lock:  # pylint: disable=not-context-manager
+            self._num_starting += num_processes
+            first_idx = self._num_started
+            self._num_started += num_processes
+            generation = self._generation
+
+        for idx in range(first_idx, first_idx + num_processes):
+            thread = threading.Thread(target=self._start_process, args=(f"_started{idx:d}", generation))
+            thread.daemon = True
+            thread.start()
+
+    def _start_process(self, ident, generation):
+        """
+        Start a process in the background and add it to the started processes when ready
+        """
+        process = None
+        try:
+            process = self._create_process(ident)
+            with self._lock:  # pylint: disable=not-context-manager
+                is_torn_down = generation != self._generation
+                if not is_torn_down:
+                    self._starting[ident] = process
+
+            if is_torn_down:
+                process.kill_group()
+                process.wait()
+                process = None
+            else:
+                _wait_until_ready(process)
+        except (Process.NonZeroExitCode, OSError, KeyboardInterrupt) as exc:
+            LOGGER.debug("Failed to start re-usable background process in advance: %s", exc)
+            process = None
+        finally:
+            with self._lock:  # pylint: disable=not-context-manager
+                self._starting.pop(ident, None)
+                if process is not None and generation == self._generation:
+                    self._started.append(process)
+                    process = None
+                self._num_starting -= 1
+                self._condition.notify_all()
+
+            if process is not None:
+                # Teardown happened after the process became ready
+                _quit(process)
+
+    def _take_started_process(self):
+        """
+        Take a process started in advance waiting for any process still starting.
+        Returns None if there is no such process.
+        Must be called with the lock held
+        """
+        while True:
+            while self._started:
+                process = self._started.pop(0)
+                if process.is_alive():
+                    return process
+                LOGGER.debug("Skipping re-usable background process which has terminated")
+
+            if self._num_starting == 0:
+                return None
+
+            self._condition.wait(0.05)
+            PROGRAM_STATUS.check_for_shutdown()
+
     def _process(self):
         """
         Create the vsim process
@@ -39,18 +117,28 @@ class PersistentTclShell(object):
             except KeyError:
                 pass
 
-            process = self._create_process(ident)
+            process = self._take_started_process()
+            started_in_advance = process is not None
+            if not started_in_advance:
+                process = self._create_process(ident)
             self._processes[ident] = process
 
-        process.writeline("puts #VUNIT_RETURN")
-        try:
-            consumer = SilentOutputConsumer()
-            process.consume_output(consumer)
-        except Process.NonZeroExitCode:
-            # Print output if background vsim process startup failed
-            LOGGER.error("Failed to start re-usable background process")
-            LOGGER.error(consumer.output)
-            raise
+        if started_in_advance:
+            # Health check
+            try:
+                _wait_until_ready(process)
+            except Process.NonZeroExitCode:
+                LOGGER.debug("Re-usable background process failed health check, starting another")
+                started_in_advance = False
+                with self._lock:  # pylint: disable=not-context-manager
+                    process = self._create_process(ident)
+                    self._processes[ident] = process
+
+        if not started_in_advance:
+            _wait_until_ready(process, log_failure=True)
+
+        # Let the process belong to this thread to be killed on timeout
+        RUNNING_PROCESSES.add(process)
         return process
 
     def execute(self, cmd):
@@ -79,17 +167,30 @@ class PersistentTclShell(object):
 
     def teardown(self):
         """
-        Teardown all active processes before shutdown
+        Teardown all active processes before shutdown. The processes still being started in the background are
+        killed since they may never become ready, e.g. when waiting for a license
         """
         with self._lock:  # pylint: disable=not-context-manager
-            for proc in self._processes.values():
+            self._generation += 1
+
+            starting = list(self._starting.values())
+            for proc in starting:
+                proc.kill_group()
+
+            for proc in starting:
+                proc.wait()
+            self._starting = {}
+
+            processes = list(self._processes.values()) + self._started
+            for proc in processes:
                 if proc.is_alive():
                     proc.writeline("quit -force -code 0")
 
-            for proc in self._processes.values():
+            for proc in processes:
                 if proc.is_alive():
                     proc.wait()
             self._processes = {}
+            self._started = []
 
     def __del__(self):
         try:
@@ -98,6 +199,31 @@ class PersistentTclShell(object):
             LOGGER.debug("PersistentTclShell.__del__: Ignoring KeyboardInterrupt")
 
 
+def _wait_until_ready(process, log_failure=False):
+    """
+    Wait until the process is ready to execute commands
+    """
+    process.writeline("puts #VUNIT_RETURN")
+    consumer = SilentOutputConsumer()
+    try:
+        process.consume_output(consumer)
+    except Process.NonZeroExitCode:
+        if log_failure:
+            # Print output if background vsim process startup failed
+            LOGGER.error("Failed to start re-usable background process")
+            LOGGER.error(consumer.output)
+        raise
+
+
+def _quit(process):
+    """
+    Quit the process
+    """
+    if process.is_alive():
+        process.writeline("quit -force -code 0")
+        process.wait()
+
+
 def output_consumer(line):
     """
     Consume output until reaching #VUNIT_RETURN
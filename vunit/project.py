@@ -9,8 +9,9 @@
 """
 Functionality to represent and operate on a HDL code project
 """
-from typing import Optional, Union
+from typing import Any, Optional, Tuple, Union
 from pathlib import Path
+import os
 import logging
 from collections import OrderedDict
 from vunit.hashing import hash_string
@@ -27,6 +28,7 @@ from vunit.source_file import (
 )
 from vunit.vhdl_standard import VHDL, VHDLStandard
 from vunit.library import Library
+from vunit.project_snapshot import ProjectSnapshot
 
 LOGGER = logging.getLogger(__name__)
 
@@ -38,9 +40,10 @@ class Project(object):  # pylint: disable=too-many-instance-attributes
     timestamps and depenencies derived from the design hierarchy.
     """
 
-    def __init__(self, depend_on_package_body=False, database=None):
+    def __init__(self, depend_on_package_body=False, database=None, builtins_index=None):
         """
         depend_on_package_body - Package users depend also on package body
+        builtins_index - Index of the parse results of the builtin files used instead of parsing them
         """
         self._database = database
         self._vhdl_parser = VHDLParser(database=self._database)
@@ -52,6 +55,8 @@ class Project(object):  # pylint: disable=too-many-instance-attributes
         self._manual_dependencies = []
         self._depend_on_package_body = depend_on_package_body
         self._builtin_libraries = set(["ieee", "std"])
+        self._snapshot = ProjectSnapshot(database)
+        self._builtins_index = builtins_index
 
     def _validate_new_library_name(self, library_name):
         """
@@ -109,6 +114,23 @@ class Project(object):  # pylint: disable=too-many-instance-attributes
         self._libraries[logical_name] = library
         self._lower_library_names_dict[logical_name.lower()] = library.name
 
+    def remove_library(self, logical_name):
+        """
+        Remove library and its source files from project
+        """
+        library = self._libraries[logical_name]
+        self._source_files_in_order = [
+            source_file for source_file in self._source_files_in_order if source_file.library is not library
+        ]
+        self._manual_dependencies = [
+            (source_file, depends_on)
+            for source_file, depends_on in self._manual_dependencies
+            if library not in (source_file.library, depends_on.library)
+        ]
+
+        del self._libraries[logical_name]
+        del self._lower_library_names_dict[logical_name.lower()]
+
     def add_source_file(  # pylint: disable=too-many-arguments
         self,
         file_name,
@@ -125,7 +147,20 @@ class Project(object):  # pylint: disable=too-many-instance-attributes
         :param no_parse: Do not parse file contents
         """
         fname = file_name if isinstance(file_name, Path) else Path(file_name)
-        if not fname.exists():
+
+        # The same file name may be relative to another working directory in the next run
+        snapshot_key: Tuple[Any, ...] = (file_type, os.path.abspath(fname), no_parse)
+        if file_type != "vhdl":
+            snapshot_key += (
+                tuple(os.path.abspath(include_dir) for include_dir in include_dirs or []),
+                tuple(sorted((defines or {}).items())),
+            )
+
+        # The existence of a file in the snapshot or the builtins index has been checked
+        snapshot = self._snapshot.get(snapshot_key)
+        if snapshot is None and file_type == "vhdl" and not no_parse and self._builtins_index is not None:
+            snapshot = self._builtins_index.get(fname, self._database)
+        if snapshot is None and not fname.exists():
             raise ValueError(f"File {str(fname)!r} does not exist")
 
         LOGGER.debug("Adding source file %s to library %s", str(fname), library_name)
@@ -140,6 +175,7 @@ class Project(object):  # pylint: disable=too-many-instance-attributes
                 database=self._database,
                 vhdl_standard=library.vhdl_standard if vhdl_standard is None else vhdl_standard,
                 no_parse=no_parse,
+                snapshot=snapshot,
             )
         elif file_type in VERILOG_FILE_TYPES:
             source_file = VerilogSourceFile(
@@ -151,16 +187,36 @@ class Project(object):  # pylint: disable=too-many-instance-attributes
                 include_dirs=include_dirs,
                 defines=defines,
                 no_parse=no_parse,
+                snapshot=snapshot,
             )
         else:
             raise ValueError(file_type)
 
+        if snapshot is None:
+            snapshot, file_names = source_file.get_snapshot()
+            # Files which failed to parse are parsed again to report the error
+            if no_parse or snapshot[0] is not None:
+                self._snapshot.add(snapshot_key, snapshot, file_names)
+
         old_source_file = library.add_source_file(source_file)
         if id(source_file) == id(old_source_file):
             self._source_files_in_order.append(source_file)
 
         return old_source_file
 
+    def save_snapshot(self):
+        """
+        Save the snapshot of the source files added to the project to be reused by the next run
+        """
+        self._snapshot.save()
+
+    def get_parsed_file_names(self):
+        """
+        Return the names of the files the parse results of the source files depend on,
+        including the files included by Verilog files
+        """
+        return self._snapshot.get_file_names()
+
     def add_manual_dependency(self, source_file, depends_on):
         """
         Add manual dependency where 'source_file' depends_on 'depends_on'
@@ -528,10 +584,12 @@ class Project(object):  # pylint: disable=too-many-instance-attributes
             self._handle_circular_dependency(exc)
             raise CompileError from exc
 
-        def comparison_key(source_file):
-            return compile_order.index(source_file)
+        # The position of the first equal file as found by list.index
+        positions = {}
+        for position, source_file in enumerate(compile_order):
+            positions.setdefault(source_file, position)
 
-        return sorted(files, key=comparison_key)
+        return sorted(files, key=positions.__getitem__)
 
     def get_source_files_in_order(self):
         """
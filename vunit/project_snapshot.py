@@ -0,0 +1,115 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2023, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Snapshot of the parsed source files of a project kept between runs
+"""
+
+import os
+from collections import defaultdict
+
+
+class ProjectSnapshot(object):
+    """
+    Snapshot of the parse results and content hashes of the source files of a project.
+
+    The snapshot of a source file is reused, without reading or parsing the file, when the
+    files it depends on have the same modification time and size as when the snapshot was
+    taken. The files of the whole snapshot are checked with a single scan of the
+    directories containing them.
+    """
+
+    _database_key = b"ProjectSnapshot"
+
+    def __init__(self, database=None):
+        self._database = database
+        self._old_entries = {}
+        if database is not None and self._database_key in database:
+            self._old_entries = database[self._database_key]
+        self._entries = {}
+        self._stats = None
+
+    def get(self, key):
+        """
+        Return the state of the source file with key when the files it depends on are unchanged or None
+        """
+        entry = self._old_entries.get(key)
+        if entry is None:
+            return None
+
+        if self._stats is None:
+            self._stats = self._scan()
+
+        stats, state = entry
+        for file_name, stat in stats:
+            if self._stats.get(os.path.split(file_name)) != stat:
+                return None
+
+        self._entries[key] = entry
+        return state
+
+    def add(self, key, state, file_names):
+        """
+        Add the state of the source file with key which depends on the files file_names
+        """
+        if self._database is None:
+            return
+
+        stats = []
+        for file_name in file_names:
+            file_name = os.path.abspath(file_name)
+            try:
+                stat = os.stat(file_name)
+            except OSError:
+                return
+            stats.append((file_name, (stat.st_mtime_ns, stat.st_size)))
+
+        self._entries[key] = (stats, state)
+
+    def get_file_names(self):
+        """
+        Return the names of the files the source files added in this run depend on
+        """
+        return {file_name for stats, _ in self._entries.values() for file_name, _ in stats}
+
+    def save(self):
+        """
+        Save the snapshot of the source files added in this run unless it is unchanged
+        """
+        if self._database is None:
+            return
+
+        if self._entries.keys() == self._old_entries.keys() and all(
+            entry is self._old_entries[key] for key, entry in self._entries.items()
+        ):
+            return
+
+        self._database[self._database_key] = self._entries
+        self._old_entries = self._entries
+        self._entries = dict(self._entries)
+
+    def _scan(self):
+        """
+        Return the modification time and size of the files in the snapshot by directory and base name
+        """
+        names_by_directory = defaultdict(set)
+        for stats, _ in self._old_entries.values():
+            for file_name, _ in stats:
+                directory, name = os.path.split(file_name)
+                names_by_directory[directory].add(name)
+
+        result = {}
+        for directory, names in names_by_directory.items():
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name in names:
+                            stat = entry.stat()
+                            result[(directory, entry.name)] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+
+        return result
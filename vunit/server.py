@@ -0,0 +1,316 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2023, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Serve requests to a long-lived run script over a Unix domain socket
+
+A run script started with ``--serve SOCKET`` keeps the project, the parse results
+and the simulator interface in memory and answers JSON-RPC 2.0 requests, one JSON
+object per line. The state is only valid as long as the run script and the source
+files are unchanged. The files, and the files matched by the glob patterns of the added
+files, are checked before each request and when any of them changed the server restarts
+the run script, handing over the listening socket and the connection of the pending
+request, such that clients never see stale results.
+"""
+
+import os
+import sys
+import json
+from glob import glob
+import socket
+import inspect
+import logging
+import traceback
+
+LOGGER = logging.getLogger(__name__)
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+# The sockets and pending data handed over to the restarted server
+_INHERITED_ENV = "VUNIT_SERVE_INHERITED"
+
+
+class RequestError(Exception):
+    """
+    The error response of a request
+    """
+
+    def __init__(self, code, message):
+        Exception.__init__(self, message)
+        self.code = code
+
+
+class Server(object):
+    """
+    Serve JSON-RPC requests from one client at a time
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self, socket_path, methods, watched_files=(), watched_patterns=(), before_restart=None
+    ):
+        """
+        :param socket_path: The path of the Unix domain socket
+        :param methods: Dictionary of callables by method name, called with the parameters of the request
+                        and returning a JSON serializable result
+        :param watched_files: The files whose change invalidates the state of the server
+        :param watched_patterns: The glob patterns whose matching files invalidate the state of the server when
+                                 files are added or removed
+        :param before_restart: Callable called before restarting the server
+        """
+        self._socket_path = str(socket_path)
+        self._methods = dict(methods, shutdown=self._shutdown)
+        self._stamps = _get_stamps(watched_files)
+        self._matches = _get_matches(watched_patterns)
+        self._before_restart = before_restart
+        self._is_shut_down = False
+
+    def serve(self):
+        """
+        Serve requests until shut down
+        """
+        listener, connection, buffer = _take_inherited_sockets()
+        if listener is None:
+            listener = self._listen()
+            LOGGER.info("Serving requests on %s", self._socket_path)
+
+        try:
+            while not self._is_shut_down:
+                if connection is None:
+                    connection, _ = listener.accept()
+                    buffer = b""
+
+                pending = self._serve_connection(connection, buffer)
+                if pending is not None:
+                    self._restart(listener, connection, pending)
+
+                connection.close()
+                connection = None
+        finally:
+            if connection is not None:
+                connection.close()
+            listener.close()
+            _remove_socket(self._socket_path)
+
+    def _listen(self):
+        """
+        Create the listening socket, replacing the socket file of a server which is no longer running
+        """
+        if os.path.exists(self._socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self._socket_path)
+            except OSError:
+                _remove_socket(self._socket_path)
+            else:
+                raise RuntimeError(f"Another server is already serving requests on {self._socket_path!s}")
+            finally:
+                probe.close()
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self._socket_path)
+        listener.listen()
+        return listener
+
+    def _serve_connection(self, connection, buffer):
+        """
+        Serve the requests of a connection until it is closed.
+        Returns the pending data when the server must restart before serving the next request
+        """
+        while not self._is_shut_down:
+            while b"\n" not in buffer:
+                try:
+                    data = connection.recv(65536)
+                except OSError:
+                    return None
+                if not data:
+                    return None
+                buffer += data
+
+            if self._has_changed_files():
+                return buffer
+
+            line, buffer = buffer.split(b"\n", 1)
+            if not line.strip():
+                continue
+
+            response = self.handle(line)
+            if response is None:
+                continue
+
+            try:
+                connection.sendall(json.dumps(response).encode("utf-8") + b"\n")
+            except OSError:
+                return None
+
+        return None
+
+    def handle(self, line):
+        """
+        Return the response to a single request or None for a notification
+        """
+        try:
+            message = json.loads(line.decode("utf-8"))
+        except ValueError as exc:
+            return _error_response(None, PARSE_ERROR, str(exc))
+
+        if not isinstance(message, dict) or not isinstance(message.get("method"), str):
+            return _error_response(None, INVALID_REQUEST, "Invalid request")
+
+        request_id = message.get("id")
+        try:
+            result = self._call(message["method"], message.get("params"))
+        except RequestError as exc:
+            response = _error_response(request_id, exc.code, str(exc))
+        except Exception as exc:  # pylint: disable=broad-except
+            traceback.print_exc()
+            response = _error_response(request_id, INTERNAL_ERROR, str(exc))
+        else:
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+        if "id" not in message:
+            return None
+        return response
+
+    def _call(self, name, params):
+        """
+        Call the method with the parameters of a request
+        """
+        if name not in self._methods:
+            raise RequestError(METHOD_NOT_FOUND, f"Unknown method {name!s}")
+
+        method = self._methods[name]
+        args = params if isinstance(params, list) else []
+        kwargs = params if isinstance(params, dict) else {}
+        try:
+            inspect.signature(method).bind(*args, **kwargs)
+        except TypeError as exc:
+            raise RequestError(INVALID_PARAMS, str(exc)) from exc
+
+        return method(*args, **kwargs)
+
+    def _shutdown(self):
+        """
+        Stop serving requests once the response has been sent
+        """
+        self._is_shut_down = True
+        return True
+
+    def _has_changed_files(self):
+        """
+        Return True when any of the watched files changed or files matching the watched patterns were
+        added or removed since the server was started
+        """
+        return _get_stamps(self._stamps) != self._stamps or _get_matches(self._matches) != self._matches
+
+    def _restart(self, listener, connection, pending):
+        """
+        Restart the run script with the same arguments continuing to serve the connection
+        """
+        LOGGER.info("Restarting the server since files changed")
+        if self._before_restart is not None:
+            self._before_restart()
+
+        for sock in (listener, connection):
+            sock.set_inheritable(True)
+        os.environ[_INHERITED_ENV] = json.dumps(
+            {
+                "listener": listener.fileno(),
+                "connection": connection.fileno(),
+                "pending": pending.decode("utf-8", errors="surrogateescape"),
+            }
+        )
+
+        # The original arguments keep interpreter options such as -m
+        argv = getattr(sys, "orig_argv", None)
+        argv = [sys.executable] + (argv[1:] if argv else sys.argv)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.execv(sys.executable, argv)
+
+
+def request(socket_path, method, params=None, timeout=None):
+    """
+    Send a request to a server and return the result or raise RequestError
+    """
+    message = {"jsonrpc": "2.0", "id": 1, "method": method}
+    if params is not None:
+        message["params"] = params
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+        buffer = b""
+        while b"\n" not in buffer:
+            data = sock.recv(65536)
+            if not data:
+                raise ConnectionError("Connection closed by the server")
+            buffer += data
+
+    response = json.loads(buffer.split(b"\n", 1)[0].decode("utf-8"))
+    if "error" in response:
+        raise RequestError(response["error"]["code"], response["error"]["message"])
+    return response["result"]
+
+
+def _take_inherited_sockets():
+    """
+    Return the listening socket, the connection and the pending data handed over by a restart
+    """
+    inherited = os.environ.pop(_INHERITED_ENV, None)
+    if inherited is None:
+        return None, None, b""
+
+    inherited = json.loads(inherited)
+    listener = socket.socket(fileno=inherited["listener"])
+    connection = socket.socket(fileno=inherited["connection"])
+    for sock in (listener, connection):
+        sock.set_inheritable(False)
+    return listener, connection, inherited["pending"].encode("utf-8", errors="surrogateescape")
+
+
+def _get_stamps(file_names):
+    """
+    Return the modification time and size of the files by name, None for missing files
+    """
+    stamps = {}
+    for file_name in file_names:
+        try:
+            stat = os.stat(file_name)
+        except OSError:
+            stamps[file_name] = None
+        else:
+            stamps[file_name] = (stat.st_mtime_ns, stat.st_size)
+    return stamps
+
+
+def _get_matches(patterns):
+    """
+    Return the sorted file names matching the glob patterns by pattern
+    """
+    return {pattern: sorted(glob(pattern, recursive=True)) for pattern in patterns}
+
+
+def _error_response(request_id, code, message):
+    """
+    Return the response of a failed request
+    """
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+def _remove_socket(socket_path):
+    """
+    Remove the socket file of the server if it exists
+    """
+    try:
+        os.remove(socket_path)
+    except OSError:
+        pass
@@ -12,11 +12,15 @@ import sys
 import os
 from os import environ, listdir, pathsep
 import subprocess
+import threading
+import json
 from pathlib import Path
 from typing import List
 from ..ostools import Process, simplify_path
 from ..exceptions import CompileError
+from ..hashing import hash_string
 from ..color_printer import NO_COLOR_PRINTER
+from .coverage_merger import CoverageMerger
 
 
 class Option(object):
@@ -49,9 +53,20 @@ class SimulatorInterface(object):  # pylint: disable=too-many-public-methods
     # True if simulator supports ANSI colors in GUI mode
     supports_colors_in_gui = False
 
+    # File name suffix of coverage databases
+    coverage_file_suffix = ""
+
+    # Executables in the toolchain prefix which identify the installed simulator version
+    version_executables: List[str] = []
+
     def __init__(self, output_path, gui):
         self._output_path = output_path
         self._gui = gui
+        self._coverage_merger = CoverageMerger(
+            self._merge_coverage_files,
+            Path(output_path) / "coverage_merge",
+            suffix=self.coverage_file_suffix,
+        )
 
     @property
     def output_path(self):
@@ -150,6 +165,24 @@ class SimulatorInterface(object):  # pylint: disable=too-many-public-methods
                 return path0
         return None
 
+    @classmethod
+    def get_version_key(cls):
+        """
+        Returns a key which changes when the executables of the simulator are replaced, None if unknown
+        """
+        if not cls.version_executables:
+            return None
+
+        prefix = cls.find_prefix()
+        if prefix is None:
+            return None
+
+        stamps = [_get_executable_stamp(Path(prefix) / name) for name in cls.version_executables]
+        if None in stamps:
+            return None
+
+        return hash_string(repr(stamps))
+
     @classmethod
     def get_osvvm_coverage_api(cls):
         """
@@ -190,26 +223,56 @@ class SimulatorInterface(object):  # pylint: disable=too-many-public-methods
         """
         raise RuntimeError("This simulator does not support merging coverage")
 
+    def set_coverage_merge_options(self, num_workers=1, incremental=False):
+        """
+        Set the number of coverage merges run in parallel and if the coverage
+        databases shall be merged in the background while the tests are running
+        """
+        self._coverage_merger.num_workers = num_workers
+        self._coverage_merger.incremental = incremental
+
+    def _merge_coverage_files(self, file_names, output_file_name, args):
+        """
+        Hook for simulator interface to merge a list of coverage databases into one
+        """
+        raise RuntimeError("This simulator does not support merging coverage")
+
     def add_simulator_specific(self, project):
         """
         Hook for the simulator interface to add simulator specific things to the project
         """
 
-    def compile_project(
+    def compile_project(  # pylint: disable=too-many-arguments
         self,
         project,
         printer=NO_COLOR_PRINTER,
         continue_on_error=False,
         target_files=None,
+        num_simulator_processes=0,
     ):
         """
         Compile the project
         param: target_files: Given a list of SourceFiles only these and dependent files are compiled
+        param: num_simulator_processes: The number of simulator processes to start while compiling
         """
         self.add_simulator_specific(project)
         self.setup_library_mapping(project)
+        if num_simulator_processes > 0:
+            self.start_simulator_processes(num_simulator_processes)
         self.compile_source_files(project, printer, continue_on_error, target_files=target_files)
 
+    def start_simulator_processes(self, num_processes):
+        """
+        Hook for the simulator interface to start re-usable simulator processes
+        in the background such that they are ready when the tests are run
+        """
+
+    def teardown(self):
+        """
+        Hook for the simulator interface to stop its re-usable simulator processes,
+        they are started again when needed
+        """
+
     def simulate(self, output_path, test_suite_name, config, elaborate_only):
         """
         Simulate
@@ -332,6 +395,115 @@ def isfile(file_name):
     return str(fpath.name) in listdir(str(fpath.parent))
 
 
+# The name of the file in the working directory of a simulation from which a test bench elaborated
+# once for all tests reads the runner_cfg of the test
+RUNNER_CFG_FILE_NAME = "vunit_runner_cfg"
+
+
+def get_dependency_hash(project, config):
+    """
+    Return a hash of the source files the test bench of the configuration depends on
+    """
+    library = project.get_library(config.library_name)
+    try:
+        entity = library.primary_design_units[config.entity_name]
+        target_files = [
+            entity.source_file,
+            library.get_source_file(entity.architecture_names[config.architecture_name]),
+        ]
+    except (KeyError, AttributeError):
+        target_files = None
+
+    source_files = project.get_dependencies_in_compile_order(
+        target_files=target_files, implementation_dependencies=True
+    )
+    return hash_string("".join(source_file.name + source_file.content_hash for source_file in source_files))
+
+
+class ToolProbeCache(object):
+    """
+    Cache of the results of probing simulator executables, such as parsing
+    their version output, which would otherwise start a process on each run.
+    A result is keyed on the resolved path of the executable and the probe
+    arguments and is valid as long as the executable has the same modification
+    time and size. Executables which do not exist are always probed. The cache
+    only saves the probes, all simulator modules are still imported
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._file_name = None
+        self._entries = {}
+
+    def set_file_name(self, file_name):
+        """
+        Persist the cache in file_name and load the results of previous runs from it
+        """
+        try:
+            with Path(file_name).open("r", encoding="utf-8") as fptr:
+                entries = json.load(fptr)
+        except (OSError, ValueError):
+            entries = {}
+
+        with self._lock:  # pylint: disable=not-context-manager
+            self._file_name = file_name
+            if isinstance(entries, dict):
+                entries.update(self._entries)
+                self._entries = entries
+
+    def get(self, executable, args, probe):
+        """
+        Return the cached result of probing executable with args, calling probe() on a cache miss.
+        The result must be JSON serializable. Executables which do not exist are never cached
+        """
+        stamp = _get_executable_stamp(executable)
+        if stamp is None:
+            return probe()
+
+        path, mtime, size = stamp
+        key = json.dumps([path] + list(args))
+
+        with self._lock:  # pylint: disable=not-context-manager
+            entry = self._entries.get(key)
+        if isinstance(entry, dict) and entry.get("mtime") == mtime and entry.get("size") == size:
+            return entry["result"]
+
+        result = probe()
+
+        with self._lock:  # pylint: disable=not-context-manager
+            self._entries[key] = {"mtime": mtime, "size": size, "result": result}
+            if self._file_name is not None:
+                try:
+                    with Path(self._file_name).open("w", encoding="utf-8") as fptr:
+                        json.dump(self._entries, fptr, indent=2)
+                except OSError:
+                    pass
+
+        return result
+
+
+def _get_executable_stamp(executable):
+    """
+    Return the resolved path, modification time and size of an executable or None if it does not exist
+    """
+    candidates = [Path(executable)]
+    if sys.platform == "win32" or os.name == "os2":
+        candidates.append(Path(str(executable) + ".exe"))
+
+    for candidate in candidates:
+        try:
+            path = candidate.resolve()
+            stat = path.stat()
+        except (OSError, RuntimeError):
+            continue
+        return str(path), stat.st_mtime_ns, stat.st_size
+
+    return None
+
+
+TOOL_PROBE_CACHE = ToolProbeCache()
+
+
 def run_command(command, cwd=None, env=None):
     """
     Run a command
@@ -399,6 +571,16 @@ class ListOfStringOption(Option):
             fail()
 
 
+class PositiveNumberOption(Option):
+    """
+    Must be a positive integer or float
+    """
+
+    def validate(self, value):
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+            raise ValueError(f"Option {self.name!r} must be a positive number. Got {value!r}")
+
+
 class VHDLAssertLevelOption(Option):
     """
     VHDL assert level
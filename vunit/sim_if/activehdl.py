@@ -30,6 +30,8 @@ class ActiveHDLInterface(SimulatorInterface):
     name = "activehdl"
     supports_gui_flag = True
     package_users_depend_on_bodies = True
+    coverage_file_suffix = ".acdb"
+    version_executables = ["vsim", "vcom", "vlog"]
     compile_options = [
         ListOfStringOption("activehdl.vcom_flags"),
         ListOfStringOption("activehdl.vlog_flags"),
@@ -91,11 +93,16 @@ class ActiveHDLInterface(SimulatorInterface):
         """
         Setup library mapping
         """
-        mapped_libraries = self._get_mapped_libraries()
-
-        for library in project.get_libraries():
+        libraries = project.get_libraries()
+        for library in libraries:
             self._libraries.append(library)
-            self.create_library(library.name, library.directory, mapped_libraries)
+            self._create_library_directory(library.name, library.directory)
+
+        # vlib maps the libraries it creates, only changed mappings remain for vmap
+        mapped_libraries = self._get_mapped_libraries()
+        for library in libraries:
+            if mapped_libraries.get(library.name) != str(Path(library.directory).resolve()):
+                self._map_library(library.name, library.directory)
 
     def compile_source_file_command(self, source_file):
         """
@@ -158,6 +165,17 @@ class ActiveHDLInterface(SimulatorInterface):
         """
         mapped_libraries = mapped_libraries if mapped_libraries is not None else {}
 
+        self._create_library_directory(library_name, path)
+
+        if library_name in mapped_libraries and mapped_libraries[library_name] == path:
+            return
+
+        self._map_library(library_name, path)
+
+    def _create_library_directory(self, library_name, path):
+        """
+        Create a library with vlib unless its directory exists
+        """
         apath = str(Path(path).parent.resolve())
 
         if not file_exists(apath):
@@ -171,9 +189,10 @@ class ActiveHDLInterface(SimulatorInterface):
             )
             proc.consume_output(callback=None)
 
-        if library_name in mapped_libraries and mapped_libraries[library_name] == path:
-            return
-
+    def _map_library(self, library_name, path):
+        """
+        Map library_name to path with vmap
+        """
         proc = Process(
             [str(Path(self._prefix) / "vmap"), library_name, path],
             cwd=str(Path(self._library_cfg).parent),
@@ -191,7 +210,7 @@ class ActiveHDLInterface(SimulatorInterface):
         with Path(self._library_cfg).open("w", encoding="utf-8") as ofile:
             ofile.write(f'$INCLUDE = "{str(Path(self._prefix).parent / "vlib" / "library.cfg")}"\n')
 
-    _library_re = re.compile(r'([a-zA-Z_]+)\s=\s"(.*)"')
+    _library_re = re.compile(r'([a-zA-Z_0-9]+)\s=\s"(.*)"')
 
     def _get_mapped_libraries(self):
         """
@@ -307,22 +326,35 @@ proc vunit_run {} {
         """
         Merge coverage from all test cases,
         """
-
-        merge_command = "onerror {quit -code 1}\n"
-        merge_command += "acdb merge"
-
+        coverage_files = []
         for coverage_file in self._coverage_files:
             if file_exists(coverage_file):
-                merge_command += f" -i {{{fix_path(coverage_file)!s}}}"
+                coverage_files.append(coverage_file)
             else:
                 LOGGER.warning("Missing coverage file: %s", coverage_file)
 
+        print(f"Merging coverage files into {file_name!s}...")
+        self._coverage_merger.merge(coverage_files, file_name, args)
+        print("Done merging coverage files")
+
+    def _merge_coverage_files(self, file_names, output_file_name, args):
+        """
+        Merge coverage files with acdb merge
+        """
+        merge_command = "onerror {quit -code 1}\n"
+        merge_command += "acdb merge"
+
+        for coverage_file in file_names:
+            merge_command += f" -i {{{fix_path(coverage_file)!s}}}"
+
         if args is not None:
             merge_command += " " + " ".join(f"{{{arg!s}}}" for arg in args)
 
-        merge_command += f" -o {{{fix_path(file_name)!s}}}\n"
+        merge_command += f" -o {{{fix_path(output_file_name)!s}}}\n"
 
-        merge_script_name = str(Path(self._output_path) / "acdb_merge.tcl")
+        merge_script_path = Path(self._output_path) / "coverage_merge"
+        merge_script_path.mkdir(parents=True, exist_ok=True)
+        merge_script_name = str(merge_script_path / (Path(output_file_name).name + "_merge.tcl"))
         with Path(merge_script_name).open("w", encoding="utf-8") as fptr:
             fptr.write(merge_command + "\n")
 
@@ -332,10 +364,8 @@ proc vunit_run {} {
             str(fix_path(merge_script_name)),
         ]
 
-        print(f"Merging coverage files into {file_name!s}...")
         vcover_merge_process = Process(vcover_cmd, env=self.get_env())
         vcover_merge_process.consume_output()
-        print("Done merging coverage files")
 
     def _create_common_script(self, config, output_path):
         """
@@ -431,7 +461,11 @@ proc vunit_run {} {
             renew_path(gui_path)
             return self._run_batch_file(str(gui_file_name), gui=True, cwd=gui_path)
 
-        return self._run_batch_file(str(batch_file_name), gui=False, cwd=str(Path(self._library_cfg).parent))
+        status = self._run_batch_file(str(batch_file_name), gui=False, cwd=str(Path(self._library_cfg).parent))
+        if config.sim_options.get("enable_coverage", False) and not elaborate_only:
+            # The coverage file is complete when vsimsa has exited
+            self._coverage_merger.add(str(Path(output_path) / "coverage.acdb"))
+        return status
 
 
 @total_ordering
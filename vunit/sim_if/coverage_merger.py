@@ -0,0 +1,154 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2023, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Merging of coverage databases in a tree of parallel merges
+"""
+
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import logging
+
+LOGGER = logging.getLogger(__name__)
+
+
+class CoverageMerger(object):  # pylint: disable=too-many-instance-attributes
+    """
+    Merge coverage databases with a k-ary tree of merges where the merges of
+    each level of the tree are run in parallel. Each merge combines up to fan_in
+    databases into an intermediate database until at most fan_in databases are
+    left for the final merge.
+
+    With incremental merging the databases added while the tests are running
+    are merged in the background as soon as fan_in databases of the same level
+    of the tree are available such that little is left for the final merge.
+    """
+
+    def __init__(self, merge, output_path, suffix="", fan_in=16):
+        """
+        :param merge: Function merging a list of database names into a database name. Called
+                      with the extra merge arguments, which are None for incremental merges
+        :param output_path: Directory of the intermediate databases
+        :param suffix: File name suffix of the intermediate databases
+        :param fan_in: The maximum number of databases merged at once
+        """
+        self._merge = merge
+        self._output_path = Path(output_path)
+        self._suffix = suffix
+        self._fan_in = fan_in
+        self.num_workers = 1
+        self.incremental = False
+        self._lock = threading.Lock()
+        self._executor = None
+        self._futures = []
+        self._num_intermediates = 0
+        self._added = set()
+        self._levels = []  # The databases waiting to be merged on each level of the tree
+        self._left_over = []  # The databases of failed incremental merges
+
+    def add(self, file_name):
+        """
+        Add a complete coverage database which is merged in the background with
+        incremental merging. Missing databases are left to the final merge
+        """
+        if not self.incremental or not Path(file_name).exists():
+            return
+
+        with self._lock:  # pylint: disable=not-context-manager
+            self._added.add(file_name)
+            self._add(file_name, level=0)
+
+    def _add(self, file_name, level):
+        """
+        Add a database to a level of the tree and merge the level when full. Called with the lock held
+        """
+        while len(self._levels) <= level:
+            self._levels.append([])
+        self._levels[level].append(file_name)
+
+        if len(self._levels[level]) < self._fan_in:
+            return
+
+        batch = self._levels[level]
+        self._levels[level] = []
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.num_workers)
+        self._futures.append(self._executor.submit(self._merge_in_background, batch, level + 1))
+
+    def _merge_in_background(self, batch, level):
+        """
+        Merge a batch of databases into an intermediate database of the next level
+        """
+        output_file_name = self._new_intermediate_file_name()
+        try:
+            self._merge(batch, output_file_name, None)
+        except Exception as exc:  # pylint: disable=broad-except
+            LOGGER.warning("Incremental coverage merge failed, retrying in final merge: %s", exc)
+            with self._lock:  # pylint: disable=not-context-manager
+                self._left_over += batch
+            return
+
+        with self._lock:  # pylint: disable=not-context-manager
+            self._add(output_file_name, level)
+
+    def merge(self, file_names, output_file_name, args=None):
+        """
+        Merge the databases into output_file_name, including the databases
+        merged incrementally. Waits for the incremental merges to finish
+        """
+        self._wait()
+
+        inputs = [file_name for file_name in file_names if file_name not in self._added]
+        for level in self._levels:
+            inputs += level
+        inputs += self._left_over
+
+        while len(inputs) > self._fan_in:
+            batches = [inputs[idx : idx + self._fan_in] for idx in range(0, len(inputs), self._fan_in)]
+            inputs = [batch[0] if len(batch) == 1 else self._new_intermediate_file_name() for batch in batches]
+
+            with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+                futures = [
+                    executor.submit(self._merge, batch, intermediate, args)
+                    for batch, intermediate in zip(batches, inputs)
+                    if len(batch) > 1
+                ]
+                for future in futures:
+                    future.result()
+
+        self._merge(inputs, output_file_name, args)
+
+    def _wait(self):
+        """
+        Wait for the incremental merges, including those started by finished merges
+        """
+        while True:
+            with self._lock:  # pylint: disable=not-context-manager
+                futures = self._futures
+                self._futures = []
+
+            if not futures:
+                break
+
+            for future in futures:
+                future.result()
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _new_intermediate_file_name(self):
+        """
+        Return a unique file name of an intermediate database
+        """
+        with self._lock:  # pylint: disable=not-context-manager
+            self._num_intermediates += 1
+            number = self._num_intermediates
+
+        self._output_path.mkdir(parents=True, exist_ok=True)
+        return str(self._output_path / f"merged{number:d}{self._suffix!s}")
@@ -15,7 +15,7 @@ from .incisive import IncisiveInterface
 from .modelsim import ModelSimInterface
 from .nvc import NVCInterface
 from .rivierapro import RivieraProInterface
-from . import BooleanOption, ListOfStringOption, VHDLAssertLevelOption
+from . import BooleanOption, ListOfStringOption, PositiveNumberOption, VHDLAssertLevelOption
 
 
 class SimulatorFactory(object):
@@ -61,7 +61,11 @@ class SimulatorFactory(object):
                 VHDLAssertLevelOption(),
                 BooleanOption("disable_ieee_warnings"),
                 BooleanOption("enable_coverage"),
+                BooleanOption("enable_checkpoint"),
                 ListOfStringOption("pli"),
+                ListOfStringOption("resources"),
+                PositiveNumberOption("timeout"),
+                BooleanOption("resume_after_crash"),
             ]
         )
 
@@ -104,17 +108,17 @@ class SimulatorFactory(object):
     def select_simulator(self):
         """
         Select simulator class, either from VUNIT_SIMULATOR environment variable
-        or the first available
+        or the first available. With VUNIT_SIMULATOR set the other simulators are
+        only searched for when the selected one is not found
         """
-        available_simulators = self._detect_available_simulators()
         name_mapping = {simulator_class.name: simulator_class for simulator_class in self.supported_simulators()}
-        if not available_simulators:
-            return None
 
         environ_name = "VUNIT_SIMULATOR"
         if environ_name in os.environ:
             simulator_name = os.environ[environ_name]
             if simulator_name not in name_mapping:
+                if not self._detect_available_simulators():
+                    return None
                 raise RuntimeError(
                     (
                         "Simulator from " + environ_name + " environment variable %r is not supported. "
@@ -123,10 +127,17 @@ class SimulatorFactory(object):
                     % (simulator_name, name_mapping.keys())
                 )
             simulator_class = name_mapping[simulator_name]
-        else:
-            simulator_class = available_simulators[0]
 
-        return simulator_class
+            # Only search for the other simulators when the selected one is not found
+            if simulator_class.is_available() or self._detect_available_simulators():
+                return simulator_class
+            return None
+
+        available_simulators = self._detect_available_simulators()
+        if not available_simulators:
+            return None
+
+        return available_simulators[0]
 
     def add_arguments(self, parser):
         """
@@ -9,9 +9,10 @@ Interface for GHDL simulator
 """
 
 from pathlib import Path
-from os import environ, makedirs, remove
+from os import environ, makedirs, remove, replace, getpid, listdir
 import logging
 import subprocess
+import threading
 import shlex
 import re
 import shutil
@@ -20,7 +21,15 @@ from sys import stdout  # To avoid output catched in non-verbose mode
 from warnings import warn
 from ..exceptions import CompileError
 from ..ostools import Process
-from . import SimulatorInterface, ListOfStringOption, StringOption, BooleanOption
+from ..hashing import hash_string
+from . import (
+    SimulatorInterface,
+    ListOfStringOption,
+    StringOption,
+    BooleanOption,
+    get_dependency_hash,
+    TOOL_PROBE_CACHE,
+)
 from ..vhdl_standard import VHDL
 
 LOGGER = logging.getLogger(__name__)
@@ -33,6 +42,7 @@ class GHDLInterface(SimulatorInterface):  # pylint: disable=too-many-instance-at
 
     name = "ghdl"
     executable = environ.get("GHDL", "ghdl")
+    version_executables = [executable]
     supports_gui_flag = True
     supports_colors_in_gui = True
 
@@ -106,6 +116,11 @@ class GHDLInterface(SimulatorInterface):  # pylint: disable=too-many-instance-at
         self._backend = backend
         self._vhdl_standard = None
         self._coverage_test_dirs = set()
+        self._lock = threading.Lock()
+        self._elaboration_locks = {}
+        self._failed_elaborations = set()
+        self._used_executables = set()
+        self._dependency_hashes = {}
 
     def has_valid_exit_code(self):  # pylint: disable=arguments-differ
         """
@@ -118,8 +133,13 @@ class GHDLInterface(SimulatorInterface):  # pylint: disable=too-many-instance-at
         """
         Get the output of 'ghdl --version'
         """
-        print(str(Path(prefix) / cls.executable))
-        return subprocess.check_output([str(Path(prefix) / cls.executable), "--version"]).decode()
+        executable = str(Path(prefix) / cls.executable)
+
+        def probe():
+            print(executable)
+            return subprocess.check_output([executable, "--version"]).decode()
+
+        return TOOL_PROBE_CACHE.get(executable, ["--version"], probe)
 
     @classmethod
     def determine_backend(cls, prefix):
@@ -267,20 +287,19 @@ class GHDLInterface(SimulatorInterface):  # pylint: disable=too-many-instance-at
         cmd += [source_file.name]
         return cmd
 
-    def _get_command(self, config, output_path, elaborate_only, ghdl_e, wave_file):  # pylint: disable=too-many-branches
+    def _get_elaborate_command(self, config, bin_path, elab_run):
         """
-        Return GHDL simulation command
+        Return GHDL elaboration command, optionally also running the simulation
         """
         cmd = [str(Path(self._prefix) / self.executable)]
 
-        cmd += ["-e"] if ghdl_e else ["--elab-run"]
+        cmd += ["--elab-run"] if elab_run else ["-e"]
 
         cmd += [f"--std={self._std_str(self._vhdl_standard)!s}"]
         cmd += [f"--work={config.library_name!s}"]
         cmd += [f"--workdir={self._project.get_library(config.library_name).directory!s}"]
         cmd += [f"-P{lib.directory!s}" for lib in self._project.get_libraries()]
 
-        bin_path = str(Path(output_path) / f"{config.entity_name!s}-{config.architecture_name!s}")
         if self._has_output_flag():
             cmd += ["-o", bin_path]
         cmd += config.sim_options.get("ghdl.elab_flags", [])
@@ -288,8 +307,13 @@ class GHDLInterface(SimulatorInterface):  # pylint: disable=too-many-instance-at
             # Enable coverage in linker
             cmd += ["-Wl,-lgcov"]
         cmd += [config.entity_name, config.architecture_name]
+        return cmd
 
-        sim = config.sim_options.get("ghdl.sim_flags", [])
+    def _get_sim_flags(self, config, wave_file):
+        """
+        Return GHDL run time simulation flags
+        """
+        sim = list(config.sim_options.get("ghdl.sim_flags", []))
         for name, value in config.generics.items():
             sim += [f"-g{name!s}={value!s}"]
         sim += [f"--assert-level={config.vhdl_assert_stop_level!s}"]
@@ -302,6 +326,16 @@ class GHDLInterface(SimulatorInterface):  # pylint: disable=too-many-instance-at
             elif self._gtkwave_fmt == "vcd":
                 sim += [f"--vcd={wave_file!s}"]
 
+        return sim
+
+    def _get_command(self, config, output_path, elaborate_only, ghdl_e, wave_file):
+        """
+        Return GHDL simulation command
+        """
+        bin_path = str(Path(output_path) / f"{config.entity_name!s}-{config.architecture_name!s}")
+        cmd = self._get_elaborate_command(config, bin_path, elab_run=not ghdl_e)
+        sim = self._get_sim_flags(config, wave_file)
+
         if not ghdl_e:
             cmd += sim
             if elaborate_only:
@@ -314,7 +348,7 @@ class GHDLInterface(SimulatorInterface):  # pylint: disable=too-many-instance-at
             with (Path(output_path) / "args.json").open("w", encoding="utf-8") as fname:
                 dump(
                     {
-                        "bin": str(Path(output_path) / f"{config.entity_name!s}-{config.architecture_name!s}"),
+                        "bin": bin_path,
                         "build": cmd[1:],
                         "sim": sim,
                     },
@@ -323,7 +357,86 @@ class GHDLInterface(SimulatorInterface):  # pylint: disable=too-many-instance-at
 
         return cmd
 
-    def simulate(self, output_path, test_suite_name, config, elaborate_only):  # pylint: disable=too-many-locals
+    def _get_elaborated_executable(self, config):
+        """
+        Return the path to an executable of the test bench elaborated with the
+        elaboration flags of the configuration or None if the elaboration failed.
+
+        The executable is shared by all configurations which only differ in
+        run time flags or generics. It is elaborated once and re-elaborated
+        when any file the test bench depends on has changed. A failed
+        elaboration is not retried during the same run.
+        """
+        key = hash_string(
+            repr(self._get_elaborate_command(config, "", elab_run=False)) + self._get_dependency_hash(config)
+        )
+        prefix = f"{config.library_name!s}.{config.entity_name!s}-{config.architecture_name!s}-"
+        bin_path = Path(self.output_path) / "elaborated" / (prefix + key)
+
+        with self._lock:  # pylint: disable=not-context-manager
+            lock = self._elaboration_locks.setdefault(str(bin_path), threading.Lock())
+
+        with lock:  # pylint: disable=not-context-manager
+            if str(bin_path) in self._failed_elaborations:
+                print(f"Elaboration of {bin_path.name!s} failed in an earlier test, see its output")
+                return None
+
+            with self._lock:  # pylint: disable=not-context-manager
+                self._used_executables.add(bin_path.name)
+
+            if bin_path.exists():
+                return str(bin_path)
+
+            makedirs(str(bin_path.parent), exist_ok=True)
+
+            # Elaborate to a temporary file which is renamed when complete such that
+            # other processes sharing the output path never run a partial executable
+            tmp_path = f"{bin_path!s}.{getpid():d}.tmp"
+            try:
+                proc = Process(self._get_elaborate_command(config, tmp_path, elab_run=False))
+                proc.consume_output()
+            except Process.NonZeroExitCode:
+                self._failed_elaborations.add(str(bin_path))
+                return None
+            replace(tmp_path, str(bin_path))
+
+        self._remove_old_executables(bin_path.parent, prefix, len(bin_path.name))
+        return str(bin_path)
+
+    def _remove_old_executables(self, path, prefix, length):
+        """
+        Remove the executables of a test bench elaborated with other flags or dependencies
+        which are not used by this run
+        """
+        with self._lock:  # pylint: disable=not-context-manager
+            file_names = [
+                file_name
+                for file_name in listdir(str(path))
+                if file_name.startswith(prefix) and len(file_name) == length and file_name not in self._used_executables
+            ]
+
+        for file_name in file_names:
+            try:
+                remove(str(path / file_name))
+            except OSError:
+                # Removed by another process or still running
+                pass
+
+    def _get_dependency_hash(self, config):
+        """
+        Return a hash of the files the test bench depends on
+        """
+        key = (config.library_name, config.entity_name, config.architecture_name)
+
+        with self._lock:  # pylint: disable=not-context-manager
+            if key not in self._dependency_hashes:
+                self._dependency_hashes[key] = get_dependency_hash(self._project, config)
+
+            return self._dependency_hashes[key]
+
+    def simulate(  # pylint: disable=too-many-locals, too-many-branches
+        self, output_path, test_suite_name, config, elaborate_only
+    ):
         """
         Simulate with entity as top level using generics
         """
@@ -342,7 +455,16 @@ class GHDLInterface(SimulatorInterface):  # pylint: disable=too-many-instance-at
         else:
             data_file_name = None
 
-        cmd = self._get_command(config, script_path, elaborate_only, ghdl_e, data_file_name)
+        if self._has_output_flag() and not ghdl_e:
+            bin_path = self._get_elaborated_executable(config)
+            if bin_path is None:
+                return False
+
+            cmd = [bin_path] + self._get_sim_flags(config, data_file_name)
+            if elaborate_only:
+                cmd += ["--no-run"]
+        else:
+            cmd = self._get_command(config, script_path, elaborate_only, ghdl_e, data_file_name)
 
         status = True
 
@@ -359,6 +481,10 @@ class GHDLInterface(SimulatorInterface):  # pylint: disable=too-many-instance-at
         except Process.NonZeroExitCode:
             status = False
 
+        if config.sim_options.get("enable_coverage", False) and not elaborate_only:
+            # The .gcda files are complete when the simulation has exited
+            self._coverage_merger.add(str(Path(output_path) / "coverage"))
+
         if self._gui and not elaborate_only:
             cmd = ["gtkwave"] + shlex.split(self._gtkwave_args) + [data_file_name]
 
@@ -394,23 +520,15 @@ class GHDLInterface(SimulatorInterface):  # pylint: disable=too-many-instance-at
         """
         output_dir = file_name
 
-        # Loop over each .gcda output folder and merge them two at a time
-        first_input = True
+        coverage_dirs = []
         for coverage_dir in self._coverage_test_dirs:
             if Path(coverage_dir).exists():
-                merge_command = [
-                    "gcov-tool",
-                    "merge",
-                    "-o",
-                    output_dir,
-                    coverage_dir if first_input else output_dir,
-                    coverage_dir,
-                ]
-                subprocess.call(merge_command)
-                first_input = False
+                coverage_dirs.append(coverage_dir)
             else:
                 LOGGER.warning("Missing coverage directory: %s", coverage_dir)
 
+        self._coverage_merger.merge(coverage_dirs, output_dir, args)
+
         # Find actual output path of the .gcda files (they are deep in hierarchy)
         dir_path = Path(output_dir)
         gcda_dirs = {x.parent for x in dir_path.glob("**/*.gcda")}
@@ -421,3 +539,25 @@ class GHDLInterface(SimulatorInterface):  # pylint: disable=too-many-instance-at
         for library in self._project.get_libraries():
             for gcno_file in Path(library.directory).glob("*.gcno"):
                 shutil.copy(gcno_file, gcda_dir)
+
+    def _merge_coverage_files(self, file_names, output_file_name, args):  # pylint: disable=unused-argument
+        """
+        Merge .gcda output folders two at a time since gcov-tool only merges two folders.
+        A single folder is copied since merging it with itself would double the counts
+        """
+        if len(file_names) == 1:
+            if Path(output_file_name).exists():
+                shutil.rmtree(output_file_name)
+            shutil.copytree(file_names[0], output_file_name)
+            return
+
+        for idx, coverage_dir in enumerate(file_names[1:]):
+            merge_command = [
+                "gcov-tool",
+                "merge",
+                "-o",
+                output_file_name,
+                file_names[0] if idx == 0 else output_file_name,
+                coverage_dir,
+            ]
+            subprocess.call(merge_command)
@@ -13,10 +13,21 @@ from os.path import relpath
 import os
 import subprocess
 import logging
+import threading
 from ..exceptions import CompileError
 from ..ostools import write_file, file_exists
 from ..vhdl_standard import VHDL
-from . import SimulatorInterface, run_command, ListOfStringOption
+from ..hashing import hash_string
+from ..test.suites import encode_dict
+from . import (
+    SimulatorInterface,
+    run_command,
+    ListOfStringOption,
+    BooleanOption,
+    get_dependency_hash,
+    TOOL_PROBE_CACHE,
+    RUNNER_CFG_FILE_NAME,
+)
 from .cds_file import CDSFile
 
 LOGGER = logging.getLogger(__name__)
@@ -30,13 +41,17 @@ class IncisiveInterface(SimulatorInterface):  # pylint: disable=too-many-instanc
     name = "incisive"
     supports_gui_flag = True
     package_users_depend_on_bodies = False
+    version_executables = ["irun"]
 
     compile_options = [
         ListOfStringOption("incisive.irun_vhdl_flags"),
         ListOfStringOption("incisive.irun_verilog_flags"),
     ]
 
-    sim_options = [ListOfStringOption("incisive.irun_sim_flags")]
+    sim_options = [
+        ListOfStringOption("incisive.irun_sim_flags"),
+        BooleanOption("incisive.reuse_snapshot"),
+    ]
 
     @staticmethod
     def add_arguments(parser):
@@ -95,6 +110,10 @@ class IncisiveInterface(SimulatorInterface):  # pylint: disable=too-many-instanc
         else:
             self._cdslib = str(Path(cdslib).resolve())
         self._hdlvar = hdlvar
+        self._project = None
+        self._lock = threading.Lock()
+        self._elaboration_locks = {}
+        self._dependency_hashes = {}
         self._cds_root_irun = self.find_cds_root_irun()
         self._create_cdslib()
 
@@ -102,16 +121,24 @@ class IncisiveInterface(SimulatorInterface):  # pylint: disable=too-many-instanc
         """
         Finds irun cds root
         """
-        return subprocess.check_output([str(Path(self._prefix) / "cds_root"), "irun"]).splitlines()[0]
+        cds_root = str(Path(self._prefix) / "cds_root")
+        return TOOL_PROBE_CACHE.get(
+            cds_root, ["irun"], lambda: subprocess.check_output([cds_root, "irun"]).decode().splitlines()[0]
+        )
 
     def find_cds_root_virtuoso(self):
         """
         Finds virtuoso cds root
         """
-        try:
-            return subprocess.check_output([str(Path(self._prefix) / "cds_root"), "virtuoso"]).splitlines()[0]
-        except subprocess.CalledProcessError:
-            return None
+        cds_root = str(Path(self._prefix) / "cds_root")
+
+        def probe():
+            try:
+                return subprocess.check_output([cds_root, "virtuoso"]).decode().splitlines()[0]
+            except subprocess.CalledProcessError:
+                return None
+
+        return TOOL_PROBE_CACHE.get(cds_root, ["virtuoso"], probe)
 
     def _create_cdslib(self):
         """
@@ -144,6 +171,7 @@ define work "{self._output_path}/libraries/work"
         """
         Compile project using vhdl_standard
         """
+        self._project = project
         mapped_libraries = self._get_mapped_libraries()
 
         for library in project.get_libraries():
@@ -277,7 +305,7 @@ define work "{self._output_path}/libraries/work"
         cds = CDSFile.parse(self._cdslib)
         return cds
 
-    def simulate(self, output_path, test_suite_name, config, elaborate_only=False):  # pylint: disable=too-many-locals
+    def simulate(self, output_path, test_suite_name, config, elaborate_only=False):
         """
         Elaborates and Simulates with entity as top level using generics
         """
@@ -285,68 +313,154 @@ define work "{self._output_path}/libraries/work"
         script_path = str(Path(output_path) / self.name)
         launch_gui = self._gui is not False and not elaborate_only
 
+        # Only the VHDL runner reads runner_cfg from a file
+        if (
+            not (elaborate_only or launch_gui)
+            and config.architecture_name is not None
+            and "runner_cfg" in config.generics
+            and config.sim_options.get("incisive.reuse_snapshot", False)
+        ):
+            return self._simulate_snapshot(script_path, config)
+
         if elaborate_only:
             steps = ["elaborate"]
         else:
             steps = ["elaborate", "simulate"]
 
         for step in steps:
-            cmd = str(Path(self._prefix) / "irun")
             args = []
             if step == "elaborate":
                 args += ["-elaborate"]
-            args += ["-nocopyright"]
-            args += ["-licqueue"]
-            # args += ['-dumpstack']
-            # args += ['-gdbsh']
-            # args += ['-rebuild']
-            # args += ['-gdb']
-            # args += ['-gdbelab']
-            args += ["-errormax 10"]
-            args += ["-nowarn WRMNZD"]
-            args += ["-nowarn DLCPTH"]  # "cds.lib Invalid path"
-            args += ["-nowarn DLCVAR"]  # "cds.lib Invalid environment variable ''."
-            args += ["-ncerror EVBBOL"]  # promote to error: "bad boolean literal in generic association"
-            args += ["-ncerror EVBSTR"]  # promote to error: "bad string literal in generic association"
-            args += ["-ncerror EVBNAT"]  # promote to error: "bad natural literal in generic association"
-            args += ["-work work"]
-            args += [f'-nclibdirname "{Path(self._output_path) / "libraries"!s}"']  # @TODO: ugly
-            args += config.sim_options.get("incisive.irun_sim_flags", [])
-            args += [f'-cdslib "{self._cdslib!s}"']
-            args += self._hdlvar_args()
-            args += [f'-log "{(Path(script_path) / f"irun_{step!s}.log")!s}"']
-            if not self._log_level == "debug":
-                args += ["-quiet"]
-            else:
-                args += ["-messages"]
-                # args += ['-libverbose']
-            args += self._generic_args(config.entity_name, config.generics)
-            for library in self._libraries:
-                args += [f'-reflib "{library.directory!s}"']
-            if launch_gui:
-                args += ["-access +rwc"]
-                # args += ['-linedebug']
-                args += ["-gui"]
-            else:
-                args += ["-access +r"]
-                args += ['-input "@run"']
-
-            if config.architecture_name is None:
-                # we have a SystemVerilog toplevel:
-                args += [f"-top {config.library_name!s}.{config.entity_name!s}:sv"]
-            else:
-                # we have a VHDL toplevel:
-                args += [f"-top {config.library_name!s}.{config.entity_name!s}:{config.architecture_name!s}"]
-            argsfile = f"{script_path!s}/irun_{step!s}.args"
-            write_file(argsfile, "\n".join(args))
-            if not run_command(
-                [cmd, "-f", relpath(argsfile, script_path)],
-                cwd=script_path,
-                env=self.get_env(),
-            ):
+            args += self._get_common_args(config, Path(script_path) / f"irun_{step!s}.log")
+            args += self._get_design_args(config, config.generics, launch_gui)
+            if not self._run_irun(args, script_path, f"irun_{step!s}.args"):
                 return False
         return True
 
+    def _simulate_snapshot(self, script_path, config):
+        """
+        Simulate the snapshot shared by all tests of the test bench configuration.
+        The runner_cfg of the test is read by the test bench from a file in the
+        working directory of the simulation
+        """
+        snapshot = self._get_snapshot(config)
+        if snapshot is None:
+            return False
+
+        write_file(str(Path(script_path) / RUNNER_CFG_FILE_NAME), config.generics["runner_cfg"] + "\n")
+        args = self._get_common_args(config, Path(script_path) / "irun_simulate.log")
+        args += ["-R"]
+        args += [f"-snapshot {snapshot!s}"]
+        args += ['-input "@run"']
+        return self._run_irun(args, script_path, "irun_simulate.args")
+
+    def _get_snapshot(self, config):
+        """
+        Return the name of a snapshot of the test bench elaborated with the generics
+        and flags of the configuration, except for runner_cfg, or None if the
+        elaboration failed. The snapshot is elaborated once and elaborated again
+        when any file the test bench depends on has changed.
+        """
+        generics = dict(config.generics)
+        generics["runner_cfg"] = encode_dict({"runner_cfg file": RUNNER_CFG_FILE_NAME})
+        design_args = self._get_design_args(config, generics, launch_gui=False)
+
+        with self._lock:  # pylint: disable=not-context-manager
+            key = (config.library_name, config.entity_name, config.architecture_name)
+            if key not in self._dependency_hashes:
+                self._dependency_hashes[key] = get_dependency_hash(self._project, config)
+            dependency_hash = self._dependency_hashes[key]
+
+        snapshot = "vunit_" + hash_string(
+            repr(config.sim_options.get("incisive.irun_sim_flags", [])) + repr(design_args) + dependency_hash
+        )
+        snapshot_path = Path(self._output_path) / "snapshots" / snapshot
+
+        with self._lock:  # pylint: disable=not-context-manager
+            lock = self._elaboration_locks.setdefault(snapshot, threading.Lock())
+
+        with lock:  # pylint: disable=not-context-manager
+            if file_exists(str(snapshot_path / "elaborated")):
+                return snapshot
+
+            args = ["-elaborate"]
+            args += self._get_common_args(config, snapshot_path / "irun_elaborate.log")
+            args += [f"-snapshot {snapshot!s}"]
+            args += design_args
+            if not self._run_irun(args, str(snapshot_path), "irun_elaborate.args"):
+                return None
+            write_file(str(snapshot_path / "elaborated"), "")
+
+        return snapshot
+
+    def _get_common_args(self, config, log_file_name):
+        """
+        Return the irun arguments common to elaboration and simulation
+        """
+        args = []
+        args += ["-nocopyright"]
+        args += ["-licqueue"]
+        # args += ['-dumpstack']
+        # args += ['-gdbsh']
+        # args += ['-rebuild']
+        # args += ['-gdb']
+        # args += ['-gdbelab']
+        args += ["-errormax 10"]
+        args += ["-nowarn WRMNZD"]
+        args += ["-nowarn DLCPTH"]  # "cds.lib Invalid path"
+        args += ["-nowarn DLCVAR"]  # "cds.lib Invalid environment variable ''."
+        args += ["-ncerror EVBBOL"]  # promote to error: "bad boolean literal in generic association"
+        args += ["-ncerror EVBSTR"]  # promote to error: "bad string literal in generic association"
+        args += ["-ncerror EVBNAT"]  # promote to error: "bad natural literal in generic association"
+        args += ["-work work"]
+        args += [f'-nclibdirname "{Path(self._output_path) / "libraries"!s}"']  # @TODO: ugly
+        args += config.sim_options.get("incisive.irun_sim_flags", [])
+        args += [f'-cdslib "{self._cdslib!s}"']
+        args += self._hdlvar_args()
+        args += [f'-log "{log_file_name!s}"']
+        if not self._log_level == "debug":
+            args += ["-quiet"]
+        else:
+            args += ["-messages"]
+            # args += ['-libverbose']
+        return args
+
+    def _get_design_args(self, config, generics, launch_gui):
+        """
+        Return the irun arguments selecting the design to elaborate
+        """
+        args = []
+        args += self._generic_args(config.entity_name, generics)
+        for library in self._libraries:
+            args += [f'-reflib "{library.directory!s}"']
+        if launch_gui:
+            args += ["-access +rwc"]
+            # args += ['-linedebug']
+            args += ["-gui"]
+        else:
+            args += ["-access +r"]
+            args += ['-input "@run"']
+
+        if config.architecture_name is None:
+            # we have a SystemVerilog toplevel:
+            args += [f"-top {config.library_name!s}.{config.entity_name!s}:sv"]
+        else:
+            # we have a VHDL toplevel:
+            args += [f"-top {config.library_name!s}.{config.entity_name!s}:{config.architecture_name!s}"]
+        return args
+
+    def _run_irun(self, args, script_path, args_file_name):
+        """
+        Run irun with the arguments written to an arguments file in script_path
+        """
+        argsfile = f"{script_path!s}/{args_file_name!s}"
+        write_file(argsfile, "\n".join(args))
+        return run_command(
+            [str(Path(self._prefix) / "irun"), "-f", relpath(argsfile, script_path)],
+            cwd=script_path,
+            env=self.get_env(),
+        )
+
     def _hdlvar_args(self):
         """
         Return hdlvar argument if available
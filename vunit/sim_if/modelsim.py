@@ -15,7 +15,7 @@ from configparser import RawConfigParser
 from ..exceptions import CompileError
 from ..ostools import Process, file_exists
 from ..vhdl_standard import VHDL
-from . import SimulatorInterface, ListOfStringOption, StringOption
+from . import SimulatorInterface, ListOfStringOption, StringOption, BooleanOption
 from .vsim_simulator_mixin import VsimSimulatorMixin, fix_path
 
 LOGGER = logging.getLogger(__name__)
@@ -32,6 +32,8 @@ class ModelSimInterface(VsimSimulatorMixin, SimulatorInterface):  # pylint: disa
     name = "modelsim"
     supports_gui_flag = True
     package_users_depend_on_bodies = False
+    coverage_file_suffix = ".ucdb"
+    version_executables = ["vsim", "vcom", "vlog"]
 
     compile_options = [
         ListOfStringOption("modelsim.vcom_flags"),
@@ -44,6 +46,7 @@ class ModelSimInterface(VsimSimulatorMixin, SimulatorInterface):  # pylint: disa
         ListOfStringOption("modelsim.init_files.after_load"),
         ListOfStringOption("modelsim.init_files.before_run"),
         StringOption("modelsim.init_file.gui"),
+        BooleanOption("modelsim.keep_design_loaded"),
     ]
 
     @classmethod
@@ -125,10 +128,16 @@ class ModelSimInterface(VsimSimulatorMixin, SimulatorInterface):  # pylint: disa
         Setup library mapping
         """
         mapped_libraries = self._get_mapped_libraries()
+        changed_libraries = {}
 
         for library in project.get_libraries():
             self._libraries.append(library)
-            self.create_library(library.name, library.directory, mapped_libraries)
+            self._create_library_directory(library.directory)
+            if mapped_libraries.get(library.name) != library.directory:
+                changed_libraries[library.name] = library.directory
+
+        # The modelsim.ini file is rewritten once for all changed mappings
+        self._map_libraries(changed_libraries)
 
     def compile_source_file_command(self, source_file):
         """
@@ -202,6 +211,17 @@ class ModelSimInterface(VsimSimulatorMixin, SimulatorInterface):  # pylint: disa
         """
         mapped_libraries = mapped_libraries if mapped_libraries is not None else {}
 
+        self._create_library_directory(path)
+
+        if library_name in mapped_libraries and mapped_libraries[library_name] == path:
+            return
+
+        self._map_libraries({library_name: path})
+
+    def _create_library_directory(self, path):
+        """
+        Create a library directory with vlib unless it exists
+        """
         apath = str(Path(path).parent.resolve())
 
         if not file_exists(apath):
@@ -211,11 +231,16 @@ class ModelSimInterface(VsimSimulatorMixin, SimulatorInterface):  # pylint: disa
             proc = Process([str(Path(self._prefix) / "vlib"), "-unix", path], env=self.get_env())
             proc.consume_output(callback=None)
 
-        if library_name in mapped_libraries and mapped_libraries[library_name] == path:
+    def _map_libraries(self, libraries):
+        """
+        Map the library names to paths in the modelsim.ini file with a single write
+        """
+        if not libraries:
             return
 
         cfg = parse_modelsimini(self._sim_cfg_file_name)
-        cfg.set("Library", library_name, path)
+        for library_name, path in libraries.items():
+            cfg.set("Library", library_name, path)
         write_modelsimini(cfg, self._sim_cfg_file_name)
 
     def _get_mapped_libraries(self):
@@ -368,6 +393,14 @@ proc _vunit_run {} {
 proc _vunit_sim_restart {} {
     restart -f
 }
+
+proc _vunit_checkpoint {file_name} {
+    checkpoint $file_name
+}
+
+proc _vunit_restore {file_name} {
+    restore $file_name
+}
 """
 
     def _vsim_extra_args(self, config):
@@ -393,19 +426,32 @@ proc _vunit_sim_restart {} {
         if args is None:
             args = []
 
-        coverage_files = str(Path(self._output_path) / "coverage_files.txt")
-        vcover_cmd = [str(Path(self._prefix) / "vcover"), "merge", "-inputs"] + [coverage_files] + args + [file_name]
-        with Path(coverage_files).open("w", encoding="utf-8") as fptr:
-            for coverage_file in self._coverage_files:
-                if file_exists(coverage_file):
-                    fptr.write(str(coverage_file) + "\n")
-                else:
-                    LOGGER.warning("Missing coverage file: %s", coverage_file)
+        coverage_files = []
+        for coverage_file in self._coverage_files:
+            if file_exists(coverage_file):
+                coverage_files.append(coverage_file)
+            else:
+                LOGGER.warning("Missing coverage file: %s", coverage_file)
 
         print(f"Merging coverage files into {file_name!s}...")
+        self._coverage_merger.merge(coverage_files, file_name, args)
+        print("Done merging coverage files")
+
+    def _merge_coverage_files(self, file_names, output_file_name, args):
+        """
+        Merge coverage files with vcover
+        """
+        inputs_path = Path(self._output_path) / "coverage_merge"
+        inputs_path.mkdir(parents=True, exist_ok=True)
+        inputs_file_name = str(inputs_path / (Path(output_file_name).name + "_inputs.txt"))
+        with Path(inputs_file_name).open("w", encoding="utf-8") as fptr:
+            for coverage_file in file_names:
+                fptr.write(str(coverage_file) + "\n")
+
+        vcover_cmd = [str(Path(self._prefix) / "vcover"), "merge", "-inputs", inputs_file_name]
+        vcover_cmd += ([] if args is None else args) + [output_file_name]
         vcover_merge_process = Process(vcover_cmd, env=self.get_env())
         vcover_merge_process.consume_output()
-        print("Done merging coverage files")
 
     @staticmethod
     def get_env():
@@ -14,10 +14,21 @@ import logging
 import subprocess
 import shlex
 import re
+import threading
 from sys import stdout  # To avoid output catched in non-verbose mode
 from ..exceptions import CompileError
-from ..ostools import Process
-from . import SimulatorInterface, ListOfStringOption, StringOption
+from ..ostools import Process, read_file, write_file
+from ..hashing import hash_string
+from ..test.suites import encode_dict
+from . import (
+    SimulatorInterface,
+    ListOfStringOption,
+    StringOption,
+    BooleanOption,
+    TOOL_PROBE_CACHE,
+    RUNNER_CFG_FILE_NAME,
+    get_dependency_hash,
+)
 from . import run_command
 from ..vhdl_standard import VHDL
 
@@ -31,6 +42,7 @@ class NVCInterface(SimulatorInterface):  # pylint: disable=too-many-instance-att
 
     name = "nvc"
     executable = environ.get("NVC", "nvc")
+    version_executables = [executable]
     supports_gui_flag = True
     supports_colors_in_gui = True
 
@@ -42,6 +54,7 @@ class NVCInterface(SimulatorInterface):  # pylint: disable=too-many-instance-att
         ListOfStringOption("nvc.sim_flags"),
         ListOfStringOption("nvc.elab_flags"),
         StringOption("nvc.heap_size"),
+        BooleanOption("nvc.reuse_elaboration"),
         StringOption("nvc.gtkwave_script.gui"),
     ]
 
@@ -82,6 +95,10 @@ class NVCInterface(SimulatorInterface):  # pylint: disable=too-many-instance-att
         self._gtkwave_args = gtkwave_args
         self._vhdl_standard = None
         self._coverage_test_dirs = set()
+        self._lock = threading.Lock()
+        self._elaboration_locks = {}
+        self._saved_designs = {}
+        self._dependency_hashes = {}
 
         (major, minor) = self.determine_version(prefix)
         self._supports_jit = major > 1 or (major == 1 and minor >= 9)
@@ -100,7 +117,10 @@ class NVCInterface(SimulatorInterface):  # pylint: disable=too-many-instance-att
         """
         Get the output of 'nvc --version'
         """
-        return subprocess.check_output([str(Path(prefix) / cls.executable), "--version"]).decode()
+        executable = str(Path(prefix) / cls.executable)
+        return TOOL_PROBE_CACHE.get(
+            executable, ["--version"], lambda: subprocess.check_output([executable, "--version"]).decode()
+        )
 
     @classmethod
     def determine_version(cls, prefix):
@@ -206,14 +226,15 @@ class NVCInterface(SimulatorInterface):  # pylint: disable=too-many-instance-att
         """
         Get basic NVC command with global options
         """
+        # Absolute paths since a saved design is run in the output path of the test
         cmd = [
             str(Path(self._prefix) / self.executable),
-            f"--work={worklib}:{workpath!s}",
+            f"--work={worklib}:{Path(workpath).resolve()!s}",
             f"--std={self._std_str(std)}",
         ]
 
         for library in self._project.get_libraries():
-            cmd += [f"--map={library.name}:{library.directory}"]
+            cmd += [f"--map={library.name}:{Path(library.directory).resolve()!s}"]
 
         return cmd
 
@@ -248,32 +269,27 @@ class NVCInterface(SimulatorInterface):  # pylint: disable=too-many-instance-att
         else:
             wave_file = None
 
-        libdir = self._project.get_library(config.library_name).directory
-        cmd = self._get_command(self._vhdl_standard, config.library_name, libdir)
-
-        cmd += ["-H", config.sim_options.get("nvc.heap_size", "64m")]
+        if (
+            not (elaborate_only or self._gui)
+            and "runner_cfg" in config.generics
+            and config.sim_options.get("nvc.reuse_elaboration", False)
+        ):
+            saved = self._get_saved_design(config)
+            if saved is not None:
+                return saved and self._simulate_saved_design(script_path, config)
 
-        cmd += ["-e"]
+        if elaborate_only:
+            # The design saved by the elaboration replaces any design saved for reuse
+            self._forget_saved_design(config)
 
-        cmd += config.sim_options.get("nvc.elab_flags", [])
-        cmd += [f"{config.entity_name}-{config.architecture_name}"]
-
-        for name, value in config.generics.items():
-            cmd += [f"-g{name}={value}"]
+        cmd = self._get_elaborate_command(config, config.generics)
 
         if not elaborate_only:
             cmd += ["--no-save"]
             if self._supports_jit:
                 cmd += ["--jit"]
             cmd += ["-r"]
-            cmd += config.sim_options.get("nvc.sim_flags", [])
-            cmd += [f"--exit-severity={config.vhdl_assert_stop_level}"]
-
-            if config.sim_options.get("disable_ieee_warnings", False):
-                cmd += ["--ieee-warnings=off"]
-
-            if wave_file:
-                cmd += [f"--wave={wave_file}"]
+            cmd += self._get_sim_flags(config, wave_file)
 
         print(" ".join(cmd))
 
@@ -296,3 +312,125 @@ class NVCInterface(SimulatorInterface):  # pylint: disable=too-many-instance-att
             subprocess.call(cmd)
 
         return status
+
+    def _get_elaborate_command(self, config, generics):
+        """
+        Return the command elaborating the test bench with generics
+        """
+        libdir = self._project.get_library(config.library_name).directory
+        cmd = self._get_command(self._vhdl_standard, config.library_name, libdir)
+
+        cmd += ["-H", config.sim_options.get("nvc.heap_size", "64m")]
+
+        cmd += ["-e"]
+
+        cmd += config.sim_options.get("nvc.elab_flags", [])
+        cmd += [f"{config.entity_name}-{config.architecture_name}"]
+
+        for name, value in generics.items():
+            cmd += [f"-g{name}={value}"]
+
+        return cmd
+
+    @staticmethod
+    def _get_sim_flags(config, wave_file):
+        """
+        Return the flags of the run command
+        """
+        flags = list(config.sim_options.get("nvc.sim_flags", []))
+        flags += [f"--exit-severity={config.vhdl_assert_stop_level}"]
+
+        if config.sim_options.get("disable_ieee_warnings", False):
+            flags += ["--ieee-warnings=off"]
+
+        if wave_file:
+            flags += [f"--wave={wave_file}"]
+
+        return flags
+
+    def _simulate_saved_design(self, script_path, config):
+        """
+        Run the saved design of the test bench. The runner_cfg of the test is read
+        by the test bench from a file in the working directory of the simulation
+        """
+        write_file(str(script_path / RUNNER_CFG_FILE_NAME), config.generics["runner_cfg"] + "\n")
+
+        libdir = self._project.get_library(config.library_name).directory
+        cmd = self._get_command(self._vhdl_standard, config.library_name, libdir)
+        cmd += ["-H", config.sim_options.get("nvc.heap_size", "64m")]
+        cmd += ["-r"]
+        cmd += self._get_sim_flags(config, None)
+        cmd += [f"{config.entity_name}-{config.architecture_name}"]
+
+        print(" ".join(cmd))
+
+        try:
+            proc = Process(cmd, cwd=str(script_path))
+            proc.consume_output()
+        except Process.NonZeroExitCode:
+            return False
+        return True
+
+    def _get_saved_design(self, config):
+        """
+        Save the design of the test bench elaborated with the generics and flags of the
+        configuration, except for runner_cfg. Return True when the design is saved,
+        False if the elaboration failed and None when the saved design of the test bench
+        is used by another configuration.
+
+        NVC saves an elaborated design in the library under the name of the top unit, so a
+        test bench has one saved design which is used by the first configuration of the run.
+        The design is elaborated again when the generics, the flags or any file the test
+        bench depends on have changed.
+        """
+        generics = dict(config.generics)
+        generics["runner_cfg"] = encode_dict({"runner_cfg file": RUNNER_CFG_FILE_NAME})
+        cmd = self._get_elaborate_command(config, generics)
+
+        top = f"{config.library_name}.{config.entity_name}-{config.architecture_name}"
+        with self._lock:  # pylint: disable=not-context-manager
+            if top not in self._dependency_hashes:
+                self._dependency_hashes[top] = get_dependency_hash(self._project, config)
+            key = hash_string(repr(cmd) + self._dependency_hashes[top])
+            lock = self._elaboration_locks.setdefault(top, threading.Lock())
+
+        with lock:  # pylint: disable=not-context-manager
+            if top in self._saved_designs:
+                saved_key, saved = self._saved_designs[top]
+                return saved if saved_key == key else None
+
+            key_file = self._get_saved_design_key_file(top)
+            saved = key_file.exists() and read_file(str(key_file)) == key
+            if not saved:
+                if key_file.exists():
+                    remove(str(key_file))
+
+                print(" ".join(cmd))
+                try:
+                    proc = Process(cmd)
+                    proc.consume_output()
+                    write_file(str(key_file), key)
+                    saved = True
+                except Process.NonZeroExitCode:
+                    saved = False
+
+            self._saved_designs[top] = (key, saved)
+            return saved
+
+    def _forget_saved_design(self, config):
+        """
+        Forget the saved design of the test bench
+        """
+        top = f"{config.library_name}.{config.entity_name}-{config.architecture_name}"
+        with self._lock:  # pylint: disable=not-context-manager
+            self._saved_designs.pop(top, None)
+            key_file = self._get_saved_design_key_file(top)
+            if key_file.exists():
+                remove(str(key_file))
+
+    def _get_saved_design_key_file(self, top):
+        """
+        Return the file holding the key of the saved design of a top unit,
+        it is used to detect changes between runs
+        """
+        return Path(self._output_path) / "saved_designs" / top
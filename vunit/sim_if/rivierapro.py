@@ -15,7 +15,7 @@ import logging
 from ..exceptions import CompileError
 from ..ostools import Process, file_exists
 from ..vhdl_standard import VHDL
-from . import SimulatorInterface, ListOfStringOption, StringOption
+from . import SimulatorInterface, ListOfStringOption, StringOption, BooleanOption, TOOL_PROBE_CACHE
 from .vsim_simulator_mixin import VsimSimulatorMixin, fix_path
 
 LOGGER = logging.getLogger(__name__)
@@ -29,6 +29,8 @@ class RivieraProInterface(VsimSimulatorMixin, SimulatorInterface):
     name = "rivierapro"
     supports_gui_flag = True
     package_users_depend_on_bodies = True
+    coverage_file_suffix = ".acdb"
+    version_executables = ["vsim", "vcom", "vlog"]
 
     compile_options = [
         ListOfStringOption("rivierapro.vcom_flags"),
@@ -41,6 +43,7 @@ class RivieraProInterface(VsimSimulatorMixin, SimulatorInterface):
         ListOfStringOption("rivierapro.init_files.after_load"),
         ListOfStringOption("rivierapro.init_files.before_run"),
         StringOption("rivierapro.init_file.gui"),
+        BooleanOption("rivierapro.keep_design_loaded"),
     ]
 
     @classmethod
@@ -75,10 +78,16 @@ class RivieraProInterface(VsimSimulatorMixin, SimulatorInterface):
         """
         Return a VersionConsumer object containing the simulator version.
         """
-        proc = Process([str(Path(cls.find_prefix()) / "vcom"), "-version"], env=cls.get_env())
-        consumer = VersionConsumer()
-        proc.consume_output(consumer)
+        executable = str(Path(cls.find_prefix()) / "vcom")
+
+        def probe():
+            proc = Process([executable, "-version"], env=cls.get_env())
+            consumer = VersionConsumer()
+            proc.consume_output(consumer)
+            return [consumer.year, consumer.month]
 
+        consumer = VersionConsumer()
+        consumer.year, consumer.month = TOOL_PROBE_CACHE.get(executable, ["-version"], probe)
         return consumer
 
     @classmethod
@@ -131,7 +140,10 @@ class RivieraProInterface(VsimSimulatorMixin, SimulatorInterface):
         """
         Add builtin (global) libraries
         """
-        built_in_libraries = self._get_mapped_libraries(self._builtin_library_cfg)
+        # The built in libraries only change with the installation
+        built_in_libraries = TOOL_PROBE_CACHE.get(
+            self._builtin_library_cfg, ["vlist"], lambda: self._get_mapped_libraries(self._builtin_library_cfg)
+        )
 
         for library_name in built_in_libraries:
             # A user might shadow a built in library with their own version
@@ -142,10 +154,16 @@ class RivieraProInterface(VsimSimulatorMixin, SimulatorInterface):
         """
         Setup library mapping
         """
-        mapped_libraries = self._get_mapped_libraries(self._sim_cfg_file_name)
-        for library in project.get_libraries():
+        libraries = project.get_libraries()
+        for library in libraries:
             self._libraries.append(library)
-            self.create_library(library.name, library.directory, mapped_libraries)
+            self._create_library_directory(library.name, library.directory)
+
+        # vlib maps the libraries it creates, only changed mappings remain for vmap
+        mapped_libraries = self._read_library_cfg()
+        for library in libraries:
+            if mapped_libraries.get(library.name) != str(Path(library.directory).resolve()):
+                self._map_library(library.name, library.directory)
 
     def compile_source_file_command(self, source_file):
         """
@@ -224,6 +242,17 @@ class RivieraProInterface(VsimSimulatorMixin, SimulatorInterface):
         """
         mapped_libraries = mapped_libraries if mapped_libraries is not None else {}
 
+        self._create_library_directory(library_name, path)
+
+        if library_name in mapped_libraries and mapped_libraries[library_name] == path:
+            return
+
+        self._map_library(library_name, path)
+
+    def _create_library_directory(self, library_name, path):
+        """
+        Create a library with vlib unless its directory exists
+        """
         apath = str(Path(path).parent.resolve())
 
         if not file_exists(apath):
@@ -237,9 +266,10 @@ class RivieraProInterface(VsimSimulatorMixin, SimulatorInterface):
             )
             proc.consume_output(callback=None)
 
-        if library_name in mapped_libraries and mapped_libraries[library_name] == path:
-            return
-
+    def _map_library(self, library_name, path):
+        """
+        Map library_name to path with vmap
+        """
         proc = Process(
             [str(Path(self._prefix) / "vmap"), library_name, path],
             cwd=str(Path(self._sim_cfg_file_name).parent),
@@ -262,6 +292,25 @@ class RivieraProInterface(VsimSimulatorMixin, SimulatorInterface):
         return str(Path(self._prefix).parent / "vlib" / "library.cfg")
 
     _library_re = re.compile(r"([a-zA-Z_0-9]+)\s=\s(.*)")
+    _library_cfg_re = re.compile(r'([a-zA-Z_0-9]+)\s*=\s*"?([^"]*)"?')
+
+    def _read_library_cfg(self):
+        """
+        Get the libraries mapped by the library.cfg file itself, without the included
+        built in libraries, by reading the file instead of running vlist
+        """
+        with Path(self._sim_cfg_file_name).open("r", encoding="utf-8") as fptr:
+            text = fptr.read()
+
+        libraries = {}
+        for line in text.splitlines():
+            match = self._library_cfg_re.match(line.strip())
+            if match is None:
+                continue
+            key = match.group(1)
+            value = match.group(2)
+            libraries[key] = str((Path(self._sim_cfg_file_name).parent / (Path(value).parent)).resolve())
+        return libraries
 
     def _get_mapped_libraries(self, library_cfg_file):
         """
@@ -387,6 +436,14 @@ proc _vunit_run {} {
 proc _vunit_sim_restart {} {
     restart
 }
+
+proc _vunit_checkpoint {file_name} {
+    checkpoint $file_name
+}
+
+proc _vunit_restore {file_name} {
+    restore $file_name
+}
 """
 
     def merge_coverage(self, file_name, args=None):
@@ -398,22 +455,36 @@ proc _vunit_sim_restart {} {
             # Teardown to ensure acdb file was written.
             self._persistent_shell.teardown()
 
-        merge_command = "acdb merge"
-
+        coverage_files = []
         for coverage_file in self._coverage_files:
             if file_exists(coverage_file):
-                cfile = coverage_file.replace("\\", "/")
-                merge_command += f" -i {{{cfile}}}"
+                coverage_files.append(coverage_file)
             else:
                 LOGGER.warning("Missing coverage file: %s", coverage_file)
 
+        print(f"Merging coverage files into {file_name!s}...")
+        self._coverage_merger.merge(coverage_files, file_name, args)
+        print("Done merging coverage files")
+
+    def _merge_coverage_files(self, file_names, output_file_name, args):
+        """
+        Merge coverage files with acdb merge
+        """
+        merge_command = "acdb merge"
+
+        for coverage_file in file_names:
+            cfile = coverage_file.replace("\\", "/")
+            merge_command += f" -i {{{cfile}}}"
+
         if args is not None:
             merge_command += " " + " ".join(f"{{{arg!s}}}" for arg in args)
 
-        fname = file_name.replace("\\", "/")
+        fname = output_file_name.replace("\\", "/")
         merge_command += f" -o {{{fname}}}"
 
-        merge_script_name = Path(self._output_path) / "acdb_merge.tcl"
+        merge_script_path = Path(self._output_path) / "coverage_merge"
+        merge_script_path.mkdir(parents=True, exist_ok=True)
+        merge_script_name = merge_script_path / (Path(output_file_name).name + "_merge.tcl")
         with merge_script_name.open("w", encoding="utf-8") as fptr:
             fptr.write(merge_command + "\n")
 
@@ -425,10 +496,8 @@ proc _vunit_sim_restart {} {
             f"source {{{mscript}}}; quit;",
         ]
 
-        print(f"Merging coverage files into {file_name!s}...")
         vcover_merge_process = Process(vcover_cmd, env=self.get_env())
         vcover_merge_process.consume_output()
-        print("Done merging coverage files")
 
 
 def format_generic(value):
@@ -11,9 +11,10 @@ and RivieraPRO
 
 import sys
 import os
+import threading
 from pathlib import Path
 from ..ostools import write_file, Process
-from ..test.suites import get_result_file_name
+from ..test.suites import get_result_file_name, encode_dict
 from ..persistent_tcl_shell import PersistentTclShell
 
 
@@ -50,6 +51,25 @@ class VsimSimulatorMixin(object):
         else:
             self._persistent_shell = None
 
+        # The design kept loaded in the persistent shell of each thread
+        self._loaded_design = threading.local()
+
+    def start_simulator_processes(self, num_processes):
+        """
+        Start the persistent vsim processes in the background
+        """
+        if self._persistent_shell is not None:
+            self._persistent_shell.start(num_processes)
+
+    def teardown(self):
+        """
+        Stop the persistent vsim processes including those being started in the background
+        """
+        if self._persistent_shell is not None:
+            self._persistent_shell.teardown()
+        # The designs were unloaded with the processes
+        self._loaded_design = threading.local()
+
     @staticmethod
     def _create_restart_function():
         """ "
@@ -145,11 +165,21 @@ proc vunit_help {} {
 }
 
 proc vunit_run {} {
+    global vunit_checkpoint_file vunit_checkpoint_saved
+
     if {[catch {_vunit_run} failed_or_err]} {
         echo $failed_or_err
         return true;
     }
 
+    if {[is_checkpoint_requested]} {
+        if {[catch {_vunit_checkpoint $vunit_checkpoint_file; run -all} failed_or_err]} {
+            echo $failed_or_err
+            return true;
+        }
+        set vunit_checkpoint_saved true
+    }
+
     if {![is_test_suite_done]} {
         echo
         echo "Test Run Failed!"
@@ -161,11 +191,25 @@ proc vunit_run {} {
     return false;
 }
 
+proc vunit_restore_checkpoint {} {
+    global vunit_checkpoint_file
+
+    if {[catch {_vunit_restore $vunit_checkpoint_file} error_msg]} {
+        echo $error_msg
+        return true;
+    }
+
+    return false;
+}
+
 """
+        tcl += f"set vunit_checkpoint_file {{{fix_path(str(self._get_checkpoint_path() / 'checkpoint.cpt'))!s}}}\n"
+        tcl += "set vunit_checkpoint_saved false\n"
         tcl += self._create_init_files_after_load(config)
         tcl += self._create_init_files_before_run(config)
         tcl += self._create_load_function(test_suite_name, config, script_path)
         tcl += get_is_test_suite_done_tcl(get_result_file_name(output_path))
+        tcl += get_is_checkpoint_requested_tcl(get_result_file_name(output_path))
         tcl += self._create_run_function()
         tcl += self._create_restart_function()
         return tcl
@@ -284,31 +328,143 @@ proc vunit_run {} {
             return False
         return True
 
-    def _run_persistent(self, common_file_name, load_only=False):
+    def _run_persistent(self, common_file_name, load_only=False, config=None, checkpoint=False):
         """
-        Run a test bench using the persistent vsim process
+        Run a test bench using the persistent vsim process.
+        With a config the design is kept loaded after the run and
+        restarted instead of loaded again by the next run of the same design.
+        With checkpoint the run is restored from the checkpoint saved by a
+        previous run of the loaded design if there is one
         """
+        keep_loaded = config is not None
         try:
             self._persistent_shell.execute(f'source "{fix_path(common_file_name)!s}"')
-            self._persistent_shell.execute("set failed [vunit_load]")
-            if self._persistent_shell.read_bool("failed"):
-                return False
+
+            restored = checkpoint and self._restore_checkpoint(config)
+            if not restored:
+                self._loaded_design.has_checkpoint = False
+
+            if not (restored or (keep_loaded and self._restart_loaded_design(config))):
+                self._loaded_design.key = None
+                if keep_loaded:
+                    self._persistent_shell.execute("catch {quit -sim}")
+                self._persistent_shell.execute("set failed [vunit_load]")
+                if self._persistent_shell.read_bool("failed"):
+                    return False
 
             run_ok = True
             if not load_only:
                 self._persistent_shell.execute("set failed [vunit_run]")
                 run_ok = not self._persistent_shell.read_bool("failed")
-            self._persistent_shell.execute("quit -sim")
+
+            if keep_loaded:
+                self._loaded_design.key = _get_load_key(config)
+                self._loaded_design.runner_cfg_length = len(config.generics["runner_cfg"])
+                if checkpoint and not restored:
+                    self._loaded_design.has_checkpoint = self._persistent_shell.read_bool("vunit_checkpoint_saved")
+            else:
+                self._persistent_shell.execute("quit -sim")
             return run_ok
         except Process.NonZeroExitCode:
+            self._loaded_design.key = None
+            self._loaded_design.has_checkpoint = False
+            return False
+
+    def _restore_checkpoint(self, config):
+        """
+        Restore the checkpoint saved by a previous run of the loaded design.
+        Returns False when there is no such checkpoint or it could not be restored
+        """
+        if not getattr(self._loaded_design, "has_checkpoint", False):
+            return False
+
+        if self._loaded_design.key != _get_load_key(config):
             return False
 
+        self._persistent_shell.execute("set failed [vunit_restore_checkpoint]")
+        return not self._persistent_shell.read_bool("failed")
+
+    def _restart_loaded_design(self, config):
+        """
+        Restart the design loaded by a previous run and update the runner_cfg generic.
+        Returns False when the design must be loaded again
+        """
+        if getattr(self._loaded_design, "key", None) != _get_load_key(config):
+            return False
+
+        runner_cfg = config.generics["runner_cfg"]
+        if len(runner_cfg) != self._loaded_design.runner_cfg_length:
+            return False
+
+        self._persistent_shell.execute(
+            f"if {{[catch {{_vunit_sim_restart; "
+            f'change /{config.entity_name!s}/runner_cfg {{"{runner_cfg!s}"}}}}]}} '
+            "{set failed true} else {set failed false}"
+        )
+        return not self._persistent_shell.read_bool("failed")
+
+    def _keeps_design_loaded(self, config, elaborate_only):
+        """
+        Returns True if the design shall be kept loaded in the persistent shell between runs
+        """
+        if self._persistent_shell is None or self._gui or elaborate_only:
+            return False
+
+        if not (
+            config.sim_options.get(self.name + ".keep_design_loaded", False)
+            or config.sim_options.get("enable_checkpoint", False)
+        ):
+            return False
+
+        # Each run saves coverage to its own file when the design is unloaded
+        if config.sim_options.get("enable_coverage", False):
+            return False
+
+        runner_cfg = config.generics.get("runner_cfg", None)
+        return runner_cfg is not None and not any(char in runner_cfg for char in '{}[]"\\$')
+
+    def _pad_runner_cfg(self, config):
+        """
+        Pad the runner_cfg generic with trailing spaces, which are ignored by the
+        VHDL runner, to the length of the runner_cfg of the loaded design since
+        the value of a string generic can only be changed to one of the same length
+        """
+        runner_cfg = config.generics["runner_cfg"]
+        length = getattr(self._loaded_design, "runner_cfg_length", 0)
+        if getattr(self._loaded_design, "key", None) != _get_load_key(config) or len(runner_cfg) > length:
+            length = -(-len(runner_cfg) // RUNNER_CFG_LENGTH_QUANTUM) * RUNNER_CFG_LENGTH_QUANTUM
+        config.generics["runner_cfg"] = runner_cfg.ljust(length)
+
+    def _get_checkpoint_path(self):
+        """
+        Return the directory of the checkpoint of the current thread. A checkpoint
+        can only be restored by the vsim process which saved it
+        """
+        return Path(self._sim_cfg_file_name).parent / "checkpoints" / str(threading.get_ident())
+
+    def _add_checkpoint_path(self, config):
+        """
+        Add the checkpoint path to the runner_cfg generic and write the runner_cfg
+        read by the test bench when it continues from test_runner_checkpoint
+        """
+        checkpoint_path = str(self._get_checkpoint_path()).replace("\\", "/") + "/"
+        runner_cfg = config.generics["runner_cfg"] + "," + encode_dict({"checkpoint path": checkpoint_path})
+        config.generics["runner_cfg"] = runner_cfg
+        write_file(str(self._get_checkpoint_path() / "runner_cfg"), runner_cfg + "\n")
+
     def simulate(self, output_path, test_suite_name, config, elaborate_only):
         """
         Run a test bench
         """
         script_path = Path(output_path) / self.name
 
+        keep_loaded = self._keeps_design_loaded(config, elaborate_only)
+        checkpoint = keep_loaded and config.sim_options.get("enable_checkpoint", False)
+        if checkpoint:
+            self._add_checkpoint_path(config)
+        if keep_loaded:
+            self._pad_runner_cfg(config)
+
         common_file_name = script_path / "common.do"
         gui_file_name = script_path / "gui.do"
         batch_file_name = script_path / "batch.do"
@@ -327,9 +483,33 @@ proc vunit_run {} {
             return self._run_batch_file(str(gui_file_name), gui=True)
 
         if self._persistent_shell is not None:
-            return self._run_persistent(str(common_file_name), load_only=elaborate_only)
+            return self._run_persistent(
+                str(common_file_name),
+                load_only=elaborate_only,
+                config=config if keep_loaded else None,
+                checkpoint=checkpoint,
+            )
+
+        status = self._run_batch_file(str(batch_file_name))
+        if config.sim_options.get("enable_coverage", False) and not elaborate_only:
+            # The coverage file is complete when vsim has exited, a persistent
+            # vsim process only writes it when the design is unloaded
+            self._coverage_merger.add(str(Path(output_path) / f"coverage{self.coverage_file_suffix!s}"))
+        return status
 
-        return self._run_batch_file(str(batch_file_name))
+
+# The runner_cfg generic of a design kept loaded is padded to a multiple of this length
+RUNNER_CFG_LENGTH_QUANTUM = 256
+
+
+def _get_load_key(config):
+    """
+    Return a key which is equal for configurations that load the same design
+    with the same generics except for runner_cfg
+    """
+    generics = sorted((name, str(value)) for name, value in config.generics.items() if name != "runner_cfg")
+    sim_options = sorted((name, repr(value)) for name, value in config.sim_options.items())
+    return repr((config.library_name, config.entity_name, config.architecture_name, generics, sim_options))
 
 
 def fix_path(path):
@@ -359,3 +539,19 @@ proc is_test_suite_done {{}} {{
     return false;
 }}
 """
+
+
+def get_is_checkpoint_requested_tcl(vunit_result_file):
+    """
+    Returns tcl procedure to detect if the simulation stopped to save a checkpoint
+    The test bench requests a checkpoint by writing checkpoint as the last line of the results file
+    """
+    return f"""
+proc is_checkpoint_requested {{}} {{
+    set fd [open "{fix_path(vunit_result_file)!s}" "r"]
+    set contents [read $fd]
+    close $fd
+    set lines [split [string trim $contents] "\n"]
+    return [expr {{[lindex $lines end] == "checkpoint"}}]
+}}
+"""
@@ -24,7 +24,7 @@ from vunit.library import Library
 LOGGER = logging.getLogger(__name__)
 
 
-class SourceFile(object):
+class SourceFile(object):  # pylint: disable=too-many-instance-attributes
     """
     Represents a generic source file
     """
@@ -36,6 +36,8 @@ class SourceFile(object):
         self.design_units = []
         self._content_hash = None
         self._compile_options = {}
+        # The hash of the contents and compile options, computed when first needed
+        self._full_content_hash = None
 
         # The file name before preprocessing
         self.original_name = name
@@ -76,6 +78,7 @@ class SourceFile(object):
         """
         SIMULATOR_FACTORY.check_compile_option(name, value)
         self._compile_options[name] = copy(value)
+        self._full_content_hash = None
 
     def add_compile_option(self, name, value):
         """
@@ -87,6 +90,7 @@ class SourceFile(object):
             self._compile_options[name] = copy(value)
         else:
             self._compile_options[name] += value
+        self._full_content_hash = None
 
     @property
     def compile_options(self):
@@ -99,7 +103,9 @@ class SourceFile(object):
         SIMULATOR_FACTORY.check_compile_option_name(name)
 
         if name not in self._compile_options:
+            # The new option changes the hash of the compile options
             self._compile_options[name] = []
+            self._full_content_hash = None
 
         return copy(self._compile_options[name])
 
@@ -113,11 +119,26 @@ class SourceFile(object):
 
     @property
     def content_hash(self):
+        """
+        Hash of contents and compile options, computed again only when the compile options changed
+        """
+        if self._full_content_hash is None:
+            self._full_content_hash = self._compute_content_hash()
+        return self._full_content_hash
+
+    def _compute_content_hash(self):
         """
         Compute hash of contents and compile options
         """
         return hash_string(self._content_hash + self._compile_options_hash())
 
+    def get_snapshot(self):
+        """
+        Return the snapshot of the file, the parse result and the content hash, and the files it depends on.
+        Files which are not parsed only depend on their own contents
+        """
+        return (None, self._content_hash), [self.name]
+
 
 class VerilogSourceFile(SourceFile):
     """
@@ -134,12 +155,24 @@ class VerilogSourceFile(SourceFile):
         include_dirs=None,
         defines=None,
         no_parse=False,
+        snapshot=None,
     ):
+        """
+        :param snapshot: The snapshot of the unchanged file from a previous run, the file is not read when given
+        """
         SourceFile.__init__(self, str(name), library, file_type)
         self.package_dependencies = []
         self.module_dependencies = []
         self.include_dirs = include_dirs if include_dirs is not None else []
         self.defines = defines.copy() if defines is not None else {}
+        self._design_file = None
+
+        if snapshot is not None:
+            design_file, self._content_hash = snapshot
+            if design_file is not None:
+                self._add_design_file(design_file)
+            return
+
         self._content_hash = file_content_hash(self.name, encoding=HDL_FILE_ENCODING, database=database)
 
         for path in self.include_dirs:
@@ -168,20 +201,7 @@ class VerilogSourceFile(SourceFile):
                     )
                 )
 
-            for module in design_file.modules:
-                self.design_units.append(Module(module.name, self, module.parameters))
-
-            for package in design_file.packages:
-                self.design_units.append(DesignUnit(package.name, self, "package"))
-
-            for package_name in design_file.imports:
-                self.package_dependencies.append(package_name)
-
-            for package_name in design_file.package_references:
-                self.package_dependencies.append(package_name)
-
-            for instance_name in design_file.instances:
-                self.module_dependencies.append(instance_name)
+            self._add_design_file(design_file)
 
         except KeyboardInterrupt as exk:
             raise KeyboardInterrupt from exk
@@ -189,6 +209,37 @@ class VerilogSourceFile(SourceFile):
             traceback.print_exc()
             LOGGER.error("Failed to parse %s", self.name)
 
+    def _add_design_file(self, design_file):
+        """
+        Add the design units and dependencies of the parsed design file
+        """
+        for module in design_file.modules:
+            self.design_units.append(Module(module.name, self, module.parameters))
+
+        for package in design_file.packages:
+            self.design_units.append(DesignUnit(package.name, self, "package"))
+
+        for package_name in design_file.imports:
+            self.package_dependencies.append(package_name)
+
+        for package_name in design_file.package_references:
+            self.package_dependencies.append(package_name)
+
+        for instance_name in design_file.instances:
+            self.module_dependencies.append(instance_name)
+
+        self._design_file = design_file
+
+    def get_snapshot(self):
+        """
+        Return the snapshot of the file, the parse result and the content hash, and the files it depends on.
+        The directories of the include paths are included to detect new files shadowing the included files.
+        """
+        file_names = [self.name]
+        if self._design_file is not None:
+            file_names += self._design_file.included_files + [str(Path(self.name).parent)] + self.include_dirs
+        return (self._design_file, self._content_hash), file_names
+
     def add_to_library(self, library):
         """
         Add design units to the library
@@ -210,11 +261,22 @@ class VHDLSourceFile(SourceFile):
         database,
         vhdl_standard: VHDLStandard,
         no_parse=False,
+        snapshot=None,
     ):
+        """
+        :param snapshot: The snapshot of the unchanged file from a previous run, the file is not read when given
+        """
         SourceFile.__init__(self, str(name), library, "vhdl")
         self.dependencies = []  # type: ignore
         self.depending_components = []  # type: ignore
         self._vhdl_standard = vhdl_standard
+        self._design_file = None
+
+        if snapshot is not None:
+            design_file, self._content_hash = snapshot
+            if design_file is not None:
+                self._add_design_file(design_file)
+            return
 
         if not no_parse:
             try:
@@ -242,6 +304,7 @@ class VHDLSourceFile(SourceFile):
         self.design_units = self._find_design_units(design_file)
         self.dependencies = self._find_dependencies(design_file)
         self.depending_components = design_file.component_instantiations
+        self._design_file = design_file
 
         for design_unit in self.design_units:
             if design_unit.is_primary:
@@ -269,6 +332,12 @@ class VHDLSourceFile(SourceFile):
         else:
             LOGGER.debug("The file '%s' has no components", self.name)
 
+    def get_snapshot(self):
+        """
+        Return the snapshot of the file, the parse result and the content hash, and the files it depends on
+        """
+        return (self._design_file, self._content_hash), [self.name]
+
     def _find_dependencies(self, design_file):
         """
         Return a list of dependencies of this source_file based on the
@@ -324,8 +393,7 @@ class VHDLSourceFile(SourceFile):
 
         return result
 
-    @property
-    def content_hash(self):
+    def _compute_content_hash(self):
         """
         Compute hash of contents and compile options
         """
@@ -21,7 +21,13 @@ from ..parsing.encodings import HDL_FILE_ENCODING
 from ..source_file import file_type_of, VERILOG_FILE_TYPES
 from ..configuration import Configuration, ConfigurationVisitor, DEFAULT_NAME
 from .list import TestList
-from .suites import IndependentSimTestCase, SameSimTestSuite
+from .suites import (
+    IndependentSimTestCase,
+    SameSimTestSuite,
+    get_independent_test_name,
+    get_same_sim_test_name,
+    get_test_suite_name,
+)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -129,6 +135,38 @@ class TestBench(ConfigurationVisitor):
                 )
         return test_list
 
+    def get_test_runs(self):
+        """
+        Return the tests of each simulation run of this test bench as lists of the
+        full test name, the test information and the configuration.
+        Unlike create_tests no test suites are created.
+        """
+        self._check_architectures(self.design_unit)
+
+        if self._individual_tests:
+            test_runs = []
+            for test_case in self._test_cases:
+                test_runs += test_case.get_test_runs()
+            return test_runs
+
+        if self._implicit_test:
+            test = self._implicit_test
+            return [
+                [(get_independent_test_name(test, config), test, config)]
+                for config in self._get_configurations_to_run()
+            ]
+
+        test_runs = []
+        for config in self._get_configurations_to_run():
+            test_suite_name = get_test_suite_name(config)
+            test_runs.append(
+                [
+                    (get_same_sim_test_name(test_suite_name, test_case.test), test_case.test, config)
+                    for test_case in self._test_cases
+                ]
+            )
+        return test_runs
+
     @property
     def test_case_names(self):
         return [test.name for test in self._test_cases]
@@ -388,6 +426,16 @@ class TestConfigurationVisitor(ConfigurationVisitor):
                 )
             )
 
+    def get_test_runs(self):
+        """
+        Return the test of each simulation run of this test case as lists of the
+        full test name, the test information and the configuration
+        """
+        return [
+            [(get_independent_test_name(self._test, config), self._test, config)]
+            for config in self._get_configurations_to_run()
+        ]
+
 
 _RE_VHDL_TEST_CASE = re.compile(r'(\s|\()+run\s*\(\s*"(?P<name>.*?)"\s*\)', re.IGNORECASE)
 _RE_VERILOG_TEST_CASE = re.compile(r'`TEST_CASE\s*\(\s*"(?P<name>.*?)"\s*\)')
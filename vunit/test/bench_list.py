@@ -69,6 +69,16 @@ class TestBenchList(object):
             test_bench.create_tests(simulator_if, elaborate_only, test_list)
         return test_list
 
+    def get_test_runs(self):
+        """
+        Return the tests of each simulation run of the test benches as lists of the
+        full test name, the test information and the configuration
+        """
+        test_runs = []
+        for test_bench in self.get_test_benches():
+            test_runs += test_bench.get_test_runs()
+        return test_runs
+
     def warn_when_empty(self):
         """
         Log a warning when there are no test benches
@@ -0,0 +1,386 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2023, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Distribute the execution of test suites to workers on other machines
+
+A coordinator owns the test scheduler and listens on a TCP port. Workers run
+the same run script, compile the project with their local simulator and
+connect to the coordinator to pull test suites one at a time. The status,
+timing and compressed output of each test suite is sent back to the
+coordinator which adds them to its test report. The test suite of a worker
+which disconnects is handed out to another worker and only fails when no
+other worker is connected.
+
+The protocol is newline separated JSON messages:
+
+- worker -> coordinator ``{"type": "next"}``
+- coordinator -> worker ``{"type": "run", "name": <test suite name>}`` or ``{"type": "done"}``
+- worker -> coordinator ``{"type": "result", "name": ..., "results": {<test name>: {"status": ..., "time": ...}},
+  "output": <base64 encoded zlib compressed output>}``
+"""
+
+import base64
+import json
+import logging
+import socket
+import threading
+import time
+import zlib
+from .. import ostools
+from .report import TestReport, PASSED, FAILED, TIMED_OUT, SKIPPED
+from .runner import TestRunner
+
+LOGGER = logging.getLogger(__name__)
+
+STATUSES = {status.name: status for status in (PASSED, FAILED, TIMED_OUT, SKIPPED)}
+
+
+class Coordinator(TestRunner):
+    """
+    A test runner which hands out test suites to remote workers instead of
+    running them locally
+    """
+
+    def __init__(self, report, output_path, address, **kwargs):
+        TestRunner.__init__(self, report, output_path, **kwargs)
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind(parse_address(address, default_host=""))
+        self._server.listen()
+        self._server.settimeout(0.1)
+        self._connections = []
+
+    @property
+    def address(self):
+        """
+        The (host, port) tuple the coordinator is listening on
+        """
+        return self._server.getsockname()[:2]
+
+    def run(self, test_suites):
+        try:
+            TestRunner.run(self, test_suites)
+        finally:
+            for connection in self._connections:
+                connection.close()
+            self._server.close()
+
+    def _run_workers(self, threads, write_stdout, scheduler, num_tests):
+        """
+        Serve each connecting worker in a separate thread until all tests are done
+        """
+        while not scheduler.is_finished():
+            ostools.PROGRAM_STATUS.check_for_shutdown()
+            if self._abort:
+                raise KeyboardInterrupt
+
+            try:
+                sock, address = self._server.accept()
+            except socket.timeout:
+                continue
+
+            LOGGER.debug("Coordinator: Worker connected from %s:%i", *address[:2])
+            connection = _Connection(sock)
+            self._connections.append(connection)
+            new_thread = threading.Thread(
+                target=self._serve_worker,
+                args=(connection, write_stdout, scheduler, num_tests),
+            )
+            threads.append(new_thread)
+            new_thread.start()
+
+    def _serve_worker(self, connection, write_stdout, scheduler, num_tests):
+        """
+        Hand out test suites to a single worker
+        """
+        self._local.connection = connection
+        self._local.scheduler = _WorkerScheduler(scheduler, connection)
+        try:
+            self._run_thread(write_stdout, self._local.scheduler, num_tests, False)
+            if connection.is_alive:
+                connection.send({"type": "done"})
+        except ConnectionError:
+            pass
+        finally:
+            connection.close()
+
+    def _run_test_suite(  # pylint: disable=too-many-arguments
+        self, test_suite, write_stdout, num_tests, output_path, output_file_name
+    ):
+        connection = self._local.connection
+        try:
+            connection.send({"type": "run", "name": test_suite.name})
+            message = connection.receive()
+        except ConnectionError as exc:
+            connection.close()
+            if not self._has_other_workers(connection):
+                message = {"error": f"Lost connection to the last worker: {exc!s}"}
+            else:
+                with self._stdout_lock():
+                    print(f"Lost connection to worker while running {test_suite.name!s}, rescheduling")
+                self._local.scheduler.reschedule(test_suite)
+                raise
+
+        self._local.remote_times = {}
+        TestRunner._run_test_suite(
+            self,
+            _RemoteTestSuite(test_suite, message, self._local.remote_times),
+            write_stdout,
+            num_tests,
+            output_path,
+            output_file_name,
+        )
+
+    def _has_other_workers(self, connection):
+        """
+        Return True if any other worker is still connected
+        """
+        return any(other.is_alive for other in self._connections if other is not connection)
+
+    def _get_timeout(self, test_suite):
+        """
+        Timeouts are enforced by the workers
+        """
+        return None
+
+    def _add_results(self, test_suite, results, start_time, num_tests, output_file_name):
+        """
+        Add results to test report using the time measured by the worker
+        """
+        remote_times = self._local.remote_times
+        if not remote_times:
+            TestRunner._add_results(self, test_suite, results, start_time, num_tests, output_file_name)
+            return
+
+        for test_name in test_suite.test_names:
+            self._report.add_result(test_name, results[test_name], remote_times.get(test_name, 0.0), output_file_name)
+            self._report.print_latest_status(total_tests=num_tests)
+        print()
+
+
+class _WorkerScheduler(object):
+    """
+    Only take a test suite from the scheduler once the worker asks for one
+    """
+
+    def __init__(self, scheduler, connection):
+        self._scheduler = scheduler
+        self._connection = connection
+        self._rescheduled = None
+
+    def next(self):
+        """
+        Return the next test once the worker is ready for it
+        """
+        try:
+            self._connection.receive()
+        except ConnectionError as exc:
+            raise StopIteration from exc
+
+        while True:
+            try:
+                return self._scheduler.next()
+            except StopIteration:
+                # The test of another worker may be rescheduled until all tests are done
+                if self._scheduler.is_finished():
+                    raise
+                time.sleep(0.05)
+
+    def reschedule(self, test):
+        """
+        Hand out the test to another worker once the runner is done with it
+        """
+        self._rescheduled = test
+
+    def test_done(self, test):
+        if test is self._rescheduled:
+            self._rescheduled = None
+            self._scheduler.reschedule(test)
+        else:
+            self._scheduler.test_done(test)
+
+
+class _RemoteTestSuite(object):
+    """
+    Wraps a test suite such that running it returns the result of a remote worker
+    """
+
+    def __init__(self, test_suite, message, remote_times):
+        self._test_suite = test_suite
+        self._message = message
+        self._remote_times = remote_times
+
+    @property
+    def name(self):
+        return self._test_suite.name
+
+    @property
+    def test_names(self):
+        return self._test_suite.test_names
+
+    def run(self, output_path, read_output):  # pylint: disable=unused-argument
+        """
+        Print the output of the remote worker and return the test results
+        """
+        results = {name: FAILED for name in self.test_names}
+        message = self._message
+
+        if "output" in message:
+            print(decompress(message["output"]), end="")
+
+        if "error" in message:
+            print(f"Worker failed to run {self.name!s}: {message['error']!s}")
+            return results
+
+        for name, result in message["results"].items():
+            if name in results:
+                results[name] = STATUSES[result["status"]]
+                self._remote_times[name] = result["time"]
+
+        return results
+
+
+class Worker(object):
+    """
+    Pull test suites from a coordinator and run them locally
+    """
+
+    def __init__(self, address, test_suites, create_runner, connect_timeout=30.0):
+        """
+        :param address: The HOST:PORT of the coordinator
+        :param test_suites: The test suites of the local project
+        :param create_runner: Callable creating a :class:`.TestRunner` given a :class:`.TestReport`
+        :param connect_timeout: Seconds to keep retrying to connect to the coordinator
+        """
+        self._address = parse_address(address)
+        self._test_suites = {test_suite.name: test_suite for test_suite in test_suites}
+        self._create_runner = create_runner
+        self._connect_timeout = connect_timeout
+
+    def run(self):
+        """
+        Run test suites until the coordinator has no more work
+        """
+        connection = _Connection(self._connect())
+        try:
+            while True:
+                connection.send({"type": "next"})
+                message = connection.receive()
+
+                if message["type"] == "done":
+                    return
+
+                connection.send(self._run_test_suite(message["name"]))
+        finally:
+            connection.close()
+
+    def _connect(self):
+        """
+        Connect to the coordinator retrying until it has been started
+        """
+        deadline = ostools.get_time() + self._connect_timeout
+        while True:
+            ostools.PROGRAM_STATUS.check_for_shutdown()
+            try:
+                return socket.create_connection(self._address)
+            except ConnectionRefusedError:
+                if ostools.get_time() > deadline:
+                    raise
+                time.sleep(0.5)
+
+    def _run_test_suite(self, name):
+        """
+        Run a single test suite and return the result message
+        """
+        if name not in self._test_suites:
+            return {"type": "result", "name": name, "error": "Unknown test suite on worker"}
+
+        test_suite = self._test_suites[name]
+        report = TestReport()
+        self._create_runner(report).run([test_suite])
+
+        output = ""
+        results = {}
+        for test_name in test_suite.test_names:
+            result = report.result_of(test_name)
+            output = result.output
+            results[test_name] = {"status": result.to_dict()["status"], "time": result.time}
+
+        return {"type": "result", "name": name, "results": results, "output": compress(output)}
+
+
+class _Connection(object):
+    """
+    Newline separated JSON messages over a socket
+    """
+
+    def __init__(self, sock):
+        self._socket = sock
+        self._file = sock.makefile("rwb")
+        self._is_alive = True
+
+    @property
+    def is_alive(self):
+        return self._is_alive
+
+    def send(self, message):
+        """
+        Send a message
+        """
+        try:
+            self._file.write(json.dumps(message).encode("utf-8") + b"\n")
+            self._file.flush()
+        except OSError as exc:
+            self._is_alive = False
+            raise ConnectionError(str(exc)) from exc
+
+    def receive(self):
+        """
+        Receive the next message
+        """
+        try:
+            line = self._file.readline()
+        except OSError as exc:
+            self._is_alive = False
+            raise ConnectionError(str(exc)) from exc
+
+        if not line:
+            self._is_alive = False
+            raise ConnectionError("Connection closed by peer")
+
+        return json.loads(line.decode("utf-8"))
+
+    def close(self):
+        """
+        Close the connection, unblocking any thread waiting to receive
+        """
+        self._is_alive = False
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        for obj in (self._file, self._socket):
+            try:
+                obj.close()
+            except OSError:
+                pass
+
+
+def parse_address(address, default_host="localhost"):
+    """
+    Parse [HOST:]PORT into a (host, port) tuple
+    """
+    host, _, port = str(address).rpartition(":")
+    return (host if host else default_host, int(port))
+
+
+def compress(text):
+    return base64.b64encode(zlib.compress(text.encode("utf-8"))).decode("ascii")
+
+
+def decompress(data):
+    return zlib.decompress(base64.b64decode(data)).decode("utf-8")
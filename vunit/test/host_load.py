@@ -0,0 +1,140 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Copyright (c) 2014-2023, Lars Asplund lars.anders.asplund@gmail.com
+
+"""
+Limit the number of concurrently running tests based on host CPU and memory pressure
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from .. import ostools
+
+LOGGER = logging.getLogger(__name__)
+
+
+class HostLoadLimit(object):
+    """
+    Decides if another test may be started given the current host load
+
+    A test is started when there is an idle CPU, taking the load from
+    other processes into account, and when the available memory minus
+    the peak memory the test used in a previous run leaves a reserve.
+    At least one test is always allowed to run.
+    """
+
+    # Fraction of total memory to keep available
+    MEMORY_RESERVE = 0.1
+
+    # Minimum number of seconds between reading the host load
+    SAMPLE_INTERVAL = 0.25
+
+    def __init__(self, num_cpus, memory_estimates=None):
+        self._num_cpus = num_cpus
+        self._memory_estimates = {} if memory_estimates is None else memory_estimates
+        self._sample_time = None
+        self._load_average = None
+        self._memory = None
+
+    def can_start(self, test, num_active):
+        """
+        Return True if the test may be started while num_active tests are running
+        """
+        if num_active == 0:
+            return True
+
+        self._sample()
+
+        if num_active >= self._num_cpus:
+            return False
+
+        if self._load_average is not None:
+            other_load = max(self._load_average - num_active, 0.0)
+            if num_active + 1 + other_load > self._num_cpus + 0.5:
+                return False
+
+        if self._memory is not None:
+            available, total = self._memory
+            estimate = self._memory_estimates.get(test.name, 0)
+            if available - estimate < self.MEMORY_RESERVE * total:
+                return False
+
+        return True
+
+    def _sample(self):
+        """
+        Read host load unless recently read
+        """
+        now = ostools.get_time()
+        if self._sample_time is not None and now - self._sample_time < self.SAMPLE_INTERVAL:
+            return
+
+        self._sample_time = now
+        self._load_average = read_load_average()
+        self._memory = read_memory()
+
+
+def read_load_average():
+    """
+    Return the one minute load average or None if not available
+    """
+    try:
+        return float(ostools.read_file("/proc/loadavg").split()[0])
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        return os.getloadavg()[0]
+    except (OSError, AttributeError):
+        return None
+
+
+def read_memory():
+    """
+    Return a tuple of available and total memory in bytes or None if not available
+    """
+    try:
+        return parse_meminfo(ostools.read_file("/proc/meminfo"))
+    except OSError:
+        return None
+
+
+def parse_meminfo(contents):
+    """
+    Parse /proc/meminfo contents into a tuple of available and total memory in bytes
+    """
+    values = {}
+    for line in contents.splitlines():
+        name, _, value = line.partition(":")
+        fields = value.split()
+        if fields and fields[0].isdigit():
+            values[name.strip()] = int(fields[0]) * 1024
+
+    if "MemTotal" not in values or "MemAvailable" not in values:
+        return None
+
+    return values["MemAvailable"], values["MemTotal"]
+
+
+def load_memory_estimates(file_name):
+    """
+    Load peak memory per test suite from a previous run
+    """
+    if not Path(file_name).exists():
+        return {}
+
+    try:
+        estimates = json.loads(ostools.read_file(file_name))
+    except ValueError:
+        LOGGER.warning("Ignoring corrupt peak memory file %s", file_name)
+        return {}
+
+    return {name: int(value) for name, value in estimates.items()}
+
+
+def save_memory_estimates(file_name, estimates):
+    ostools.write_file(file_name, json.dumps(estimates, sort_keys=True, indent=0))
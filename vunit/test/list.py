@@ -93,6 +93,18 @@ class TestSuiteWrapper(object):
     def test_information(self):
         return {self.name: self._test_case.test_information}
 
+    @property
+    def resources(self):
+        return self._test_case.resources
+
+    @property
+    def timeout(self):
+        return self._test_case.timeout
+
+    @property
+    def affinity(self):
+        return self._test_case.affinity
+
     def keep_matches(self, test_filter):
         attributes = self._test_case.attribute_names.copy()
         attributes.update(set(self._test_case.test_configuration.attributes.keys()))
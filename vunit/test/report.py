@@ -91,7 +91,8 @@ class TestReport(object):
         args.append(f"F={len(failed):d}")
         args.append(f"T={total_tests:d}")
 
-        self._printer.write(f" ({' '.join(args)!s}) {result.name!s} ({result.time:.1f} seconds)\n")
+        reason = ", timed out" if result.timed_out else ""
+        self._printer.write(f" ({' '.join(args)!s}) {result.name!s} ({result.time:.1f} seconds{reason!s})\n")
 
     def all_ok(self):
         """
@@ -225,6 +226,7 @@ class TestStatus(object):
 PASSED = TestStatus("passed")
 SKIPPED = TestStatus("skipped")
 FAILED = TestStatus("failed")
+TIMED_OUT = TestStatus("timed_out")
 
 
 class TestResult(object):
@@ -233,7 +235,7 @@ class TestResult(object):
     """
 
     def __init__(self, name, status, time, output_file_name):
-        assert status in (PASSED, FAILED, SKIPPED)
+        assert status in (PASSED, FAILED, TIMED_OUT, SKIPPED)
         self.name = name
         self._status = status
         self.time = time
@@ -261,7 +263,11 @@ class TestResult(object):
 
     @property
     def failed(self):
-        return self._status == FAILED
+        return self._status in (FAILED, TIMED_OUT)
+
+    @property
+    def timed_out(self):
+        return self._status == TIMED_OUT
 
     def print_status(self, printer, padding=0):
         """
@@ -278,8 +284,9 @@ class TestResult(object):
             printer.write(" ")
 
         my_padding = max(padding - len(self.name), 0)
+        reason = ", timed out" if self.timed_out else ""
 
-        printer.write(f"{self.name + (' ' * my_padding)} ({self.time:.1f} seconds)\n")
+        printer.write(f"{self.name + (' ' * my_padding)} ({self.time:.1f} seconds{reason!s})\n")
 
     def to_xml(self, xunit_xml_format):
         """
@@ -300,7 +307,7 @@ class TestResult(object):
 
         if self.failed:
             failure = ElementTree.SubElement(test, "failure")
-            failure.attrib["message"] = "Failed"
+            failure.attrib["message"] = "Timed out" if self.timed_out else "Failed"
 
             # Store output under <failure> if the 'bamboo' format is specified
             if xunit_xml_format == "bamboo":
@@ -19,7 +19,8 @@ import string
 from contextlib import contextmanager
 from .. import ostools
 from ..hashing import hash_string
-from .report import PASSED, FAILED, SKIPPED
+from .report import PASSED, FAILED, TIMED_OUT, SKIPPED
+from .host_load import HostLoadLimit, load_memory_estimates, save_memory_estimates
 
 LOGGER = logging.getLogger(__name__)
 
@@ -42,6 +43,9 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
         fail_fast=False,
         dont_catch_exceptions=False,
         no_color=False,
+        resource_limits=None,
+        timeout=None,
+        reuse_output_paths=False,
     ):
         self._lock = threading.Lock()
         self._fail_fast = fail_fast
@@ -55,12 +59,22 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
             self.VERBOSITY_VERBOSE,
         )
         self._verbosity = verbosity
-        self._num_threads = num_threads
-        self._stdout = sys.stdout
+
+        # With "auto" one thread per CPU is started but tests are only
+        # started when the host load allows it
+        self._adaptive = num_threads == "auto"
+        self._num_threads = (os.cpu_count() or 1) if self._adaptive else num_threads
+        self._memory_estimates_file_name = str(Path(output_path) / "peak_memory.json")
+        self._memory_estimates = {}
+        self._stdout = OUTPUT_REDIRECTION.original_stdout()
         self._stdout_ansi = wrap(self._stdout, use_color=not no_color)
-        self._stderr = sys.stderr
         self._dont_catch_exceptions = dont_catch_exceptions
         self._no_color = no_color
+        self._resource_limits = resource_limits
+        self._timeout = timeout
+
+        # The output of previous runs is deleted in the background unless overwritten
+        self._path_reaper = None if reuse_output_paths else ostools.PathReaper(Path(output_path) / ".trash")
 
         ostools.PROGRAM_STATUS.reset()
 
@@ -95,7 +109,13 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
 
         self._report.set_expected_num_tests(num_tests)
 
-        scheduler = TestScheduler(test_suites)
+        if self._adaptive:
+            self._memory_estimates = load_memory_estimates(self._memory_estimates_file_name)
+            load_limit = HostLoadLimit(self._num_threads, self._memory_estimates)
+        else:
+            load_limit = None
+
+        scheduler = TestScheduler(test_suites, self._resource_limits, load_limit)
 
         threads = []
 
@@ -103,20 +123,9 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
         write_stdout = self._is_verbose and self._num_threads == 1
 
         try:
-            sys.stdout = ThreadLocalOutput(self._local, self._stdout)
-            sys.stderr = ThreadLocalOutput(self._local, self._stdout)
-
-            # Start P-1 worker threads
-            for _ in range(self._num_threads - 1):
-                new_thread = threading.Thread(
-                    target=self._run_thread,
-                    args=(write_stdout, scheduler, num_tests, False),
-                )
-                threads.append(new_thread)
-                new_thread.start()
+            OUTPUT_REDIRECTION.enter()
 
-            # Run one worker in main thread such that P=1 is not multithreaded
-            self._run_thread(write_stdout, scheduler, num_tests, True)
+            self._run_workers(threads, write_stdout, scheduler, num_tests)
 
             scheduler.wait_for_finish()
 
@@ -129,15 +138,38 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
             for thread in threads:
                 thread.join()
 
-            sys.stdout = self._stdout
-            sys.stderr = self._stderr
+            OUTPUT_REDIRECTION.leave()
+
+            if self._adaptive:
+                save_memory_estimates(self._memory_estimates_file_name, self._memory_estimates)
+
+            if self._path_reaper is not None:
+                self._path_reaper.join()
+
             LOGGER.debug("TestRunner: Leaving")
 
+    def _run_workers(self, threads, write_stdout, scheduler, num_tests):
+        """
+        Start the worker threads consuming the scheduler.
+        Started threads are appended to threads to be joined by the caller
+        """
+        # Start P-1 worker threads
+        for _ in range(self._num_threads - 1):
+            new_thread = threading.Thread(
+                target=self._run_thread,
+                args=(write_stdout, scheduler, num_tests, False),
+            )
+            threads.append(new_thread)
+            new_thread.start()
+
+        # Run one worker in main thread such that P=1 is not multithreaded
+        self._run_thread(write_stdout, scheduler, num_tests, True)
+
     def _run_thread(self, write_stdout, scheduler, num_tests, is_main):
         """
         Run worker thread
         """
-        self._local.output = self._stdout
+        OUTPUT_REDIRECTION.set_output(self._stdout)
 
         while True:
             test_suite = None
@@ -167,7 +199,7 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
 
             finally:
                 if test_suite is not None:
-                    scheduler.test_done()
+                    scheduler.test_done(test_suite)
 
     def _get_output_path(self, test_suite_name):
         """
@@ -228,7 +260,7 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
                     "w", encoding="utf-8"
                 )
                 output_from = color_output_file
-            self._local.output = Tee([output_from, output_file])
+            OUTPUT_REDIRECTION.set_output(Tee([output_from, output_file]))
 
             def read_output():
                 """
@@ -241,7 +273,12 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
                 output_file.seek(prev)
                 return contents
 
-            results = test_suite.run(output_path=output_path, read_output=read_output)
+            ostools.PEAK_MEMORY.reset()
+            with Watchdog(self._get_timeout(test_suite)) as watchdog:
+                results = test_suite.run(output_path=output_path, read_output=read_output)
+            if watchdog.expired:
+                results = self._fail_suite(test_suite, TIMED_OUT)
+            self._record_peak_memory(test_suite)
         except KeyboardInterrupt as exk:
             self._add_skipped_tests(test_suite, results, start_time, num_tests, output_file_name)
             raise KeyboardInterrupt from exk
@@ -252,7 +289,7 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
             with self._stdout_lock():
                 traceback.print_exc()
         finally:
-            self._local.output = self._stdout
+            OUTPUT_REDIRECTION.set_output(self._stdout)
 
             for fptr in (ptr for ptr in [output_file, color_output_file] if ptr is not None):
                 fptr.flush()
@@ -269,12 +306,32 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
             if self._fail_fast and any_not_passed:
                 self._abort = True
 
-    @staticmethod
-    def _prepare_test_suite_output_path(output_path):
+    def _get_timeout(self, test_suite):
+        """
+        Return the timeout in seconds of the test suite or None for no timeout.
+        A timeout set in the sim options overrides the timeout of the runner
+        """
+        timeout = getattr(test_suite, "timeout", None)
+        return self._timeout if timeout is None else timeout
+
+    def _record_peak_memory(self, test_suite):
+        """
+        Remember the peak memory of the simulator processes of the test suite for the next run
+        """
+        peak = ostools.PEAK_MEMORY.peak
+        if peak is not None:
+            with self._lock:  # pylint: disable=not-context-manager
+                self._memory_estimates[test_suite.name] = peak
+
+    def _prepare_test_suite_output_path(self, output_path):
         """
-        Make sure the directory exists and is empty before running test.
+        Make sure the directory exists before running test. It is emptied
+        unless the output paths of previous runs are reused
         """
-        ostools.renew_path(output_path)
+        if self._path_reaper is None:
+            os.makedirs(output_path, exist_ok=True)
+        else:
+            self._path_reaper.renew_path(output_path)
 
     def _create_test_mapping_file(self, test_suites):
         """
@@ -324,11 +381,11 @@ class TestRunner(object):  # pylint: disable=too-many-instance-attributes
         print()
 
     @staticmethod
-    def _fail_suite(test_suite):
+    def _fail_suite(test_suite, status=FAILED):
         """Return failure for all tests in suite"""
         results = {}
         for test_name in test_suite.test_names:
-            results[test_name] = FAILED
+            results[test_name] = status
         return results
 
     @contextmanager
@@ -361,6 +418,42 @@ class Tee(object):
             ofile.flush()
 
 
+class Watchdog(object):
+    """
+    Context manager which kills the process groups of all processes
+    started by the current thread when the timeout expires
+    """
+
+    def __init__(self, timeout):
+        self._timeout = timeout
+        self._ident = threading.get_ident()
+        self._timer = None
+        self.expired = False
+
+    def __enter__(self):
+        if self._timeout is not None:
+            self._timer = threading.Timer(self._timeout, self._expire)
+            self._timer.daemon = True
+            self._timer.start()
+        return self
+
+    def __exit__(self, *args):
+        if self._timer is None:
+            return
+
+        self._timer.cancel()
+        self._timer.join()
+        ostools.RUNNING_PROCESSES.reset(self._ident)
+
+        if self.expired:
+            print(f"Test timed out after {self._timeout:g} seconds")
+
+    def _expire(self):
+        LOGGER.debug("Watchdog: Timed out after %g seconds", self._timeout)
+        self.expired = True
+        ostools.RUNNING_PROCESSES.kill(self._ident)
+
+
 class ThreadLocalOutput(object):
     """
     Replacement for stdout/err that separates re-directs
@@ -390,39 +483,177 @@ class ThreadLocalOutput(object):
             self._stdout.flush()
 
 
-class TestScheduler(object):
+class OutputRedirection(object):
     """
-    Schedule tests to different treads
+    Redirects stdout and stderr to the output of the current thread while test runners are running
+
+    The redirection is shared by all test runners of a process, such as a coordinator and the
+    workers it is tested with. It is installed by the first runner and removed by the last one
+    such that a runner never takes the redirection of another runner for the original stdout.
     """
 
-    def __init__(self, tests):
+    def __init__(self):
         self._lock = threading.Lock()
+        self._local = threading.local()
+        self._num_runners = 0
+        self._stdout = None
+        self._stderr = None
+
+    def original_stdout(self):
+        """
+        Return the stdout which is not redirected
+        """
+        with self._lock:
+            return sys.stdout if self._num_runners == 0 else self._stdout
+
+    def enter(self):
+        """
+        Redirect stdout and stderr unless already redirected by another runner
+        """
+        with self._lock:
+            if self._num_runners == 0:
+                self._stdout = sys.stdout
+                self._stderr = sys.stderr
+                sys.stdout = ThreadLocalOutput(self._local, self._stdout)
+                sys.stderr = ThreadLocalOutput(self._local, self._stdout)
+            self._num_runners += 1
+
+    def leave(self):
+        """
+        Restore stdout and stderr when the last runner leaves
+        """
+        with self._lock:
+            self._num_runners -= 1
+            if self._num_runners == 0:
+                sys.stdout = self._stdout
+                sys.stderr = self._stderr
+
+    def set_output(self, output):
+        """
+        Set the output of the current thread
+        """
+        self._local.output = output
+
+
+OUTPUT_REDIRECTION = OutputRedirection()
+
+
+class TestScheduler(object):  # pylint: disable=too-many-instance-attributes
+    """
+    Schedule tests to different treads
+
+    A test suite is only handed out when all the resources it needs are
+    available within the resource limits and when the optional load limit
+    allows it to start. Tests are otherwise handed out in order except
+    that a thread is preferably given a test with the same affinity as
+    its previous test, such as a test of the same test bench, to allow
+    the simulator to keep the design loaded.
+
+    A test which could not be run, such as a test handed to a remote worker
+    which disconnected, can be rescheduled to be handed out again.
+    """
+
+    def __init__(self, tests, resource_limits=None, load_limit=None):
+        self._condition = threading.Condition()
+        self._local = threading.local()
         self._tests = tests
-        self._idx = 0
+        self._pending = list(tests)
         self._num_done = 0
+        self._num_active = 0
+        self._load_limit = load_limit
+        self._resource_limits = {} if resource_limits is None else resource_limits
+        self._resources_in_use = {name: 0 for name in self._resource_limits}
+
+        for test in tests:
+            for name, count in _count_resources(test).items():
+                if name in self._resource_limits and count > self._resource_limits[name]:
+                    raise ValueError(
+                        f"{test.name!s} needs {count:d} of resource {name!r} "
+                        f"but the limit is {self._resource_limits[name]:d}"
+                    )
 
     def next(self):
         """
-        Return the next test
+        Return the next test for which resources are available
         """
         ostools.PROGRAM_STATUS.check_for_shutdown()
-        with self._lock:  # pylint: disable=not-context-manager
-            if self._idx < len(self._tests):
-                idx = self._idx
-                self._idx += 1
-                return self._tests[idx]
+        with self._condition:  # pylint: disable=not-context-manager
+            while True:
+                if not self._pending:
+                    raise StopIteration
+
+                selected = None
+                affinity = getattr(self._local, "affinity", None)
+                for idx, test in enumerate(self._pending):
+                    if not self._can_start(test):
+                        continue
+
+                    if selected is None:
+                        selected = idx
+
+                    if affinity is None or getattr(test, "affinity", None) == affinity:
+                        selected = idx
+                        break
+
+                if selected is not None:
+                    test = self._pending.pop(selected)
+                    for name, count in _count_resources(test).items():
+                        if name in self._resources_in_use:
+                            self._resources_in_use[name] += count
+                    self._num_active += 1
+                    self._local.affinity = getattr(test, "affinity", None)
+                    return test
+
+                self._condition.wait(0.05)
+                ostools.PROGRAM_STATUS.check_for_shutdown()
+
+    def _can_start(self, test):
+        """
+        Return True if the test can be started within the resource and load limits
+        """
+        if not self._resources_available(_count_resources(test)):
+            return False
 
-            raise StopIteration
+        return self._load_limit is None or self._load_limit.can_start(test, self._num_active)
 
-    def test_done(self):
+    def _resources_available(self, resources):
         """
-        Signal that a test has been done
+        Return True if resources are available within the limits
         """
-        with self._lock:  # pylint: disable=not-context-manager
+        return all(
+            self._resources_in_use[name] + count <= self._resource_limits[name]
+            for name, count in resources.items()
+            if name in self._resource_limits
+        )
+
+    def test_done(self, test):
+        """
+        Signal that a test has been done releasing its resources
+        """
+        with self._condition:  # pylint: disable=not-context-manager
             self._num_done += 1
+            self._release(test)
+
+    def reschedule(self, test):
+        """
+        Signal that a test was not run releasing its resources such that it is handed out again
+        """
+        with self._condition:  # pylint: disable=not-context-manager
+            self._pending.insert(0, test)
+            self._release(test)
+
+    def _release(self, test):
+        """
+        Release the resources of a test which is no longer running
+        """
+        self._num_active -= 1
+        for name, count in _count_resources(test).items():
+            if name in self._resources_in_use:
+                self._resources_in_use[name] -= count
+        self._condition.notify_all()
 
     def is_finished(self):
-        with self._lock:  # pylint: disable=not-context-manager
+        with self._condition:  # pylint: disable=not-context-manager
             return self._num_done >= len(self._tests)
 
     def wait_for_finish(self):
@@ -433,6 +664,16 @@ class TestScheduler(object):
             time.sleep(0.05)
 
 
+def _count_resources(test):
+    """
+    Return a dictionary of the number of units of each resource used by the test
+    """
+    counts = {}
+    for name in getattr(test, "resources", []):
+        counts[name] = counts.get(name, 0) + 1
+    return counts
+
+
 LEGAL_CHARS = string.printable
 ILLEGAL_CHARS = ' <>"|:*%?\\/#&;()'
 
@@ -19,17 +19,7 @@ class IndependentSimTestCase(object):
     """
 
     def __init__(self, test, config, simulator_if, elaborate_only=False):
-        self._name = f"{config.library_name!s}.{config.design_unit_name!s}"
-
-        if not config.is_default:
-            self._name += "." + config.name
-
-        if test.is_explicit:
-            self._name += "." + test.name
-        elif config.is_default:
-            # JUnit XML test reports wants three dotted name hierarchies
-            self._name += ".all"
-
+        self._name = get_independent_test_name(test, config)
         self._configuration = config
 
         self._test = test
@@ -65,6 +55,21 @@ class IndependentSimTestCase(object):
         """
         return self._test
 
+    @property
+    def resources(self):
+        return self._configuration.sim_options.get("resources", [])
+
+    @property
+    def timeout(self):
+        return self._configuration.sim_options.get("timeout", None)
+
+    @property
+    def affinity(self):
+        """
+        Test suites with the same affinity load the same test bench configuration
+        """
+        return _affinity(self._configuration)
+
     def run(self, *args, **kwargs):
         """
         Run the test case using the output_path
@@ -79,11 +84,7 @@ class SameSimTestSuite(object):
     """
 
     def __init__(self, tests, config, simulator_if, elaborate_only=False):
-        self._name = f"{config.library_name!s}.{config.design_unit_name!s}"
-
-        if not config.is_default:
-            self._name += "." + config.name
-
+        self._name = get_test_suite_name(config)
         self._configuration = config
 
         self._tests = tests
@@ -114,6 +115,21 @@ class SameSimTestSuite(object):
     def name(self):
         return self._name
 
+    @property
+    def resources(self):
+        return self._configuration.sim_options.get("resources", [])
+
+    @property
+    def timeout(self):
+        return self._configuration.sim_options.get("timeout", None)
+
+    @property
+    def affinity(self):
+        """
+        Test suites with the same affinity load the same test bench configuration
+        """
+        return _affinity(self._configuration)
+
     def keep_matches(self, test_filter):
         """
         Keep tests which pattern return False if no remaining tests
@@ -183,6 +199,9 @@ class TestRun(object):
 
         results = self._read_test_results(file_name=get_result_file_name(output_path))
 
+        if self._config.sim_options.get("resume_after_crash", False):
+            sim_ok = self._resume(output_path, results, sim_ok)
+
         done, results = self._check_results(results, sim_ok)
         if done:
             return results
@@ -193,6 +212,34 @@ class TestRun(object):
 
         return results
 
+    def _resume(self, output_path, results, sim_ok):
+        """
+        Re-launch the simulation with the test cases that never started as long as
+        the previous simulation started any test case. The results are updated in
+        place and the results files of all simulations are merged.
+
+        Returns the simulation status of the last simulation
+        """
+        result_file_name = get_result_file_name(output_path)
+        merged_results = ostools.read_file(result_file_name) if ostools.file_exists(result_file_name) else ""
+        test_cases = self._test_cases
+
+        while True:
+            not_started = [name for name in test_cases if results[name] == SKIPPED]
+            if not not_started or len(not_started) == len(test_cases):
+                break
+
+            print(f"Resuming simulation with the {len(not_started):d} test cases that did not start")
+            test_cases = not_started
+            ostools.write_file(result_file_name, "")
+            sim_ok = self._simulate(output_path, test_cases)
+            if ostools.file_exists(result_file_name):
+                merged_results += ostools.read_file(result_file_name)
+            results.update(self._read_test_results(file_name=result_file_name, test_cases=test_cases))
+
+        ostools.write_file(result_file_name, merged_results)
+        return sim_ok
+
     def _check_results(self, results, sim_ok):
         """
         Test the results and the exit code; return True the status of any test is not PASSED
@@ -211,10 +258,12 @@ class TestRun(object):
 
         return False, results
 
-    def _simulate(self, output_path):
+    def _simulate(self, output_path, test_cases=None):
         """
         Add runner_cfg generic values and run simulation
         """
+        if test_cases is None:
+            test_cases = self._test_cases
 
         config = self._config.copy()
 
@@ -223,7 +272,7 @@ class TestRun(object):
 
         runner_cfg = {
             "enabled_test_cases": ",".join(
-                encode_test_case(test_case) for test_case in self._test_cases if test_case is not None
+                encode_test_case(test_case) for test_case in test_cases if test_case is not None
             ),
             "use_color": self._simulator_if.use_color,
             "output path": output_path.replace("\\", "/") + "/",
@@ -241,13 +290,15 @@ class TestRun(object):
             elaborate_only=self._elaborate_only,
         )
 
-    def _read_test_results(self, file_name):  # pylint: disable=too-many-branches
+    def _read_test_results(self, file_name, test_cases=None):  # pylint: disable=too-many-branches
         """
         Read test results from vunit_results file
         """
+        if test_cases is None:
+            test_cases = self._test_cases
 
         results = {}
-        for name in self._test_cases:
+        for name in test_cases:
             results[name] = FAILED
 
         if not ostools.file_exists(file_name):
@@ -272,7 +323,7 @@ class TestRun(object):
             if test_suite_done or not last_start:
                 results[test_name] = PASSED
 
-        for test_name in self._test_cases:
+        for test_name in test_cases:
             # Anonymous test case
             if test_name is None:
                 results[test_name] = PASSED if test_suite_done else FAILED
@@ -282,7 +333,7 @@ class TestRun(object):
                 results[test_name] = SKIPPED
 
         for test_name in results:
-            if test_name not in self._test_cases:
+            if test_name not in test_cases:
                 raise RuntimeError(f"Got unknown test case {test_name!s}")
 
         return results
@@ -322,9 +373,43 @@ def encode_dict_value(value):  # pylint: disable=missing-docstring
     return str(value)
 
 
+def _affinity(config):
+    return (config.library_name, config.design_unit_name, config.name)
+
+
 def _full_name(test_suite_name, test_case_name):
     return test_suite_name + "." + test_case_name
 
 
+def get_test_suite_name(config):
+    """
+    Return the name of a test suite running all tests of a test bench configuration in the same simulation
+    """
+    name = f"{config.library_name!s}.{config.design_unit_name!s}"
+    if not config.is_default:
+        name += "." + config.name
+    return name
+
+
+def get_independent_test_name(test, config):
+    """
+    Return the name of a test run in an independent simulation
+    """
+    name = get_test_suite_name(config)
+    if test.is_explicit:
+        name += "." + test.name
+    elif config.is_default:
+        # JUnit XML test reports wants three dotted name hierarchies
+        name += ".all"
+    return name
+
+
+def get_same_sim_test_name(test_suite_name, test):
+    """
+    Return the name of a test run in the same simulation as the other tests of a test suite
+    """
+    return _full_name(test_suite_name, test.name)
+
+
 def get_result_file_name(output_path):
     return str(Path(output_path) / "vunit_results")
@@ -16,7 +16,12 @@ import traceback
 import logging
 import json
 import os
-from typing import Optional, Set, Union
+import pickle
+import multiprocessing
+import socket
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, List, Optional, Set, Tuple, Union
 from pathlib import Path
 from fnmatch import fnmatch
 
@@ -24,25 +29,32 @@ from ..database import PickledDataBase, DataBase
 from .. import ostools
 from ..vunit_cli import VUnitCLI
 from ..sim_if.factory import SIMULATOR_FACTORY
-from ..sim_if import SimulatorInterface
+from ..sim_if import SimulatorInterface, TOOL_PROBE_CACHE
 from ..color_printer import COLOR_PRINTER, NO_COLOR_PRINTER
 
 from ..project import Project
 from ..exceptions import CompileError
 from ..location_preprocessor import LocationPreprocessor
 from ..check_preprocessor import CheckPreprocessor
+from ..cached import file_content_hash
+from ..hashing import hash_string
 from ..parsing.encodings import HDL_FILE_ENCODING
 from ..builtins import Builtins
+from ..builtins_cache import BuiltinsCache
+from ..builtins_index import BUILTINS_INDEX
 from ..vhdl_standard import VHDL, VHDLStandard
 from ..test.bench_list import TestBenchList
 from ..test.report import TestReport
 from ..test.runner import TestRunner
+from ..test.distributed import Coordinator, Worker
 from ..test.list import TestList
+from ..server import Server
 
 from .common import LOGGER, TEST_OUTPUT_PATH, select_vhdl_standard, check_not_empty
 from .source import SourceFile, SourceFileList
 from .library import Library, LibraryList
 from .results import Results
+from .preprocessor import get_preprocessor_key, preprocess_file
 
 
 class VUnit(object):  # pylint: disable=too-many-instance-attributes, too-many-public-methods
@@ -139,21 +151,17 @@ class VUnit(object):  # pylint: disable=too-many-instance-attributes, too-many-p
 
         self._first_test_only = args.first_test_only or args.gui
 
-        def test_filter(name, attribute_names):
-            keep = any(fnmatch(name, pattern) for pattern in args.test_patterns)
-
-            if args.with_attributes is not None:
-                keep = keep and set(args.with_attributes).issubset(attribute_names)
-
-            if args.without_attributes is not None:
-                keep = keep and set(args.without_attributes).isdisjoint(attribute_names)
-
-            return keep
-
-        self._test_filter = test_filter
+        self._test_filter = _create_test_filter(args.test_patterns, args.with_attributes, args.without_attributes)
         self._vhdl_standard: VHDLStandard = select_vhdl_standard(vhdl_standard)
 
         self._preprocessors = []  # type: ignore
+        # The names of the added files before preprocessing
+        self._added_file_names: Set[str] = set()
+        # The absolute glob patterns of the added files
+        self._added_patterns: Set[str] = set()
+        # The simulator interface kept between the requests when serving
+        self._served_simulator_if = None
+        self._resource_limits: Dict[str, int] = {}
 
         self._simulator_class = SIMULATOR_FACTORY.select_simulator()
 
@@ -167,15 +175,25 @@ class VUnit(object):  # pylint: disable=too-many-instance-attributes, too-many-p
 
         self._create_output_path(args.clean)
 
+        # Simulator version probes are cached between runs
+        TOOL_PROBE_CACHE.set_file_name(str(Path(self._output_path) / "tool_probes.json"))
+
         database = self._create_database()
+        self._database = database
         self._project = Project(
             database=database,
             depend_on_package_body=simulator_class.package_users_depend_on_bodies,
+            builtins_index=BUILTINS_INDEX,
         )
 
         self._test_bench_list = TestBenchList(database=database)
 
-        self._builtins = Builtins(self, self._vhdl_standard, simulator_class)
+        self._builtins = Builtins(
+            self,
+            self._vhdl_standard,
+            simulator_class,
+            cache=None if args.no_builtins_cache else BuiltinsCache.from_environment(),
+        )
         if compile_builtins:
             self.add_vhdl_builtins()
             hline = "=" * 75
@@ -454,6 +472,27 @@ See https://github.com/VUnit/vunit/issues/777.
         for test_bench in check_not_empty(test_benches, allow_empty, "No test benches found"):
             test_bench.set_sim_option(name, value, overwrite)
 
+    def set_resource_limit(self, name: str, limit: int):
+        """
+        Set the number of available units of a resource such as a simulator license.
+        Tests occupy the resources listed in their ``resources`` :ref:`simulation option <sim_options>`
+        while running and are only started when these are available.
+
+        :param name: The name of the resource
+        :param limit: The number of available units of the resource
+
+        :example:
+
+        .. code-block:: python
+
+           prj.set_resource_limit("questa_sim", 8)
+           prj.set_sim_option("resources", ["questa_sim"])
+
+        """
+        if not isinstance(limit, int) or limit < 1:
+            raise ValueError(f"Resource limit of {name!r} must be a positive integer. Got {limit!r}")
+        self._resource_limits[name] = limit
+
     def set_compile_option(self, name: str, value: str, allow_empty: Optional[bool] = False):
         """
         Set compile option of all files
@@ -641,43 +680,149 @@ See https://github.com/VUnit/vunit/issues/777.
         Preprocess file_name within library_name using explicit preprocessors
         if preprocessors is None then use implicit globally defined preprocessors.
         """
-        # @TODO dependency checking etc...
+        return self._preprocess_files(library_name, [file_name], preprocessors)[0]
+
+    def _watch_patterns(self, patterns):
+        """
+        Remember the glob patterns of added files such that a server restarts when the matched files change
+        """
+        self._added_patterns.update(os.path.abspath(str(pattern)) for pattern in patterns)
+
+    def _preprocess_files(  # pylint: disable=too-many-locals
+        self, library_name: str, file_names: List[Union[str, Path]], preprocessors
+    ) -> List[str]:
+        """
+        Preprocess file_names within library_name using explicit preprocessors
+        if preprocessors is None then use implicit globally defined preprocessors.
+        Returns the names of the preprocessed files, or the name of the original
+        file when preprocessing failed, in the order of file_names.
 
+        The preprocessed file is reused when the file contents and the preprocessors
+        are unchanged since a previous run. The other files are preprocessed in
+        parallel processes when running with more than one thread.
+        """
         if preprocessors is None:
             preprocessors = self._preprocessors
 
-        fstr = str(file_name)
+        fstrs = [str(file_name) for file_name in file_names]
+        self._added_file_names.update(fstrs)
 
         if not preprocessors:
-            return fstr
+            return fstrs
 
         preprocessors.sort(key=lambda x: 0 if not hasattr(x, "order") else x.order)
 
-        fname = str(Path(file_name).name)
+        results: List[str] = list(fstrs)
+        jobs = []
+        for idx, fstr in enumerate(fstrs):
+            fname = str(Path(fstr).name)
+            database_key = f"VUnit._preprocess({library_name!s}, {fstr!s})".encode()
+            old_cache_key, old_pp_file_name = (
+                self._database[database_key] if database_key in self._database else (None, None)
+            )
 
-        try:
-            code = ostools.read_file(file_name, encoding=HDL_FILE_ENCODING)
-            for preprocessor in preprocessors:
-                code = preprocessor.run(code, fname)
-        except KeyboardInterrupt as exk:
-            raise KeyboardInterrupt from exk
-        except:  # pylint: disable=bare-except
-            traceback.print_exc()
-            LOGGER.error("Failed to preprocess %s", fstr)
-            return fstr
-        else:
-            pp_file_name = str(Path(self._preprocessed_path) / library_name / fname)
+            try:
+                preprocessor_keys = [get_preprocessor_key(preprocessor) for preprocessor in preprocessors]
+                if None in preprocessor_keys:
+                    cache_key = None
+                else:
+                    content_hash = file_content_hash(fstr, encoding=HDL_FILE_ENCODING, database=self._database)
+                    cache_key = hash_string(repr((content_hash, fname, preprocessor_keys)))
+            except KeyboardInterrupt as exk:
+                raise KeyboardInterrupt from exk
+            except:  # pylint: disable=bare-except
+                traceback.print_exc()
+                LOGGER.error("Failed to preprocess %s", fstr)
+                continue
 
-            idx = 1
-            while ostools.file_exists(pp_file_name):
-                LOGGER.debug("Preprocessed file exists '%s', adding prefix", pp_file_name)
-                pp_file_name = str(
-                    Path(self._preprocessed_path) / library_name / f"{idx}_{fname!s}",
-                )
-                idx += 1
+            if (
+                cache_key is not None
+                and cache_key == old_cache_key
+                and old_pp_file_name is not None
+                and ostools.file_exists(old_pp_file_name)
+            ):
+                results[idx] = old_pp_file_name
+            else:
+                jobs.append((idx, database_key, cache_key, old_pp_file_name))
+
+        outputs = self._run_preprocessors([fstrs[idx] for idx, _, _, _ in jobs], preprocessors)
+
+        # The names are given in the order of the files to be independent of the parallel preprocessing
+        for (idx, database_key, cache_key, old_pp_file_name), (code, trace) in zip(jobs, outputs):
+            if code is None:
+                print(trace, end="", file=sys.stderr)
+                LOGGER.error("Failed to preprocess %s", fstrs[idx])
+                continue
+
+            pp_file_name = self._get_preprocessed_file_name(library_name, fstrs[idx], old_pp_file_name)
+
+            # An unchanged file keeps its modification time
+            contents = code.encode(encoding=HDL_FILE_ENCODING)
+            if not ostools.file_exists(pp_file_name) or Path(pp_file_name).read_bytes() != contents:
+                ostools.write_file(pp_file_name, code, encoding=HDL_FILE_ENCODING)
+
+            self._database[database_key] = cache_key, pp_file_name
+            results[idx] = pp_file_name
+
+        return results
+
+    def _run_preprocessors(self, file_names: List[str], preprocessors) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        Run the preprocessors on the files, in a pool of processes when running with more than
+        one thread and processes can be forked, since spawned processes would import the run script.
+        """
+        num_workers = min(self._get_num_workers(), len(file_names))
 
-            ostools.write_file(pp_file_name, code, encoding=HDL_FILE_ENCODING)
-            return pp_file_name
+        if num_workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+            try:
+                pickle.dumps(preprocessors)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.debug("Preprocessors cannot be pickled, preprocessing in a single process")
+            else:
+                with ProcessPoolExecutor(
+                    max_workers=num_workers, mp_context=multiprocessing.get_context("fork")
+                ) as executor:
+                    return list(
+                        executor.map(
+                            preprocess_file,
+                            file_names,
+                            repeat(preprocessors),
+                            chunksize=max(1, len(file_names) // (4 * num_workers)),
+                        )
+                    )
+
+        return [preprocess_file(file_name, preprocessors) for file_name in file_names]
+
+    def _get_preprocessed_file_name(self, library_name: str, file_name: str, old_pp_file_name: Optional[str]):
+        """
+        Return the name of the preprocessed file of file_name. The name is kept
+        between runs. Files with the same base name in a library get an index
+        prefix in the order they were first preprocessed
+        """
+
+        def owner_key(pp_file_name):
+            return f"VUnit._preprocessed_file({pp_file_name!s})".encode()
+
+        if (
+            old_pp_file_name is not None
+            and owner_key(old_pp_file_name) in self._database
+            and self._database[owner_key(old_pp_file_name)] == file_name
+        ):
+            return old_pp_file_name
+
+        fname = str(Path(file_name).name)
+        pp_file_name = str(Path(self._preprocessed_path) / library_name / fname)
+
+        idx = 1
+        while owner_key(pp_file_name) in self._database and self._database[owner_key(pp_file_name)] != file_name:
+            LOGGER.debug("Preprocessed file exists '%s', adding prefix", pp_file_name)
+            pp_file_name = str(
+                Path(self._preprocessed_path) / library_name / f"{idx}_{fname!s}",
+            )
+            idx += 1
+
+        self._database[owner_key(pp_file_name)] = file_name
+        return pp_file_name
 
     def add_preprocessor(self, preprocessor):
         """
@@ -770,10 +915,16 @@ other preprocessors. Lowest value first. The order between preprocessors with th
             return test_list
         return test_list
 
-    def _main(self, post_run):
+    def _main(self, post_run):  # pylint: disable=too-many-return-statements
         """
         Base vunit main function without performing exit
         """
+        # Decided when all builtins, files and compile options have been added
+        self._builtins.use_prebuilt()
+        self._project.save_snapshot()
+
+        if self._args.serve is not None:
+            return self._main_serve(self._args.serve)
 
         if self._args.export_json is not None:
             return self._main_export_json(self._args.export_json)
@@ -787,6 +938,9 @@ other preprocessors. Lowest value first. The order between preprocessors with th
         if self._args.compile:
             return self._main_compile_only()
 
+        if self._args.worker is not None:
+            return self._main_worker(self._args.worker)
+
         all_ok = self._main_run(post_run)
         return all_ok
 
@@ -806,16 +960,26 @@ other preprocessors. Lowest value first. The order between preprocessors with th
         if not Path(self._simulator_output_path).exists():
             os.makedirs(self._simulator_output_path)
 
-        return self._simulator_class.from_args(args=self._args, output_path=self._simulator_output_path)
+        simulator_if = self._simulator_class.from_args(args=self._args, output_path=self._simulator_output_path)
+        simulator_if.set_coverage_merge_options(
+            num_workers=self._get_num_workers(),
+            incremental=self._args.merge_coverage_incrementally,
+        )
+        return simulator_if
 
     def _main_run(self, post_run):
         """
         Main with running tests
         """
-        simulator_if = self._create_simulator_if()
-        test_list = self._create_tests(simulator_if)
-        self._compile(simulator_if)
-        print()
+        if self._args.coordinator is not None:
+            # Tests are compiled and simulated by the workers
+            simulator_if = None
+            test_list = self._create_tests(simulator_if)
+        else:
+            simulator_if = self._create_simulator_if()
+            test_list = self._create_tests(simulator_if)
+            self._compile(simulator_if, self._get_num_simulator_processes(test_list))
+            print()
 
         start_time = ostools.get_time()
         report = TestReport(printer=self._printer)
@@ -842,68 +1006,106 @@ other preprocessors. Lowest value first. The order between preprocessors with th
 
         return report.all_ok()
 
+    def _main_worker(self, address):
+        """
+        Main function when running tests handed out by a coordinator
+        """
+        simulator_if = self._create_simulator_if()
+        test_list = self._create_tests(simulator_if)
+        self._compile(simulator_if, self._get_num_simulator_processes(test_list))
+        print()
+
+        try:
+            Worker(address, test_list, self._create_test_runner).run()
+        except KeyboardInterrupt:
+            print()
+            LOGGER.debug("_main: Caught Ctrl-C shutting down")
+        finally:
+            del test_list
+
+        del simulator_if
+        return True
+
+    def _get_test_runs(self):
+        """
+        Get the tests to run grouped by simulation run as lists of the full test name,
+        the test information and the configuration.
+
+        This is all listing and exporting the tests need, unlike _create_tests no test suites are created
+        """
+        self._test_bench_list.warn_when_empty()
+        test_runs = []
+        for test_run in self._test_bench_list.get_test_runs():
+            test_run = [
+                (name, test, config)
+                for name, test, config in test_run
+                if self._test_filter(name=name, attribute_names=test.attribute_names | set(config.attributes))
+            ]
+            if test_run:
+                test_runs.append(test_run)
+                if self._first_test_only:
+                    break
+        return test_runs
+
     def _main_list_only(self):
         """
         Main function when only listing test cases
         """
-        test_list = self._create_tests(simulator_if=None)
-        for test_name in test_list.test_names:
-            print(test_name)
-        print(f"Listed {test_list.num_tests} tests")
+        num_tests = 0
+        for test_run in self._get_test_runs():
+            for name, _, _ in test_run:
+                print(name)
+            num_tests += len(test_run)
+        print(f"Listed {num_tests} tests")
         return True
 
-    def _main_export_json(self, json_file_name: Union[str, Path]):  # pylint: disable=too-many-locals
+    def _main_export_json(self, json_file_name: Union[str, Path]):
         """
         Main function when exporting to JSON
+
+        The files and tests are written one at a time, one per line
         """
+        test_runs = self._get_test_runs()
+        # Computed before the file is opened such that a compile error does not leave a partial file
+        source_files = self.get_compile_order()
+
+        with Path(json_file_name).open("w", encoding="utf-8") as fptr:
+            fptr.write("{\n")
+            # The semantic version (https://semver.org/) of the JSON export data format
+            fptr.write('    "export_format_version": {"major": 1, "minor": 0, "patch": 0},\n')
 
-        file_objects = self.get_compile_order()
-        files = []
-        for source_file in file_objects:
-            files.append(
-                {
+            # The set of files added to the project
+            separator = "\n"
+            fptr.write('    "files": [')
+            for source_file in source_files:
+                item = {
                     "file_name": str(Path(source_file.name).resolve()),
                     "library_name": source_file.library.name,
                 }
-            )
-
-        tests = []
-        for test_suite in self._create_tests(simulator_if=None):
-            test_information = test_suite.test_information
-            test_configuration = test_suite.test_configuration
-            for name in test_suite.test_names:
-                info = test_information[name]
-                config = test_configuration[name]
-
-                attributes = {}
-                for attr in info.attributes:
-                    attributes[attr.name] = attr.value
+                fptr.write(separator + "        " + json.dumps(item, sort_keys=True))
+                separator = ",\n"
+            fptr.write("\n    ],\n")
 
-                attributes.update(config.attributes)
-
-                tests.append(
-                    {
+            # The list of all tests
+            separator = "\n"
+            fptr.write('    "tests": [')
+            for test_run in test_runs:
+                for name, test, config in test_run:
+                    attributes = {attr.name: attr.value for attr in test.attributes}
+                    attributes.update(config.attributes)
+
+                    item = {
                         "name": name,
                         "location": {
-                            "file_name": str(info.location.file_name),
-                            "offset": info.location.offset,
-                            "length": info.location.length,
+                            "file_name": str(test.location.file_name),
+                            "offset": test.location.offset,
+                            "length": test.location.length,
                         },
                         "attributes": attributes,
                     }
-                )
-
-        json_data = {
-            # The semantic version (https://semver.org/) of the JSON export data format
-            "export_format_version": {"major": 1, "minor": 0, "patch": 0},
-            # The set of files added to the project
-            "files": files,
-            # The list of all tests
-            "tests": tests,
-        }
-
-        with Path(json_file_name).open("w", encoding="utf-8") as fptr:
-            json.dump(json_data, fptr, sort_keys=True, indent=4, separators=(",", ": "))
+                    fptr.write(separator + "        " + json.dumps(item, sort_keys=True))
+                    separator = ",\n"
+            fptr.write("\n    ]\n}\n")
 
         return True
 
@@ -925,6 +1127,123 @@ other preprocessors. Lowest value first. The order between preprocessors with th
         self._compile(simulator_if)
         return True
 
+    def _main_serve(self, socket_path):
+        """
+        Main function when serving requests on a Unix domain socket
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            LOGGER.error("Serving requests requires Unix domain sockets which are not supported on this platform")
+            return False
+
+        watched_files = set(self._added_file_names)
+        watched_files.update(self._project.get_parsed_file_names())
+        watched_files.add(str(Path(sys.argv[0]).resolve()))
+
+        Server(
+            socket_path,
+            {
+                "list": self._serve_list,
+                "files": self._serve_files,
+                "compile": self._serve_compile,
+                "run": self._serve_run,
+            },
+            watched_files=sorted(watched_files),
+            watched_patterns=sorted(self._added_patterns),
+            before_restart=self._teardown_served_simulator_if,
+        ).serve()
+
+        self._teardown_served_simulator_if()
+        return True
+
+    def _set_served_test_filter(self, patterns, with_attributes, without_attributes):
+        """
+        Filter the tests by the parameters of a request, by the command line arguments when not given
+        """
+        args = self._args
+        self._test_filter = _create_test_filter(
+            args.test_patterns if patterns is None else patterns,
+            args.with_attributes if with_attributes is None else with_attributes,
+            args.without_attributes if without_attributes is None else without_attributes,
+        )
+
+    def _serve_list(self, patterns=None, with_attributes=None, without_attributes=None):
+        """
+        Return the names of the tests
+        """
+        self._set_served_test_filter(patterns, with_attributes, without_attributes)
+        return [name for test_run in self._get_test_runs() for name, _, _ in test_run]
+
+    def _serve_files(self):
+        """
+        Return the library and file names of the source files in compile order
+        """
+        return [
+            {"library_name": source_file.library.name, "file_name": str(Path(source_file.name).resolve())}
+            for source_file in self.get_compile_order()
+        ]
+
+    def _serve_compile(self):
+        """
+        Compile the project, returns True when successful
+        """
+        try:
+            self._compile(self._get_served_simulator_if())
+        except CompileError:
+            return False
+        return True
+
+    def _serve_run(self, patterns=None, with_attributes=None, without_attributes=None):
+        """
+        Compile the project and run the tests, returns the status, time and output path of each test
+        """
+        self._set_served_test_filter(patterns, with_attributes, without_attributes)
+
+        # Persistent simulator processes are only started for the first run, later runs reuse them
+        is_new = self._served_simulator_if is None
+        simulator_if = self._get_served_simulator_if()
+        test_list = self._create_tests(simulator_if)
+        try:
+            self._compile(simulator_if, self._get_num_simulator_processes(test_list) if is_new else 0)
+        except CompileError:
+            return {"ok": False, "tests": {}}
+        print()
+
+        start_time = ostools.get_time()
+        report = TestReport(printer=self._printer)
+        try:
+            self._run_test(test_list, report)
+        finally:
+            report.set_real_total_time(ostools.get_time() - start_time)
+            report.print_str()
+
+        return {
+            "ok": report.all_ok(),
+            "tests": {
+                result.name: result.to_dict()
+                for result in report._test_results_in_order()  # pylint: disable=protected-access
+            },
+        }
+
+    def _get_served_simulator_if(self):
+        """
+        Return the simulator interface kept between the requests
+        """
+        if self._served_simulator_if is None:
+            if self._simulator_class is None:
+                # Reported to the client instead of exiting the server
+                raise RuntimeError("No available simulator detected")
+            self._served_simulator_if = self._create_simulator_if()
+        return self._served_simulator_if
+
+    def _teardown_served_simulator_if(self):
+        """
+        Stop the persistent simulator processes of the simulator interface kept between the requests
+        """
+        if self._served_simulator_if is not None:
+            # The processes are also referenced by the threads starting them and the running processes
+            self._served_simulator_if.teardown()
+            self._served_simulator_if = None
+
     def _create_output_path(self, clean: bool):
         """
         Create or re-create the output path if necessary
@@ -934,8 +1253,6 @@ other preprocessors. Lowest value first. The order between preprocessors with th
         elif not Path(self._output_path).exists():
             os.makedirs(self._output_path)
 
-        ostools.renew_path(self._preprocessed_path)
-
     @property
     def vhdl_standard(self) -> str:
         return str(self._vhdl_standard)
@@ -948,7 +1265,23 @@ other preprocessors. Lowest value first. The order between preprocessors with th
     def codecs_path(self):
         return str(Path(self._output_path) / "codecs")
 
-    def _compile(self, simulator_if: SimulatorInterface):
+    def _get_num_workers(self):
+        """
+        Return the number of parallel workers of jobs which are not tests
+        """
+        return (os.cpu_count() or 1) if self._args.num_threads == "auto" else self._args.num_threads
+
+    def _get_num_simulator_processes(self, test_list):
+        """
+        Return the number of simulator processes to start while compiling
+        """
+        if self._args.num_threads == "auto":
+            # The number of parallel tests depends on the host load
+            return 1
+
+        return min(self._args.num_threads, len(test_list))
+
+    def _compile(self, simulator_if: SimulatorInterface, num_simulator_processes=0):
         """
         Compile entire project
         """
@@ -963,6 +1296,7 @@ other preprocessors. Lowest value first. The order between preprocessors with th
             continue_on_error=self._args.keep_compiling,
             printer=self._printer,
             target_files=target_files,
+            num_simulator_processes=num_simulator_processes,
         )
 
     def _get_testbench_files(self, simulator_if: Union[None, SimulatorInterface]):
@@ -980,7 +1314,12 @@ other preprocessors. Lowest value first. The order between preprocessors with th
         """
         Run the test suites and return the report
         """
+        self._create_test_runner(report).run(test_cases)
 
+    def _create_test_runner(self, report):
+        """
+        Create the test runner, a coordinator when distributing tests to workers
+        """
         if self._args.verbose:
             verbosity = TestRunner.VERBOSITY_VERBOSE
         elif self._args.quiet:
@@ -988,16 +1327,22 @@ other preprocessors. Lowest value first. The order between preprocessors with th
         else:
             verbosity = TestRunner.VERBOSITY_NORMAL
 
-        runner = TestRunner(
-            report,
-            str(Path(self._output_path) / TEST_OUTPUT_PATH),
-            verbosity=verbosity,
-            num_threads=self._args.num_threads,
-            fail_fast=self._args.fail_fast,
-            dont_catch_exceptions=self._args.dont_catch_exceptions,
-            no_color=self._args.no_color,
-        )
-        runner.run(test_cases)
+        kwargs = {
+            "verbosity": verbosity,
+            "num_threads": self._args.num_threads,
+            "fail_fast": self._args.fail_fast,
+            "dont_catch_exceptions": self._args.dont_catch_exceptions,
+            "no_color": self._args.no_color,
+            "resource_limits": self._resource_limits,
+            "timeout": self._args.timeout,
+            "reuse_output_paths": self._args.reuse_output_paths,
+        }
+        output_path = str(Path(self._output_path) / TEST_OUTPUT_PATH)
+
+        if self._args.coordinator is not None:
+            return Coordinator(report, output_path, self._args.coordinator, **kwargs)
+
+        return TestRunner(report, output_path, **kwargs)
 
     def add_verilog_builtins(self):
         """
@@ -1087,9 +1432,11 @@ other preprocessors. Lowest value first. The order between preprocessors with th
         :returns: A list of :class:`.SourceFile` objects in compile order.
         """
         if source_files is None:
-            source_files = self.get_source_files(allow_empty=True)
-
-        target_files = [source_file._source_file for source_file in source_files]  # pylint: disable=protected-access
+            target_files = self._project.get_source_files_in_order()
+        else:
+            target_files = [
+                source_file._source_file for source_file in source_files  # pylint: disable=protected-access
+            ]
         source_files = self._project.get_dependencies_in_compile_order(target_files)
         return SourceFileList([SourceFile(source_file, self._project, self) for source_file in source_files])
 
@@ -1125,3 +1472,22 @@ other preprocessors. Lowest value first. The order between preprocessors with th
         if self._simulator_class is None:
             return None
         return self._simulator_class.supports_coverage()
+
+
+def _create_test_filter(test_patterns, with_attributes, without_attributes):
+    """
+    Create a filter keeping the tests matching any of the test patterns and having the attributes
+    """
+
+    def test_filter(name, attribute_names):
+        keep = any(fnmatch(name, pattern) for pattern in test_patterns)
+
+        if with_attributes is not None:
+            keep = keep and set(with_attributes).issubset(attribute_names)
+
+        if without_attributes is not None:
+            keep = keep and set(without_attributes).isdisjoint(attribute_names)
+
+        return keep
+
+    return test_filter
@@ -53,19 +53,23 @@ def check_not_empty(lst, allow_empty, error_msg):
     return lst
 
 
-def get_checked_file_names_from_globs(pattern, allow_empty):
+def get_patterns(pattern):
     """
-    Get file names from globs and check that exist
+    Get the list of patterns of a pattern argument which is a single pattern or a list of patterns
     """
     if is_string_not_iterable(pattern):
-        patterns = [pattern]
-    elif isinstance(pattern, Path):
-        patterns = [str(pattern)]
-    else:
-        patterns = pattern
+        return [pattern]
+    if isinstance(pattern, Path):
+        return [str(pattern)]
+    return list(pattern)
 
+
+def get_checked_file_names_from_globs(pattern, allow_empty):
+    """
+    Get file names from globs and check that exist
+    """
     file_names: List[str] = []
-    for pattern_instance in patterns:
+    for pattern_instance in get_patterns(pattern):
         new_file_names = glob(str(pattern_instance), recursive=True)
         check_not_empty(
             new_file_names,
@@ -15,7 +15,7 @@ from ..vhdl_standard import VHDL, VHDLStandard
 from ..project import Project
 from ..source_file import file_type_of, FILE_TYPES, VERILOG_FILE_TYPES
 from ..builtins import add_verilog_include_dir
-from .common import check_not_empty, get_checked_file_names_from_globs
+from .common import check_not_empty, get_checked_file_names_from_globs, get_patterns
 from .source import SourceFile, SourceFileList
 from .testbench import TestBench
 from .packagefacade import PackageFacade
@@ -360,18 +360,30 @@ class Library(object):
            library.add_source_files("*.vhd")
 
         """
+        patterns = get_patterns(pattern)
+        self._parent._watch_patterns(patterns)  # pylint: disable=protected-access
+        file_names = [
+            Path(file_name).resolve() for file_name in get_checked_file_names_from_globs(patterns, allow_empty)
+        ]
+        file_types = [self._which_file_type(file_name, file_type) for file_name in file_names]
+
+        # All files are preprocessed at once to preprocess them in parallel
+        new_file_names = self._parent._preprocess_files(  # pylint: disable=protected-access
+            self._library_name, file_names, preprocessors
+        )
+
         return SourceFileList(
             source_files=[
-                self.add_source_file(
+                self._add_source_file(
                     file_name,
-                    preprocessors,
+                    new_file_name,
+                    file_type,
                     include_dirs,
                     defines,
                     vhdl_standard,
-                    no_parse=no_parse,
-                    file_type=file_type,
+                    no_parse,
                 )
-                for file_name in get_checked_file_names_from_globs(pattern, allow_empty)
+                for file_name, new_file_name, file_type in zip(file_names, new_file_names, file_types)
             ]
         )
 
@@ -405,20 +417,39 @@ class Library(object):
 
         """
         file_name = Path(file_name).resolve()
+        file_type = self._which_file_type(file_name, file_type)
 
+        new_file_name = self._parent._preprocess(  # pylint: disable=protected-access
+            self._library_name, file_name, preprocessors
+        )
+
+        return self._add_source_file(
+            file_name, new_file_name, file_type, include_dirs, defines, vhdl_standard, no_parse
+        )
+
+    @staticmethod
+    def _which_file_type(file_name, file_type):
+        """
+        Return the file type of file_name when file_type is None, otherwise check file_type
+        """
         if file_type is None:
-            file_type = file_type_of(file_name)
-        elif file_type not in FILE_TYPES:
+            return file_type_of(file_name)
+
+        if file_type not in FILE_TYPES:
             raise ValueError(f"file_type {file_type!r} not in {FILE_TYPES!r}")
 
+        return file_type
+
+    def _add_source_file(  # pylint: disable=too-many-arguments
+        self, file_name, new_file_name, file_type, include_dirs, defines, vhdl_standard, no_parse
+    ):
+        """
+        Add the preprocessed new_file_name of file_name to the library
+        """
         if file_type in VERILOG_FILE_TYPES:
             include_dirs = include_dirs if include_dirs is not None else []
             include_dirs = add_verilog_include_dir(include_dirs)
 
-        new_file_name = self._parent._preprocess(  # pylint: disable=protected-access
-            self._library_name, file_name, preprocessors
-        )
-
         source_file = self._project.add_source_file(
             new_file_name,
             self._library_name,
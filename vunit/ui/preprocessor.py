@@ -8,6 +8,15 @@
 Preprocessor base class.
 """
 
+import sys
+import traceback
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from vunit.about import version
+from ..hashing import hash_string
+from ..ostools import read_file
+from ..parsing.encodings import HDL_FILE_ENCODING
+
 
 class Preprocessor:
     """
@@ -32,3 +41,54 @@ is applied first. Preprocessors with the same value are applied in the order the
         :return: Preprocessed code
         """
         return code
+
+
+_MODULE_SOURCE_HASHES: Dict[str, str] = {}
+
+
+def get_preprocessor_key(preprocessor) -> Optional[str]:
+    """
+    Return a key identifying the preprocessing done by a preprocessor, made from the VUnit
+    version, its class, the source of the module defining the class and its attributes. The
+    version covers the VUnit modules used by the preprocessor. Attributes without a stable
+    representation, such as objects printed with their address, make the key differ between
+    runs. Returns None when the source of the class is unknown.
+    """
+    cls = type(preprocessor)
+    module_file = getattr(sys.modules.get(cls.__module__), "__file__", None)
+    if module_file is None:
+        return None
+
+    if module_file not in _MODULE_SOURCE_HASHES:
+        try:
+            _MODULE_SOURCE_HASHES[module_file] = hash_string(read_file(module_file))
+        except OSError:
+            return None
+
+    try:
+        attributes = repr(sorted(vars(preprocessor).items()))
+    except TypeError:
+        attributes = repr(preprocessor)
+
+    return (
+        f"{version()!s}:{cls.__module__!s}.{cls.__qualname__!s}:{_MODULE_SOURCE_HASHES[module_file]!s}:{attributes!s}"
+    )
+
+
+def preprocess_file(file_name: str, preprocessors) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Run the preprocessors on the code of a file. Called in the processes preprocessing files in parallel.
+
+    :returns: Tuple of the preprocessed code and None or None and the traceback when preprocessing failed
+    """
+    try:
+        code = read_file(file_name, encoding=HDL_FILE_ENCODING)
+        fname = str(Path(file_name).name)
+        for preprocessor in preprocessors:
+            code = preprocessor.run(code, fname)
+    except KeyboardInterrupt as exk:
+        raise KeyboardInterrupt from exk
+    except:  # pylint: disable=bare-except
+        return None, traceback.format_exc()
+
+    return code, None
@@ -27,9 +27,15 @@ class Results(object):
         """
         Create a merged coverage report from the individual coverage files
 
+        The files are merged in a tree of parallel merges, see :ref:`coverage <coverage>`.
+
         :param file_name: The resulting coverage file name.
         :param args: The tool arguments for the merge command. Should be a list of strings.
         """
+        if self._simulator_if is None:
+            raise RuntimeError(
+                "Coverage cannot be merged by a coordinator since the coverage files are created by the workers"
+            )
         self._simulator_if.merge_coverage(file_name=file_name, args=args)
 
     def get_report(self):
@@ -71,7 +77,7 @@ class TestResult(object):
     """
     Gives access to a subset of the results of a test
 
-    :data status: Result status (passed, failed or skipped)
+    :data status: Result status (passed, failed, timed_out or skipped)
     :data time: Simulation time
     :data path: Absolute path of the test output
 
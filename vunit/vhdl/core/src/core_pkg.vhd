@@ -13,6 +13,7 @@ package core_pkg is
   procedure setup(file_name : string);
   procedure test_start(test_name : string);
   procedure test_suite_done;
+  procedure checkpoint;
   procedure stop(status : natural);
 
   -- @TODO add core acceptance tests
@@ -48,6 +49,18 @@ package body core_pkg is
     file_close(test_results);
   end procedure;
 
+  -- Request the Python runner to save a checkpoint of the simulation. The
+  -- results file is closed and must be opened again with setup when the
+  -- simulation continues
+  procedure checkpoint is
+    variable l : line;
+  begin
+    write(l, string'("checkpoint"));
+    writeline(test_results, l);
+    file_close(test_results);
+    stop_pkg.pause;
+  end procedure;
+
   constant is_mocked_idx : natural := 0;
   constant core_failure_called_idx : natural := 1;
   constant core_failure_message_idx : natural := 2;
@@ -12,4 +12,9 @@ package body stop_pkg is
     end if;
     std.env.stop(status);
   end procedure;
+
+  procedure pause is
+  begin
+    std.env.stop;
+  end procedure;
 end package body;
@@ -9,4 +9,8 @@ package body stop_pkg is
   begin
     report "Stopping simulation with status " & integer'image(status) severity failure;
   end procedure;
+
+  procedure pause is
+  begin
+  end procedure;
 end package body;
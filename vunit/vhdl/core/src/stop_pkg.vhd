@@ -6,4 +6,8 @@
 
 package stop_pkg is
   procedure stop(status : integer);
+
+  -- Pause the simulation such that the simulator can continue it. Does
+  -- nothing when not supported by the VHDL standard
+  procedure pause;
 end package;
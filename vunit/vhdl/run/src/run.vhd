@@ -20,48 +20,37 @@ use work.event_private_pkg.all;
 use work.checker_pkg.all;
 
 package body run_pkg is
-  procedure test_runner_setup(
-    signal runner : inout runner_sync_t;
-    constant runner_cfg : in string := runner_cfg_default) is
-    variable test_case_candidates : lines_t;
-    variable selected_enabled_test_cases : line;
+  -- The runner configuration is read from a file, relative to the working
+  -- directory of the simulator, when the runner_cfg generic only names that
+  -- file. This allows a test bench to be elaborated once for all tests.
+  impure function resolve_runner_cfg(
+    constant runner_cfg : string)
+  return string is
+    file cfg_file : text;
+    variable cfg : line;
   begin
-
-    -- fake active python runner key is only used during testing in tb_run.vhd
-    -- to avoid creating vunit_results file
-    set_active_python_runner(runner_state,
-                             (active_python_runner(runner_cfg) and not has_key(runner_cfg, "fake active python runner")));
-
-    if has_active_python_runner(runner_state) then
-      core_pkg.setup(output_path(runner_cfg) & "vunit_results");
-      hide(runner_trace_logger, display_handler, info);
-    end if;
-
-    if has_key(runner_cfg, "use_color") and boolean'value(get(runner_cfg, "use_color")) then
-      enable_colors;
-    end if;
-
-    if not active_python_runner(runner_cfg) then
-      set_stop_level(failure);
+    if not has_key(runner_cfg, "runner_cfg file") then
+      return runner_cfg;
     end if;
 
-    set_phase(runner_state, test_runner_setup);
-    runner(runner_exit_status_idx) <= runner_exit_with_errors;
-    trace(runner_trace_logger, "Entering test runner setup phase.");
-    notify(runner(runner_phase_idx to runner_phase_idx + basic_event_length - 1));
-
-    entry_gate(runner);
-
-    if selected_enabled_test_cases /= null then
-      deallocate(selected_enabled_test_cases);
-    end if;
+    file_open(cfg_file, get(runner_cfg, "runner_cfg file"), read_mode);
+    readline(cfg_file, cfg);
+    file_close(cfg_file);
+    return cfg.all;
+  end;
 
+  procedure set_enabled_test_cases(
+    constant runner_cfg : in string) is
+    variable test_case_candidates : lines_t;
+    variable selected_enabled_test_cases : line;
+  begin
     if has_key(runner_cfg, "enabled_test_cases") then
       write(selected_enabled_test_cases, get(runner_cfg, "enabled_test_cases"));
     else
       write(selected_enabled_test_cases, string'("__all__"));
     end if;
     test_case_candidates := split(replace(selected_enabled_test_cases.all, ",,", "__comma__"), ",");
+    deallocate(selected_enabled_test_cases);
 
     set_cfg(runner_state, runner_cfg);
 
@@ -80,6 +69,39 @@ package body run_pkg is
         end if;
       end loop;
     end if;
+  end;
+
+  procedure test_runner_setup(
+    signal runner : inout runner_sync_t;
+    constant runner_cfg : in string := runner_cfg_default) is
+    constant cfg : string := resolve_runner_cfg(runner_cfg);
+  begin
+
+    -- fake active python runner key is only used during testing in tb_run.vhd
+    -- to avoid creating vunit_results file
+    set_active_python_runner(runner_state,
+                             (active_python_runner(cfg) and not has_key(cfg, "fake active python runner")));
+
+    if has_active_python_runner(runner_state) then
+      core_pkg.setup(output_path(cfg) & "vunit_results");
+      hide(runner_trace_logger, display_handler, info);
+    end if;
+
+    if has_key(cfg, "use_color") and boolean'value(get(cfg, "use_color")) then
+      enable_colors;
+    end if;
+
+    if not active_python_runner(cfg) then
+      set_stop_level(failure);
+    end if;
+
+    set_phase(runner_state, test_runner_setup);
+    runner(runner_exit_status_idx) <= runner_exit_with_errors;
+    trace(runner_trace_logger, "Entering test runner setup phase.");
+    notify(runner(runner_phase_idx to runner_phase_idx + basic_event_length - 1));
+
+    entry_gate(runner);
+    set_enabled_test_cases(cfg);
     exit_gate(runner);
     set_phase(runner_state, test_suite_setup);
     trace(runner_trace_logger, "Entering test suite setup phase.");
@@ -87,6 +109,36 @@ package body run_pkg is
     entry_gate(runner);
   end test_runner_setup;
 
+  procedure test_runner_checkpoint(
+    signal runner : inout runner_sync_t) is
+    constant runner_cfg : string := get_cfg(runner_state);
+    file cfg_file : text;
+    variable new_runner_cfg : line;
+  begin
+    if get_phase(runner_state) /= test_suite_setup then
+      core_pkg.core_failure("test_runner_checkpoint must be called in the test suite setup phase.");
+      return;
+    end if;
+
+    if not has_active_python_runner(runner_state) or not has_key(runner_cfg, "checkpoint path") then
+      return;
+    end if;
+
+    trace(runner_trace_logger, "Requesting checkpoint.");
+    core_pkg.checkpoint;
+
+    -- The simulation continues here both after the checkpoint is saved and
+    -- after it is restored for another run with a new runner configuration
+    file_open(cfg_file, get(runner_cfg, "checkpoint path") & "runner_cfg", read_mode);
+    readline(cfg_file, new_runner_cfg);
+    file_close(cfg_file);
+
+    core_pkg.setup(output_path(new_runner_cfg.all) & "vunit_results");
+    set_enabled_test_cases(new_runner_cfg.all);
+    deallocate(new_runner_cfg);
+    trace(runner_trace_logger, "Continuing from checkpoint.");
+  end procedure test_runner_checkpoint;
+
   procedure test_runner_cleanup(
     signal runner : inout runner_sync_t;
     external_failure : boolean := false;
@@ -476,9 +528,10 @@ package body run_pkg is
   impure function active_python_runner(
     constant runner_cfg : string)
   return boolean is
+    constant cfg : string := resolve_runner_cfg(runner_cfg);
   begin
-    if has_key(runner_cfg, "active python runner") then
-      return get(runner_cfg, "active python runner") = "true";
+    if has_key(cfg, "active python runner") then
+      return get(cfg, "active python runner") = "true";
     else
       return false;
     end if;
@@ -487,9 +540,10 @@ package body run_pkg is
   impure function output_path(
     constant runner_cfg : string)
   return string is
+    constant cfg : string := resolve_runner_cfg(runner_cfg);
   begin
-    if has_key(runner_cfg, "output path") then
-      return get(runner_cfg, "output path");
+    if has_key(cfg, "output path") then
+      return get(cfg, "output path");
     else
       return "";
     end if;
@@ -498,9 +552,10 @@ package body run_pkg is
   impure function enabled_test_cases(
     constant runner_cfg : string)
   return test_cases_t is
+    constant cfg : string := resolve_runner_cfg(runner_cfg);
   begin
-    if has_key(runner_cfg, "enabled_test_cases") then
-      return get(runner_cfg, "enabled_test_cases");
+    if has_key(cfg, "enabled_test_cases") then
+      return get(cfg, "enabled_test_cases");
     else
       return "__all__";
     end if;
@@ -509,9 +564,10 @@ package body run_pkg is
   impure function tb_path(
     constant runner_cfg : string)
   return string is
+    constant cfg : string := resolve_runner_cfg(runner_cfg);
   begin
-    if has_key(runner_cfg, "tb path") then
-      return get(runner_cfg, "tb path");
+    if has_key(cfg, "tb path") then
+      return get(cfg, "tb path");
     else
       return "";
     end if;
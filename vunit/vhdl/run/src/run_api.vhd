@@ -29,6 +29,14 @@ package run_pkg is
     signal runner : inout runner_sync_t;
     constant runner_cfg : in string := runner_cfg_default);
 
+  -- Mark the point in the test suite setup phase where the simulation state
+  -- is saved by the Python runner when the enable_checkpoint simulation option
+  -- is set. Later runs of the test bench configuration are restored to this
+  -- point and continue with their own test cases. Does nothing when the
+  -- simulator doesn't support checkpoints.
+  procedure test_runner_checkpoint (
+    signal runner : inout runner_sync_t);
+
   impure function num_of_enabled_test_cases
     return integer;
 
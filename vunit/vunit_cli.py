@@ -167,6 +167,16 @@ def _create_argument_parser(description=None, for_documentation=False):
         help="Output path for compilation and simulation artifacts",
     )
 
+    parser.add_argument(
+        "--no-builtins-cache",
+        action="store_true",
+        default=False,
+        help=(
+            "Compile the builtins into the output path "
+            "instead of using the builtin libraries prebuilt by 'vunit build-builtins'"
+        ),
+    )
+
     parser.add_argument("-x", "--xunit-xml", default=None, help="Xunit test report .xml file")
 
     parser.add_argument(
@@ -226,10 +236,13 @@ def _create_argument_parser(description=None, for_documentation=False):
     parser.add_argument(
         "-p",
         "--num-threads",
-        type=positive_int,
+        type=positive_int_or_auto,
         default=1,
         help=(
-            "Number of tests to run in parallel. " "Test output is not continuously written in verbose mode with p > 1"
+            "Number of tests to run in parallel. "
+            "Test output is not continuously written in verbose mode with p > 1. "
+            "With 'auto' up to one test per CPU is run as long as the CPU load and "
+            "available memory of the host allows it"
         ),
     )
 
@@ -241,6 +254,64 @@ def _create_argument_parser(description=None, for_documentation=False):
         help="Do not re-use the same simulator process for running different test cases (slower)",
     )
 
+    parser.add_argument(
+        "--timeout",
+        metavar="SECONDS",
+        type=positive_float,
+        default=None,
+        help=(
+            "Kill the simulator and fail the tests when a simulation runs longer than this. "
+            "Can be overridden per configuration with the timeout simulation option"
+        ),
+    )
+
+    parser.add_argument(
+        "--reuse-output-paths",
+        action="store_true",
+        default=False,
+        help=(
+            "Keep the output directory of a test from the previous run and overwrite its files. "
+            "By default the old directory is moved aside and deleted in the background"
+        ),
+    )
+
+    parser.add_argument(
+        "--merge-coverage-incrementally",
+        action="store_true",
+        default=False,
+        help=(
+            "Merge the coverage databases in the background while the tests are running "
+            "such that little is left to merge when merge_coverage is called"
+        ),
+    )
+
+    parser.add_argument(
+        "--coordinator",
+        metavar="[HOST:]PORT",
+        default=None,
+        help=(
+            "Do not run tests locally but distribute them to workers connecting to this TCP port. "
+            "Workers are started with --worker using the same run script"
+        ),
+    )
+
+    parser.add_argument(
+        "--worker",
+        metavar="HOST:PORT",
+        default=None,
+        help="Compile and run tests handed out by the coordinator listening on HOST:PORT",
+    )
+
+    parser.add_argument(
+        "--serve",
+        metavar="SOCKET",
+        default=None,
+        help=(
+            "Keep the project in memory and serve JSON-RPC requests to list, compile and run tests "
+            "on this Unix domain socket until a shutdown request"
+        ),
+    )
+
     parser.add_argument("--export-json", default=None, help="Export project information to a JSON file.")
 
     parser.add_argument("--version", action="version", version=version())
@@ -278,6 +349,27 @@ def positive_int(val):
         raise argparse.ArgumentTypeError(f"'{val!s}' is not a valid positive int") from exv
 
 
+def positive_float(val):
+    """
+    ArgumentParse positive float check
+    """
+    try:
+        fval = float(val)
+        assert fval > 0
+        return fval
+    except (ValueError, AssertionError) as exv:
+        raise argparse.ArgumentTypeError(f"'{val!s}' is not a valid positive number") from exv
+
+
+def positive_int_or_auto(val):
+    """
+    ArgumentParse positive int or 'auto' check
+    """
+    if val == "auto":
+        return val
+    return positive_int(val)
+
+
 def _parser_for_documentation():
     """
     Returns an argparse object used by sphinx for documentation in user_guide.rst